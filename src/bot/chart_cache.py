@@ -0,0 +1,221 @@
+"""
+Cache des graphiques rendus et de leurs embeds.
+
+Un graphique de progression ne change qu'à l'enregistrement d'un nouveau jour.
+Le PNG rendu et l'embed qui l'accompagne sont conservés, indexés par joueur,
+nombre de jours affichés et version des données (`data_version`, incrémentée
+par `RankDatabase.save_ranking`) : dès qu'une nouvelle version est observée,
+les entrées des versions précédentes sont supprimées.
+
+Le cache est borné en octets (éviction LRU) et ses entrées expirent après
+`visualization.cache_duration` secondes. Les entrées évincées peuvent être
+écrites sur disque et relues au besoin plutôt que rendues à nouveau.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from loguru import logger
+
+# Emplacement par défaut des graphiques écrits sur disque
+SPILL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'resources', 'data', 'cache', 'charts')
+
+# Taille maximale par défaut des entrées en mémoire (octets)
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# Durée de vie par défaut d'une entrée (s)
+DEFAULT_TTL = 3600.0
+
+
+class ChartCache:
+    """Cache LRU borné en octets des graphiques, invalidé par la version des données."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL, spill_dir=None):
+        """
+        Args:
+            max_bytes (int): Taille maximale des entrées en mémoire (octets)
+            ttl (float): Durée de vie d'une entrée (s)
+            spill_dir (str): Dossier des entrées évincées (None : pas d'écriture sur disque)
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.spill_dir = spill_dir
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, version):
+        """
+        Graphique en cache pour une clé et une version des données.
+
+        Args:
+            key (tuple): (joueur, nombre de jours)
+            version (int): Version courante des données
+
+        Returns:
+            tuple: (PNG, embed sous forme de dictionnaire) ou None
+        """
+        with self._lock:
+            self._observe(version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, size, chart, payload = entry
+                if time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return chart, payload
+                self._discard(key)
+
+            entry = self._read_spilled(key, version)
+            if entry is None:
+                self.misses += 1
+                return None
+            # Entrée relue sur disque : de nouveau en mémoire
+            expires_at, chart, payload = entry
+            self._store(key, expires_at, chart, payload)
+            self.disk_hits += 1
+            return chart, payload
+
+    def put(self, key, version, chart, payload):
+        """
+        Conserve un graphique et son embed.
+
+        Args:
+            key (tuple): (joueur, nombre de jours)
+            version (int): Version des données utilisées pour le rendu
+            chart (bytes): Image PNG
+            payload (dict): Embed (`discord.Embed.to_dict()`)
+        """
+        with self._lock:
+            self._observe(version)
+            # Rendu commencé avant une nouvelle version : ne pas le conserver
+            if version != self._version:
+                return
+            if key in self._entries:
+                self._discard(key)
+            self._store(key, time.time() + self.ttl, chart, payload)
+
+    def clear(self):
+        """Vide le cache en mémoire et sur disque."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._purge_spilled(keep_version=None)
+
+    def stats(self):
+        """Compteurs du cache."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+            }
+
+    def _observe(self, version):
+        """Supprime les entrées des versions antérieures à `version`."""
+        if self._version is not None and version <= self._version:
+            return
+        if self._entries:
+            logger.debug(f"Données en version {version} : {len(self._entries)} graphique(s) invalidé(s)")
+        self._entries.clear()
+        self._bytes = 0
+        self._version = version
+        self._purge_spilled(keep_version=version)
+
+    def _store(self, key, expires_at, chart, payload):
+        """Ajoute une entrée et évince les plus anciennes au-delà de `max_bytes`."""
+        size = len(chart) + len(json.dumps(payload))
+        self._entries[key] = (expires_at, size, chart, payload)
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            old_key, (old_expires_at, _, old_chart, old_payload) = next(iter(self._entries.items()))
+            self._discard(old_key)
+            self.evictions += 1
+            self._spill(old_key, old_expires_at, old_chart, old_payload)
+
+    def _discard(self, key):
+        self._bytes -= self._entries.pop(key)[1]
+
+    def _spill_path(self, key, version):
+        digest = hashlib.sha1(json.dumps([version, list(key)]).encode('utf-8')).hexdigest()
+        return os.path.join(self.spill_dir, digest)
+
+    def _spill(self, key, expires_at, chart, payload):
+        """Écrit une entrée évincée sur disque."""
+        if not self.spill_dir or time.time() >= expires_at:
+            return
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            path = self._spill_path(key, self._version)
+            with open(path + '.png', 'wb') as f:
+                f.write(chart)
+            # Le JSON est écrit en dernier : il rend l'entrée lisible
+            tmp_path = path + '.json.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'key': list(key), 'version': self._version, 'expires_at': expires_at,
+                           'payload': payload}, f, ensure_ascii=False)
+            os.replace(tmp_path, path + '.json')
+        except OSError as e:
+            logger.warning(f"Graphique non écrit sur disque : {e}")
+
+    def _read_spilled(self, key, version):
+        """
+        Relit et retire du disque une entrée évincée.
+
+        Returns:
+            tuple: (expiration, PNG, embed) ou None
+        """
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(key, version)
+        try:
+            with open(path + '.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(path + '.png', 'rb') as f:
+                chart = f.read()
+        except (OSError, ValueError):
+            return None
+        self._remove_spilled(path)
+        if meta.get('version') != version or meta.get('key') != list(key) or time.time() >= meta['expires_at']:
+            return None
+        return meta['expires_at'], chart, meta['payload']
+
+    def _remove_spilled(self, path):
+        for suffix in ('.json', '.png'):
+            try:
+                os.remove(path + suffix)
+            except OSError:
+                pass
+
+    def _purge_spilled(self, keep_version):
+        """Supprime du disque les entrées d'une autre version ou expirées."""
+        if not self.spill_dir or not os.path.isdir(self.spill_dir):
+            return
+        now = time.time()
+        for name in os.listdir(self.spill_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.spill_dir, name[:-len('.json')])
+            try:
+                with open(path + '.json', 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if meta.get('version') == keep_version and now < meta.get('expires_at', 0):
+                    continue
+            except (OSError, ValueError):
+                pass
+            self._remove_spilled(path)
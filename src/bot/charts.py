@@ -0,0 +1,143 @@
+"""
+Rendu des graphiques du bot hors de la boucle d'événements.
+
+Les graphiques sont dessinés avec l'API objet de matplotlib (Figure et
+canevas Agg, sans l'état global de pyplot) dans un pool de processus. Chaque
+worker importe matplotlib, applique le style et charge les polices une seule
+fois à son démarrage ; la boucle d'événements ne fait qu'attendre les octets
+PNG.
+"""
+
+import asyncio
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from loguru import logger
+
+# Style des graphiques, appliqué une fois par worker
+CHART_STYLE = 'dark_background'
+CHART_DPI = 100
+FIGURE_SIZE = (10, 6)
+BACKGROUND_COLOR = '#2f3136'
+
+# Délai maximum du rendu d'un graphique (s), attente d'un worker comprise
+RENDER_TIMEOUT = 10.0
+
+
+# Style appliqué dans ce processus
+_styled = False
+
+
+def _prepare():
+    """Configure matplotlib (backend Agg et style) une fois par processus."""
+    global _styled
+    if not _styled:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.style
+        matplotlib.style.use(CHART_STYLE)
+        _styled = True
+
+
+def _init_worker():
+    """Prépare un worker : style, polices et cache de glyphes chargés d'avance."""
+    _prepare()
+    render_progression("Préchauffage", [{'date': '2024-01-02', 'rank': 2}, {'date': '2024-01-01', 'rank': 1}])
+    logger.debug(f"Worker graphique {os.getpid()} prêt")
+
+
+def _ready():
+    return os.getpid()
+
+
+def render_progression(player_name, history, dpi=CHART_DPI):
+    """
+    Dessine la progression du rang d'un joueur.
+
+    Args:
+        player_name (str): Nom du joueur
+        history (list): Classements avec date et rang, du plus récent au plus ancien
+        dpi (int): Résolution de l'image
+
+    Returns:
+        bytes: Image PNG
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.dates import DateFormatter
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import MultipleLocator
+
+    _prepare()
+    # Ordre chronologique
+    dates = [datetime.strptime(entry['date'], "%Y-%m-%d") for entry in reversed(history)]
+    ranks = [entry['rank'] for entry in reversed(history)]
+
+    figure = Figure(figsize=FIGURE_SIZE, dpi=dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    axes.plot(dates, ranks, 'b-', marker='o')
+
+    # Rang 1 en haut, graduations tous les 10 rangs de 1 à 100
+    axes.set_ylim(100.5, 0.5)
+    axes.yaxis.set_major_locator(MultipleLocator(10))
+
+    axes.set_title(f"Progression de {player_name} - Royaume Onirique", color='white', pad=20)
+    axes.set_xlabel("Date", color='white')
+    axes.set_ylabel("Rang", color='white')
+    axes.grid(True, linestyle='--', alpha=0.3)
+
+    axes.xaxis.set_major_formatter(DateFormatter('%d/%m'))
+    axes.tick_params(axis='x', labelrotation=45)
+    figure.tight_layout()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png', facecolor=BACKGROUND_COLOR)
+    return buffer.getvalue()
+
+
+class ChartRenderer:
+    """Pool de processus de rendu des graphiques."""
+
+    def __init__(self, workers=None, timeout=RENDER_TIMEOUT):
+        """
+        Args:
+            workers (int): Nombre de processus (par défaut : nombre de cœurs, 4 au plus)
+            timeout (float): Délai maximum d'un rendu (s)
+        """
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+        self._pool = None
+
+    def _get_pool(self):
+        """Démarre le pool de workers au premier usage."""
+        if self._pool is None:
+            logger.info(f"Démarrage de {self.workers} worker(s) graphiques")
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self._pool
+
+    def warm_up(self):
+        """Démarre et prépare tous les workers (bloquant)."""
+        pool = self._get_pool()
+        for future in [pool.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+
+    async def progression(self, player_name, history):
+        """
+        Rend le graphique de progression d'un joueur dans un worker.
+
+        Returns:
+            bytes: Image PNG
+
+        Raises:
+            asyncio.TimeoutError: Rendu non terminé dans le délai
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_pool(), render_progression, player_name, history)
+        return await asyncio.wait_for(future, self.timeout)
+
+    def close(self):
+        """Arrête les workers."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
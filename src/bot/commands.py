@@ -2,19 +2,91 @@
 Commandes du bot Discord pour l'affichage des classements.
 """
 
+import asyncio
 from discord import app_commands
 import discord
 from loguru import logger
-from rank.database import RankDatabase
+from storage.aio import AsyncRankDatabase, QueryTimeout
+from bot.chart_cache import SPILL_PATH, ChartCache
+from bot.charts import ChartRenderer
+from bot.config import BotConfig
 from bot.embeds import EmbedGenerator
+from bot.views import LeaderboardView
 from datetime import datetime, timedelta
+from rank.settings import get_setting
+
+TIMEOUT_MESSAGE = BotConfig.error_messages["timeout"]
+
+# Autocomplétion : Discord n'affiche que 25 choix et attend la réponse 3 s
+AUTOCOMPLETE_LIMIT = 25
+AUTOCOMPLETE_TIMEOUT = 2.0
+
+# Jours affichés par /progression
+PROGRESSION_DAYS = 10
 
 class RankingCommands:
-    def __init__(self, bot):
+    def __init__(self, bot, db=None):
         self.bot = bot
-        self.db = RankDatabase()
+        # Les requêtes s'exécutent hors de la boucle d'événements
+        self.db = AsyncRankDatabase(db)
+        # Les graphiques sont rendus dans un pool de processus
+        self.charts = ChartRenderer()
+        # Graphiques déjà rendus, jusqu'au prochain jour enregistré
+        self.chart_cache = ChartCache(
+            max_bytes=get_setting('visualization.cache_max_mb', 32) * 1024 * 1024,
+            ttl=get_setting('visualization.cache_duration', 3600),
+            spill_dir=SPILL_PATH if get_setting('visualization.cache_spill', False) else None
+        )
         self.embed_generator = EmbedGenerator()
         
+    async def _progression_message(self, joueur: str):
+        """Embed et graphique de progression d'un joueur, rendus ou tirés du cache.
+        
+        Returns:
+            tuple: (embed, fichier) ou None si le joueur est inconnu
+        """
+        version = await self.db.data_version()
+        key = (joueur, PROGRESSION_DAYS)
+        cached = self.chart_cache.get(key, version)
+        if cached is not None:
+            chart, payload = cached
+            return discord.Embed.from_dict(payload), self.embed_generator.create_chart_file(chart)
+        
+        history = await self.db.get_player_history(joueur, limit=PROGRESSION_DAYS)
+        if not history:
+            return None
+        chart = await self.charts.progression(joueur, history)
+        embed, file = self.embed_generator.create_progression_embed(joueur, history, chart)
+        self.chart_cache.put(key, version, chart, embed.to_dict())
+        return embed, file
+        
+    async def _player_choices(self, interaction: discord.Interaction, current: str):
+        """Joueurs proposés pendant la saisie (recherche approchée)."""
+        try:
+            matches = await self.db.search_players(current, limit=AUTOCOMPLETE_LIMIT, timeout=AUTOCOMPLETE_TIMEOUT)
+        except QueryTimeout:
+            return []
+        return [
+            app_commands.Choice(name=f"{m['name']} ({m['guild']})" if m['guild'] else m['name'], value=m['name'])
+            for m in matches
+        ]
+    
+    async def _guild_choices(self, interaction: discord.Interaction, current: str):
+        """Guildes proposées pendant la saisie (recherche approchée)."""
+        try:
+            matches = await self.db.search_guilds(current, limit=AUTOCOMPLETE_LIMIT, timeout=AUTOCOMPLETE_TIMEOUT)
+        except QueryTimeout:
+            return []
+        return [app_commands.Choice(name=f"{m['name']} ({m['members']} joueurs)", value=m['name']) for m in matches]
+    
+    async def _player_not_found(self, player_name: str) -> str:
+        """Message d'erreur d'un joueur inconnu, avec les noms les plus proches."""
+        message = f"Aucun historique trouvé pour le joueur {player_name}."
+        matches = await self.db.search_players(player_name, limit=3)
+        if matches:
+            message += " Vouliez-vous dire : " + ", ".join(m['name'] for m in matches) + " ?"
+        return message
+    
     def setup(self):
         """Configure les commandes du bot."""
         
@@ -51,10 +123,10 @@ class RankingCommands:
                 
                 # Si un joueur est spécifié, afficher son historique
                 if joueur:
-                    history = self.db.get_player_history(joueur, limit=30)  # Récupère les 30 derniers jours
+                    history = await self.db.get_player_history(joueur, limit=30)  # Récupère les 30 derniers jours
                     if not history:
                         await interaction.followup.send(
-                            embed=self.embed_generator.create_error_embed(f"Aucun historique trouvé pour le joueur {joueur}.")
+                            embed=self.embed_generator.create_error_embed(await self._player_not_found(joueur))
                         )
                         return
                     
@@ -66,14 +138,15 @@ class RankingCommands:
                     await interaction.followup.send(embed=embed)
                     return
 
-                # Récupération des données avec les filtres
-                players = self.db.get_latest_ranking(
-                    limit=100,
-                    guild_name=guilde,
-                    target_date=target_date
+                # Première page, précalculée à l'enregistrement du jour
+                first_page = await self.db.get_leaderboard_page(
+                    0,
+                    target_date=target_date,
+                    ranking_type='dreamland',
+                    guild_name=guilde
                 )
                 
-                if not players:
+                if not first_page or not first_page['count']:
                     error_message = "Aucun classement disponible"
                     if guilde:
                         error_message += f" pour la guilde {guilde}"
@@ -84,9 +157,6 @@ class RankingCommands:
                     )
                     return
                 
-                # Division des joueurs en groupes de 25
-                player_groups = [players[i:i + 25] for i in range(0, len(players), 25)]
-                
                 # Formatage de la date
                 display_date = target_date.strftime("%d/%m/%Y") if target_date else datetime.now().strftime("%d/%m/%Y")
                 
@@ -95,23 +165,32 @@ class RankingCommands:
                 if guilde:
                     base_title += f" - Guilde: {guilde}"
                 
-                # Envoi des embeds
-                for i, group in enumerate(player_groups):
-                    start_rank = i * 25 + 1
-                    end_rank = start_rank + len(group) - 1
-                    embed = self.embed_generator.create_ranking_embed(
-                        title=f"{base_title} ({start_rank}-{end_rank})",
-                        players=group,
-                        date=target_date or datetime.now()
-                    )
-                    await interaction.followup.send(embed=embed)
+                # Un seul message ; les boutons changent la page affichée
+                view = LeaderboardView(
+                    self.db,
+                    self.embed_generator,
+                    title=base_title,
+                    date=target_date or datetime.now(),
+                    first_page=first_page,
+                    target_date=target_date,
+                    guild_name=guilde
+                )
+                view.message = await interaction.followup.send(embed=view.embed, view=view, wait=True)
                 
+            except QueryTimeout as e:
+                logger.warning(f"Classement non affiché : {e}")
+                await interaction.followup.send(
+                    embed=self.embed_generator.create_error_embed(TIMEOUT_MESSAGE)
+                )
             except Exception as e:
                 logger.error(f"Erreur lors de l'affichage du classement: {e}")
                 await interaction.followup.send(
                     embed=self.embed_generator.create_error_embed("Une erreur est survenue lors de la récupération du classement.")
                 )
                 
+        royaume_onirique.autocomplete('joueur')(self._player_choices)
+        royaume_onirique.autocomplete('guilde')(self._guild_choices)
+        
         @self.bot.tree.command(name="progression", description="Affiche la progression d'un joueur sur les 10 derniers jours")
         @app_commands.describe(
             joueur="Nom du joueur à rechercher"
@@ -121,20 +200,26 @@ class RankingCommands:
             await interaction.response.defer()
             
             try:
-                # Récupération de l'historique des 10 derniers jours
-                history = self.db.get_player_history(joueur, limit=10)
-                if not history:
+                # Graphique des 10 derniers jours et son embed
+                message = await self._progression_message(joueur)
+                if message is None:
                     await interaction.followup.send(
-                        embed=self.embed_generator.create_error_embed(f"Aucun historique trouvé pour le joueur {joueur}.")
+                        embed=self.embed_generator.create_error_embed(await self._player_not_found(joueur))
                     )
                     return
                     
-                # Création du graphique et de l'embed
-                embed, file = self.embed_generator.create_progression_embed(joueur, history)
+                embed, file = message
                 await interaction.followup.send(file=file, embed=embed)
                 
+            except (QueryTimeout, asyncio.TimeoutError) as e:
+                logger.warning(f"Progression non affichée : {e!r}")
+                await interaction.followup.send(
+                    embed=self.embed_generator.create_error_embed(TIMEOUT_MESSAGE)
+                )
             except Exception as e:
                 logger.error(f"Erreur lors de l'affichage de la progression: {e}")
                 await interaction.followup.send(
                     embed=self.embed_generator.create_error_embed("Une erreur est survenue lors de la récupération des données.")
-                ) 
\ No newline at end of file
+                )
+        
+        progression.autocomplete('joueur')(self._player_choices)
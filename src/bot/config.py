@@ -27,6 +27,7 @@ class BotConfig:
     # Messages d'erreur
     error_messages = {
         "db_error": "Une erreur est survenue lors de la récupération des données.",
+        "timeout": "La base de données met trop de temps à répondre, réessayez dans quelques instants.",
         "player_not_found": "Joueur non trouvé dans la base de données.",
         "invalid_command": "Commande invalide. Utilisez /help pour voir la liste des commandes disponibles."
     } 
\ No newline at end of file
@@ -24,8 +24,16 @@ class RankingBot(discord.Client):
         """Configuration initiale du bot."""
         logger.info("Configuration du bot Discord...")
         self.commands.setup()
+        # Workers graphiques prêts avant la première commande
+        await self.loop.run_in_executor(None, self.commands.charts.warm_up)
         await self.tree.sync()
         
+    async def close(self):
+        """Arrête le bot puis les pools de la base et des graphiques."""
+        await super().close()
+        self.commands.charts.close()
+        self.commands.db.close()
+        
     async def on_ready(self):
         """Événement appelé quand le bot est prêt."""
         logger.info(f"Bot connecté en tant que {self.user}")
@@ -4,11 +4,9 @@ Générateur d'embeds Discord pour l'affichage des classements.
 
 import discord
 from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.ticker import MultipleLocator
-from matplotlib.dates import DateFormatter
 import io
 from bot.config import BotConfig
+from storage.snapshots import format_table
 
 class EmbedGenerator:
     """Classe pour générer les embeds Discord."""
@@ -24,46 +22,21 @@ class EmbedGenerator:
             players: Liste des joueurs et leurs scores
             date: Date du classement
         """
+        return self.create_ranking_page_embed(title, format_table(players), date)
+        
+    def create_ranking_page_embed(self, title: str, table: str, date: datetime) -> discord.Embed:
+        """Crée un embed pour une page de classement déjà mise en forme.
+        
+        Args:
+            title: Titre du classement
+            table: Tableau de la page (voir storage.snapshots.format_table)
+            date: Date du classement
+        """
         embed = discord.Embed(
             title=title,
             color=self.config.colors["info"],
             timestamp=date
         )
-        
-        # Création du tableau formaté
-        table = "```\n"
-        # En-tête avec alignement
-        table += "Rang    Joueur          Guilde        J-1    Moy30j\n"
-        table += "─" * 50 + "\n"
-        
-        # Données des joueurs
-        for player in players:
-            # Formatage du rang (4 caractères + 2 espaces)
-            rank = str(player['rank']).rjust(4) + "  "
-            
-            # Formatage du nom (15 caractères)
-            name = player['name'][:15].ljust(15)
-            
-            # Formatage de la guilde (12 caractères)
-            guild = (player['guild'] or 'Sans')[:12].ljust(12)
-            
-            # Formatage du changement de rang (6 caractères)
-            if player['rank_change'] > 0:
-                rank_change = f"(+{player['rank_change']})".rjust(6)
-            elif player['rank_change'] < 0:
-                rank_change = f"({player['rank_change']})".rjust(6)
-            else:
-                rank_change = "(=)".rjust(6)
-            
-            # Formatage de la moyenne (6 caractères)
-            avg_rank = str(int(float(player['avg_rank']))).rjust(6)
-            
-            # Ajout de la ligne au tableau
-            table += f"{rank}{name}{guild}{rank_change}  {avg_rank}\n"
-            
-        table += "```"
-        
-        # Ajout du tableau à l'embed
         embed.description = table
         
         # Configuration du footer
@@ -166,52 +139,15 @@ class EmbedGenerator:
             
         return embed
 
-    def create_progression_embed(self, player_name: str, history: list) -> discord.Embed:
+    def create_progression_embed(self, player_name: str, history: list, chart: bytes) -> discord.Embed:
         """Crée un embed avec un graphique de progression pour un joueur.
         
         Args:
             player_name: Nom du joueur
             history: Liste des classements avec date et rang
+            chart: Graphique PNG (voir bot.charts)
         """
-        # Création du graphique
-        plt.figure(figsize=(10, 6))
-        plt.style.use('dark_background')
-        
-        # Préparation des données
-        dates = []
-        ranks = []
-        for entry in reversed(history):  # On inverse pour avoir l'ordre chronologique
-            date = datetime.strptime(entry['date'], "%Y-%m-%d")
-            dates.append(date)
-            ranks.append(entry['rank'])
-        
-        # Création du graphique
-        plt.plot(dates, ranks, 'b-', marker='o')
-        
-        # Configuration des axes
-        plt.gca().invert_yaxis()  # Inverser l'axe Y car rang 1 est meilleur
-        plt.ylim(100.5, 0.5)  # Limiter l'axe Y de 1 à 100
-        plt.gca().yaxis.set_major_locator(MultipleLocator(10))  # Graduations tous les 10 rangs
-        
-        # Personnalisation
-        plt.title(f"Progression de {player_name} - Royaume Onirique", color='white', pad=20)
-        plt.xlabel("Date", color='white')
-        plt.ylabel("Rang", color='white')
-        plt.grid(True, linestyle='--', alpha=0.3)
-        
-        # Format des dates en bas du graphique
-        date_formatter = DateFormatter('%d/%m')
-        plt.gca().xaxis.set_major_formatter(date_formatter)
-        plt.xticks(rotation=45)
-        
-        # Ajustement du layout
-        plt.tight_layout()
-        
-        # Conversion du graphique en bytes pour Discord
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png', facecolor='#2f3136')
-        buffer.seek(0)
-        plt.close()
+        ranks = [entry['rank'] for entry in reversed(history)]  # Ordre chronologique
         
         # Création de l'embed
         embed = discord.Embed(
@@ -239,7 +175,14 @@ class EmbedGenerator:
             embed.add_field(name="Statistiques", value=stats, inline=False)
         
         # Ajout du graphique comme image
-        file = discord.File(buffer, filename="progression.png")
         embed.set_image(url="attachment://progression.png")
         
-        return embed, file 
\ No newline at end of file
+        return embed, self.create_chart_file(chart)
+    
+    def create_chart_file(self, chart: bytes) -> discord.File:
+        """Crée la pièce jointe d'un graphique de progression.
+        
+        Args:
+            chart: Graphique PNG
+        """
+        return discord.File(io.BytesIO(chart), filename="progression.png") 
\ No newline at end of file
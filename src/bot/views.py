@@ -0,0 +1,128 @@
+"""
+Vues interactives (boutons) des messages du bot.
+"""
+
+import discord
+from loguru import logger
+from storage.aio import QueryTimeout
+from storage.snapshots import PAGE_SIZE
+
+# Durée pendant laquelle les boutons d'un classement restent actifs (s)
+VIEW_TIMEOUT = 600
+
+
+class LeaderboardView(discord.ui.View):
+    """Classement paginé : un seul message, dont les boutons changent la page.
+
+    Chaque page n'est demandée qu'à son premier affichage puis conservée par
+    la vue ; les pages suivantes ne coûtent qu'une modification du message.
+    """
+
+    def __init__(self, db, embed_generator, title: str, date, first_page: dict,
+                 target_date=None, guild_name: str = None, timeout: float = VIEW_TIMEOUT):
+        """
+        Args:
+            db: Accès asynchrone à la base (AsyncRankDatabase)
+            embed_generator: Générateur d'embeds
+            title: Titre du classement, sans l'intervalle de rangs
+            date: Date affichée dans les embeds
+            first_page: Première page (voir RankDatabase.get_leaderboard_page)
+            target_date: Date J-1 demandée (défaut : le classement le plus récent)
+            guild_name: Guilde filtrée
+            timeout: Durée d'activité des boutons (s)
+        """
+        super().__init__(timeout=timeout)
+        self.db = db
+        self.embed_generator = embed_generator
+        self.title = title
+        self.date = date
+        self.target_date = target_date
+        self.guild_name = guild_name
+        self.page = 0
+        self.page_count = first_page['page_count']
+        self.message = None
+        self._embeds = {0: self._embed(first_page)}
+        self._update_buttons()
+
+    @property
+    def embed(self) -> discord.Embed:
+        """Embed de la page affichée."""
+        return self._embeds[self.page]
+
+    def _embed(self, page: dict) -> discord.Embed:
+        start_rank = page['page'] * PAGE_SIZE + 1
+        end_rank = min(start_rank + PAGE_SIZE - 1, page['count'])
+        return self.embed_generator.create_ranking_page_embed(
+            title=f"{self.title} ({start_rank}-{end_rank})",
+            table=page['table'],
+            date=self.date
+        )
+
+    async def _page_embed(self, number: int) -> discord.Embed:
+        """Embed d'une page, demandé à la base à son premier affichage."""
+        if number not in self._embeds:
+            page = await self.db.get_leaderboard_page(
+                number,
+                target_date=self.target_date,
+                ranking_type='dreamland',
+                guild_name=self.guild_name
+            )
+            if not page or page['table'] is None:
+                return None
+            self._embeds[number] = self._embed(page)
+        return self._embeds[number]
+
+    def _update_buttons(self):
+        self.first_button.disabled = self.previous_button.disabled = self.page == 0
+        self.next_button.disabled = self.last_button.disabled = self.page >= self.page_count - 1
+        self.position_button.label = f"{self.page + 1}/{self.page_count}"
+
+    async def show(self, interaction: discord.Interaction, number: int):
+        """Affiche une page dans le message de la vue."""
+        number = max(0, min(number, self.page_count - 1))
+        try:
+            embed = await self._page_embed(number)
+        except QueryTimeout as e:
+            logger.warning(f"Page {number + 1} non affichée : {e}")
+            await interaction.response.send_message(
+                embed=self.embed_generator.create_error_embed(self.embed_generator.config.error_messages["timeout"]),
+                ephemeral=True
+            )
+            return
+        if embed is None:
+            # Classement modifié depuis l'affichage : moins de pages
+            await interaction.response.defer()
+            return
+        self.page = number
+        self._update_buttons()
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(emoji="⏮️", style=discord.ButtonStyle.secondary)
+    async def first_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, 0)
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.primary)
+    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page - 1)
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.secondary, disabled=True)
+    async def position_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        pass
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.primary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page + 1)
+
+    @discord.ui.button(emoji="⏭️", style=discord.ButtonStyle.secondary)
+    async def last_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page_count - 1)
+
+    async def on_timeout(self):
+        """Désactive les boutons une fois la vue expirée."""
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException as e:
+                logger.debug(f"Boutons du classement non désactivés : {e}")
@@ -1,8 +1,19 @@
 """
 Module de gestion des classements.
+
+Les gestionnaires de classement ne sont importés qu'au premier accès : importer
+`rank.database` ne charge ainsi ni l'OCR ni les modules win32.
 """
 
-from .base import RankBase
-from .dreamland import DreamlandRank
+__all__ = ['RankBase', 'DreamlandRank']
+
 
-__all__ = ['RankBase', 'DreamlandRank'] 
\ No newline at end of file
+def __getattr__(name):
+    """Importe paresseusement les gestionnaires de classement."""
+    if name == 'RankBase':
+        from .base import RankBase
+        return RankBase
+    if name == 'DreamlandRank':
+        from .dreamland import DreamlandRank
+        return DreamlandRank
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
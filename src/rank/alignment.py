@@ -0,0 +1,154 @@
+"""
+Alignement des captures successives du classement.
+
+Deux captures consécutives se recouvrent largement : l'alignement estime le
+décalage vertical du défilement pour ne transmettre à l'OCR que les lignes
+nouvellement apparues.
+"""
+
+import cv2
+import numpy as np
+from loguru import logger
+
+
+class FrameAligner:
+    """
+    Détermine les lignes nouvelles de chaque capture par rapport à la précédente.
+
+    Chaque capture est réduite à son profil par bandes de colonnes : pour chaque
+    ligne de pixels, la moyenne de chacune de `strips` bandes verticales. Deux
+    blocs sont comparés par l'écart de leur bande la plus différente, moyenné
+    sur les lignes : des lignes du classement qui ne diffèrent que par le rang
+    restent ainsi distinguées. Le décalage est estimé sur la zone de liste,
+    puis chaque ligne supposée déjà lue est vérifiée. En cas de doute, la ligne
+    est considérée comme nouvelle : l'alignement ne peut qu'économiser de l'OCR,
+    jamais perdre un joueur.
+    """
+
+    def __init__(self, layout, tolerance=0.01, max_difference=6.0, min_margin=1.5, strips=32):
+        """
+        Args:
+            layout (ZoneLayout): Disposition des zones OCR
+            tolerance (float): Écart vertical toléré entre une ligne décalée et
+                               un emplacement, en fraction de la hauteur
+            max_difference (float): Écart maximal (niveaux de gris) pour
+                                    considérer deux blocs identiques
+            min_margin (float): Rapport minimal entre le second meilleur
+                                décalage et le meilleur pour accepter l'estimation
+            strips (int): Nombre de bandes de colonnes du profil
+        """
+        # Bande verticale (haut, bas) de chaque emplacement, en fraction de la hauteur
+        self.bands = [(float(top), float(bottom)) for top, bottom in layout.row_bands()]
+
+        self.tolerance = tolerance
+        self.max_difference = max_difference
+        self.min_margin = min_margin
+        self.strips = strips
+        self.skipped = 0
+        self.reset()
+
+    def reset(self):
+        """Oublie la capture précédente (nouvelle session)."""
+        self._previous = None
+        self._previous_read = None
+
+    def _pixel_bands(self, height):
+        """Bandes des emplacements en pixels pour une hauteur d'image."""
+        return [(int(top * height), int(bottom * height)) for top, bottom in self.bands]
+
+    def profile(self, gray):
+        """
+        Profil par bandes de colonnes d'une capture en niveaux de gris.
+
+        Returns:
+            ndarray: (hauteur, strips) moyennes de chaque bande par ligne
+        """
+        strips = min(self.strips, gray.shape[1])
+        width = gray.shape[1] // strips * strips
+        return gray[:, :width].reshape(gray.shape[0], strips, -1).mean(axis=2)
+
+    @staticmethod
+    def difference(a, b):
+        """Écart entre deux blocs de profil : bande la plus différente, moyennée sur les lignes."""
+        return float(np.abs(a - b).max(axis=1).mean())
+
+    def estimate_offset(self, previous, current):
+        """
+        Estime le défilement vertical entre deux profils (voir `profile`).
+
+        Returns:
+            int: Décalage d en pixels (current[y] ≈ previous[y + d]) ou None si
+                 l'estimation n'est pas fiable
+        """
+        height = current.shape[0]
+        bands = self._pixel_bands(height)
+        top, bottom = bands[0][0], bands[-1][1]
+        min_overlap = max(1, min(b - t for t, b in bands))
+
+        prev_profile = previous[top:bottom]
+        cur_profile = current[top:bottom]
+
+        scores = np.array([
+            self.difference(cur_profile[:len(cur_profile) - offset], prev_profile[offset:])
+            for offset in range(0, bottom - top - min_overlap + 1)
+        ])
+
+        best = int(scores.argmin())
+        if scores[best] > self.max_difference:
+            return None
+
+        # Rejeter une estimation ambiguë (motif répétitif, capture uniforme)
+        tol = max(1, int(self.tolerance * height))
+        others = np.concatenate([scores[:max(0, best - tol)], scores[best + tol + 1:]])
+        if len(others) and others.min() < self.min_margin * max(scores[best], 0.5):
+            return None
+
+        return best
+
+    def new_rows(self, image):
+        """
+        Retourne les emplacements de la capture à transmettre à l'OCR.
+
+        Args:
+            image: Capture BGR, fournie dans l'ordre de défilement
+
+        Returns:
+            list: Index des emplacements nouveaux
+        """
+        gray = self.profile(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY).astype(np.float32))
+        height = gray.shape[0]
+        bands = self._pixel_bands(height)
+        rows = list(range(len(bands)))
+
+        previous, previous_read = self._previous, self._previous_read
+        self._previous = gray
+        self._previous_read = set(rows)
+
+        if previous is None or previous.shape != gray.shape:
+            return rows
+
+        offset = self.estimate_offset(previous, gray)
+        if offset is None:
+            logger.debug("Décalage entre captures non fiable, toutes les lignes sont lues")
+            return rows
+
+        tol = max(1, int(self.tolerance * height))
+        new = []
+        for row, (top, bottom) in enumerate(bands):
+            # Emplacement de la capture précédente qui affichait ce contenu
+            match = next((j for j, (prev_top, _) in enumerate(bands)
+                          if abs(top + offset - prev_top) <= tol), None)
+            if match is None or match not in previous_read:
+                new.append(row)
+                continue
+
+            prev_top = bands[match][0]
+            current_band = gray[top:bottom]
+            previous_band = previous[prev_top:prev_top + (bottom - top)]
+            if previous_band.shape != current_band.shape or \
+                    self.difference(current_band, previous_band) > self.max_difference:
+                new.append(row)
+
+        self.skipped += len(rows) - len(new)
+        logger.debug(f"Défilement de {offset} px : {len(new)}/{len(rows)} ligne(s) nouvelle(s)")
+        return new
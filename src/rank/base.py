@@ -2,6 +2,7 @@
 Module de base pour la gestion des classements.
 """
 
+import threading
 import time
 from loguru import logger
 import pyautogui
@@ -14,6 +15,10 @@ import win32con
 from mapper.capture import capture_window, find_game_windows
 from mapper.config_writer import load_mapping
 
+class CaptureCancelled(Exception):
+    """Pilotage du jeu interrompu par `RankBase.cancel`."""
+
+
 class RankBase:
     """Classe de base pour la gestion des classements."""
     
@@ -28,6 +33,8 @@ class RankBase:
         self.positions = load_mapping(ranking_type)
         self.hwnd = None
         self.current_image = None
+        # Demande d'arrêt du pilotage (clics, défilement), voir cancel
+        self.cancelled = threading.Event()
         
         if not self.positions:
             raise ValueError(f"Aucune position configurée pour {ranking_type}")
@@ -86,6 +93,27 @@ class RankBase:
         
         return True
 
+    def cancel(self):
+        """
+        Demande l'arrêt du pilotage en cours : le prochain clic ou la prochaine
+        attente lève CaptureCancelled.
+        """
+        self.cancelled.set()
+
+    def resume(self):
+        """Autorise de nouveau le pilotage après une annulation."""
+        self.cancelled.clear()
+
+    def check_cancelled(self):
+        """Lève CaptureCancelled si l'arrêt a été demandé."""
+        if self.cancelled.is_set():
+            raise CaptureCancelled("Pilotage du jeu annulé")
+
+    def pause(self, seconds):
+        """Attend `seconds` secondes ; lève CaptureCancelled si l'arrêt est demandé entre-temps."""
+        if self.cancelled.wait(seconds):
+            raise CaptureCancelled("Pilotage du jeu annulé")
+
     def click_position(self, position_name, delay=1.0):
         """
         Clique sur une position configurée.
@@ -93,9 +121,13 @@ class RankBase:
         Args:
             position_name (str): Nom de la position
             delay (float): Délai après le clic en secondes
+
+        Raises:
+            CaptureCancelled: Si l'arrêt est demandé avant le clic ou pendant le délai
         """
         if position_name not in self.positions:
             raise ValueError(f"Position '{position_name}' non trouvée")
+        self.check_cancelled()
         
         # Activer la fenêtre avant le clic
         self._activate_window()
@@ -108,8 +140,8 @@ class RankBase:
         
         # Cliquer et attendre
         pyautogui.click(screen_x, screen_y)
-        time.sleep(delay)
         logger.debug(f"Clic sur {position_name} ({screen_x}, {screen_y})")
+        self.pause(delay)
     
     def _get_screen_coordinates(self, x, y):
         """
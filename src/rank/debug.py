@@ -0,0 +1,145 @@
+"""
+Écriture asynchrone des images de debug de l'OCR.
+"""
+
+import os
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+from loguru import logger
+
+from .extraction import FIELDS
+
+# Dossier racine des images de debug des régions
+DEBUG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'debug', 'regions')
+
+# Marqueur de fin d'écriture
+_END = object()
+
+
+class DebugSink:
+    """
+    Enregistre les régions OCR en arrière-plan, hors du chemin critique.
+
+    Chaque session écrit dans son propre dossier horodaté. En mode fichiers,
+    chaque région est conservée sous un nom capture/ligne/champ ; en mode
+    planche, une seule image par capture regroupe toutes ses régions. La file
+    est bornée : si l'écriture ne suit pas, les régions en excès sont ignorées
+    plutôt que de ralentir l'OCR.
+    """
+
+    MODES = ('files', 'contact_sheet')
+
+    def __init__(self, directory=None, mode='files', max_pending=512):
+        """
+        Args:
+            directory (str): Dossier de la session (par défaut : horodaté sous data/debug/regions)
+            mode (str): 'files' ou 'contact_sheet'
+            max_pending (int): Nombre maximum de régions en attente d'écriture
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Mode de debug inconnu : {mode}")
+
+        self.directory = directory or os.path.join(DEBUG_DIR, time.strftime("%Y%m%d_%H%M%S"))
+        self.mode = mode
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._sheets = {}
+        self._thread = threading.Thread(target=self._run, name="ocr-debug", daemon=True)
+        self._thread.start()
+
+    def submit(self, capture_idx, row, field, original, binary):
+        """
+        Transmet une région à écrire, sans bloquer.
+
+        Args:
+            capture_idx (int): Index de la capture
+            row (int): Emplacement dans la capture
+            field (str): rank, name, guild ou score
+            original: Région source (BGR)
+            binary: Région binarisée envoyée à l'OCR
+        """
+        try:
+            self._queue.put_nowait((capture_idx, row, field, original, binary))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Termine l'écriture des régions en attente."""
+        if self._thread is None:
+            return
+        self._queue.put(_END)
+        self._thread.join()
+        self._thread = None
+        logger.info(f"Images de debug écrites dans {self.directory} "
+                    f"({self.written} fichier(s), {self.dropped} région(s) ignorée(s))")
+
+    def _run(self):
+        """Boucle d'écriture."""
+        os.makedirs(self.directory, exist_ok=True)
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                break
+            try:
+                if self.mode == 'files':
+                    self._write_region(*item)
+                else:
+                    capture_idx, row, field, original, binary = item
+                    self._sheets.setdefault(capture_idx, {})[(row, field)] = (original, binary)
+            except Exception as e:
+                logger.warning(f"Erreur lors de l'écriture d'une image de debug : {e}")
+
+        for capture_idx, regions in sorted(self._sheets.items()):
+            try:
+                self._write_sheet(capture_idx, regions)
+            except Exception as e:
+                logger.warning(f"Erreur lors de l'écriture de la planche {capture_idx+1} : {e}")
+        self._sheets.clear()
+
+    def _imwrite(self, name, image):
+        """Écrit une image dans le dossier de la session."""
+        cv2.imwrite(os.path.join(self.directory, name), image)
+        self.written += 1
+
+    def _write_region(self, capture_idx, row, field, original, binary):
+        """Écrit une région sous forme de deux fichiers."""
+        prefix = f"capture{capture_idx+1:03d}_row{row+1}_{field}"
+        self._imwrite(f"{prefix}_original.png", original)
+        self._imwrite(f"{prefix}_binary.png", binary)
+
+    def _write_sheet(self, capture_idx, regions):
+        """
+        Écrit une planche par capture : une ligne par emplacement, une colonne
+        par champ, la région source au-dessus de sa version binarisée.
+        """
+        rows = sorted({row for row, _ in regions})
+        fields = [field for field in FIELDS if any(f == field for _, f in regions)]
+
+        cells = {}
+        for key, (original, binary) in regions.items():
+            binary_bgr = cv2.cvtColor(binary, cv2.COLOR_GRAY2BGR) if binary.ndim == 2 else binary
+            # Ramener la source à l'échelle de la région binarisée
+            original = cv2.resize(original, (binary_bgr.shape[1], binary_bgr.shape[0]))
+            cells[key] = np.vstack([original, binary_bgr])
+
+        widths = {field: max(cells[(row, field)].shape[1] for row in rows if (row, field) in cells) for field in fields}
+        heights = {row: max(cells[(row, field)].shape[0] for field in fields if (row, field) in cells) for row in rows}
+
+        margin = 4
+        sheet = np.full((sum(heights.values()) + margin * (len(rows) + 1),
+                         sum(widths.values()) + margin * (len(fields) + 1), 3), 64, dtype=np.uint8)
+        y = margin
+        for row in rows:
+            x = margin
+            for field in fields:
+                cell = cells.get((row, field))
+                if cell is not None:
+                    sheet[y:y + cell.shape[0], x:x + cell.shape[1]] = cell
+                x += widths[field] + margin
+            y += heights[row] + margin
+
+        self._imwrite(f"capture{capture_idx+1:03d}_sheet.png", sheet)
@@ -16,9 +16,16 @@ import win32gui
 from PIL import Image
 import numpy as np
 import re
-import json
-import easyocr
-from .database import RankDatabase
+from storage.database import RankDatabase
+from .alignment import FrameAligner
+from .debug import DebugSink
+from .extraction import ZoneExtractor
+from .ocr import ocr_registry
+from .ocr_cache import get_recognition_cache
+from .parallel import ParallelExtractor
+from .pipeline import StreamingExtractor
+from .settings import get_setting
+from .zones import FIELDS, get_zone_layout, ZoneLayoutError
 from datetime import datetime, timedelta
 
 # Charger les variables d'environnement
@@ -26,9 +33,6 @@ load_dotenv()
 
 from .base import RankBase
 
-# Initialiser EasyOCR (ne sera initialisé qu'une seule fois)
-reader = easyocr.Reader(['en'])
-
 # Structures pour SendInput
 class MOUSEINPUT(ctypes.Structure):
     _fields_ = [
@@ -76,12 +80,15 @@ class DreamlandRank(RankBase):
         """Initialise le gestionnaire du Royaume Onirique."""
         super().__init__("dreamland")
         
-        # Initialiser EasyOCR
-        self.reader = easyocr.Reader(['en'])
-        
         # Initialiser la base de données
         self.db = RankDatabase()
         
+        # Extraction OCR en flux pendant le défilement (voir start_streaming)
+        self.stream = None
+        
+        # Images de debug des régions OCR (désactivées par défaut)
+        self.debug = None
+        
         # Vérifier que toutes les positions nécessaires sont configurées
         required_positions = {
             "Mode",
@@ -140,7 +147,7 @@ class DreamlandRank(RankBase):
             
             # Activer la fenêtre
             self._activate_window()
-            time.sleep(1.0)  # Attendre que la fenêtre soit active
+            self.pause(1.0)  # Attendre que la fenêtre soit active
             logger.info("Fenêtre activée, début de la navigation")
             
             # Cliquer sur le bouton Mode pour ouvrir le menu
@@ -172,27 +179,110 @@ class DreamlandRank(RankBase):
             end_x (int): Position X d'arrivée
             end_y (int): Position Y d'arrivée
             duration (float): Durée du glissement en secondes
+
+        Raises:
+            CaptureCancelled: Si l'arrêt est demandé (le bouton est toujours relâché)
         """
+        self.check_cancelled()
+        
         # Déplacer la souris au point de départ
         pyautogui.moveTo(start_x, start_y)
         time.sleep(0.1)
         
         # Appuyer sur le bouton gauche
         win32api.mouse_event(win32con.MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
+        try:
+            time.sleep(0.1)
+            
+            # Déplacer progressivement la souris
+            steps = 20
+            for i in range(steps + 1):
+                self.check_cancelled()
+                x = start_x + ((end_x - start_x) * i // steps)
+                y = start_y + ((end_y - start_y) * i // steps)
+                pyautogui.moveTo(x, y)
+                time.sleep(duration / steps)
+        finally:
+            # Relâcher le bouton gauche
+            win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
         time.sleep(0.1)
+
+    def _zone_layout(self):
+        """
+        Disposition des zones OCR, chargée une fois et relue seulement si
+        `ocr_zones.json` a changé.
         
-        # Déplacer progressivement la souris
-        steps = 20
-        for i in range(steps + 1):
-            x = start_x + ((end_x - start_x) * i // steps)
-            y = start_y + ((end_y - start_y) * i // steps)
-            pyautogui.moveTo(x, y)
-            time.sleep(duration / steps)
+        Returns:
+            ZoneLayout: Disposition des zones ou None si absente ou invalide
+        """
+        try:
+            return get_zone_layout()
+        except FileNotFoundError:
+            logger.error("Configuration des zones OCR non trouvée")
+        except ZoneLayoutError as e:
+            logger.error(f"Configuration des zones OCR invalide : {e}")
+        return None
+    
+    def _ocr_engine(self):
+        """Moteur OCR partagé, avec le cache de reconnaissance sauf s'il est désactivé."""
+        cache = get_recognition_cache() if get_setting('ocr.cache', True) else None
+        return ocr_registry.get_engine(cache=cache)
+    
+    def _debug_sink(self):
+        """
+        Destination des images de debug des régions, selon ocr.debug_regions
+        ('files', 'contact_sheet' ou false).
+        """
+        mode = get_setting('ocr.debug_regions', False)
+        if not mode:
+            return None
+        if self.debug is None:
+            self.debug = DebugSink(mode=mode)
+        return self.debug
+    
+    def _close_debug_sink(self):
+        """Termine l'écriture des images de debug."""
+        if self.debug is not None:
+            self.debug.close()
+            self.debug = None
+    
+    def _aligner(self, layout):
+        """Alignement des captures, sauf s'il est désactivé dans config.yaml."""
+        if not get_setting('ocr.align_frames', True):
+            return None
+        return FrameAligner(layout)
+    
+    def start_streaming(self):
+        """
+        Démarre l'OCR en flux : chaque capture de `scroll_and_capture` est
+        reconnue en arrière-plan pendant le défilement suivant.
         
-        # Relâcher le bouton gauche
-        win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
-        time.sleep(0.1)
-
+        Returns:
+            bool: True si le flux est démarré
+        """
+        layout = self._zone_layout()
+        if not layout:
+            return False
+        
+        extractor = ZoneExtractor(self._ocr_engine(), layout,
+                                  aligner=self._aligner(layout), debug=self._debug_sink())
+        self.stream = StreamingExtractor(extractor).start()
+        logger.info("OCR en flux démarré")
+        return True
+    
+    def stop_streaming(self):
+        """Interrompt l'OCR en flux sans attendre ses résultats (capture abandonnée)."""
+        if self.stream:
+            self.stream.abort()
+            self.stream = None
+            logger.info("OCR en flux interrompu")
+    
+    def _store_capture(self, image):
+        """Conserve une capture et la transmet à l'OCR en flux s'il est actif."""
+        self.captures.append(image)
+        if self.stream:
+            self.stream.submit(image)
+    
     def scroll_and_capture(self, num_scrolls=24):
         """
         Fait défiler le classement et capture les données.
@@ -210,7 +300,7 @@ class DreamlandRank(RankBase):
             # Capturer l'écran initial
             if not self.capture_screen():
                 return False
-            self.captures.append(self.current_image.copy())
+            self._store_capture(self.current_image.copy())
             
             # Points fixes pour le défilement (coordonnées relatives à la fenêtre)
             scroll_start_y = 1000  # Point de départ fixe
@@ -219,6 +309,8 @@ class DreamlandRank(RankBase):
             
             # Faire défiler et capturer
             for i in range(num_scrolls):
+                self.check_cancelled()
+                
                 # Réduire progressivement le point d'arrivée
                 current_end_y = scroll_end_y - (i * 0.20)  # Réduit de 0.5 pixels à chaque itération
                 
@@ -228,12 +320,12 @@ class DreamlandRank(RankBase):
                 
                 # Faire glisser de bas en haut
                 self.drag_mouse(screen_x, screen_start_y, screen_x, screen_end_y, duration=0.5)
-                time.sleep(2)
+                self.pause(2)
                 
                 # Capturer l'écran
                 if not self.capture_screen():
                     return False
-                self.captures.append(self.current_image.copy())
+                self._store_capture(self.current_image.copy())
                 
                 logger.info(f"Capture {i+1}/{num_scrolls} effectuée (point d'arrivée : {current_end_y})")
             
@@ -254,49 +346,6 @@ class DreamlandRank(RankBase):
             logger.error(f"Erreur lors de la capture : {e}")
             return False
 
-    def _extract_region(self, image, region, is_rank=False, is_score=False):
-        """Extrait le texte d'une région spécifique de l'image"""
-        try:
-            x, y, w, h = region
-            roi = image[y:y+h, x:x+w].copy()
-            
-            # Redimensionner avec un facteur de 2.5
-            h, w = roi.shape[:2]
-            scale = 2.5
-            roi = cv2.resize(roi, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_CUBIC)
-            
-            # Convertir en niveaux de gris
-            gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-            
-            # Ajuster le contraste (1.5) et la luminosité (0)
-            gray = cv2.convertScaleAbs(gray, alpha=1.5, beta=0)
-            
-            # Binarisation avec un seuil de 240
-            _, binary = cv2.threshold(gray, 240, 255, cv2.THRESH_BINARY)
-            
-            # Configuration OCR selon le type de texte
-            if is_rank or is_score:
-                # Pour les rangs et scores, on utilise uniquement les chiffres
-                result = self.reader.readtext(binary, allowlist='0123456789M', paragraph=False, detail=0)
-            else:
-                # Pour les noms et guildes, on utilise tous les caractères
-                result = self.reader.readtext(binary, paragraph=False, detail=0)
-            
-            # Sauvegarder les images de debug
-            debug_dir = os.path.join('data', 'debug', 'regions')
-            os.makedirs(debug_dir, exist_ok=True)
-            
-            region_type = 'rank' if is_rank else 'score' if is_score else 'text'
-            cv2.imwrite(os.path.join(debug_dir, f'original_{region_type}.png'), roi)
-            cv2.imwrite(os.path.join(debug_dir, f'binary_{region_type}.png'), binary)
-            
-            # Retourner le premier résultat trouvé ou une chaîne vide
-            return result[0] if result else ''
-            
-        except Exception as e:
-            logger.warning(f"Erreur lors de l'extraction de texte : {str(e)}")
-            return ''
-
     def _draw_extraction_zones(self, image):
         """
         Dessine les zones d'extraction sur l'image pour visualisation.
@@ -318,61 +367,34 @@ class DreamlandRank(RankBase):
             'guild': (255, 255, 0),  # Jaune
             'score': (255, 0, 255)   # Magenta
         }
-        
-        # Zone de date
-        date_x = int(width * 0.8)
-        date_y = int(height * 0.1)
-        cv2.rectangle(debug_image, (date_x, date_y), 
-                     (date_x + 100, date_y + 30), colors['date'], 2)
-        cv2.putText(debug_image, "Date", (date_x, date_y - 5),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, colors['date'], 2)
-        
-        # Zones des entrées
-        entry_height = 50
-        start_y = int(height * 0.2)
-        
-        for i in range(5):
-            base_y = start_y + (i * entry_height)
-            
-            # Rang
-            rank_x = int(width * 0.05)
-            cv2.rectangle(debug_image, 
-                (rank_x, base_y),
-                (rank_x + int(width * 0.1), base_y + entry_height),
-                colors['rank'], 2)
-            if i == 0:
-                cv2.putText(debug_image, "Rang", (rank_x, start_y - 5),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, colors['rank'], 2)
-            
-            # Nom
-            name_x = int(width * 0.15)
-            cv2.rectangle(debug_image,
-                (name_x, base_y),
-                (name_x + int(width * 0.3), base_y + entry_height),
-                colors['name'], 2)
-            if i == 0:
-                cv2.putText(debug_image, "Nom", (name_x, start_y - 5),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, colors['name'], 2)
-            
-            # Guilde
-            guild_x = int(width * 0.45)
-            cv2.rectangle(debug_image,
-                (guild_x, base_y),
-                (guild_x + int(width * 0.3), base_y + entry_height),
-                colors['guild'], 2)
-            if i == 0:
-                cv2.putText(debug_image, "Guilde", (guild_x, start_y - 5),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, colors['guild'], 2)
-            
-            # Score
-            score_x = int(width * 0.75)
-            cv2.rectangle(debug_image,
-                (score_x, base_y),
-                (score_x + int(width * 0.15), base_y + entry_height),
-                colors['score'], 2)
-            if i == 0:
-                cv2.putText(debug_image, "Score", (score_x, start_y - 5),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, colors['score'], 2)
+        labels = {'rank': "Rang", 'name': "Nom", 'guild': "Guilde", 'score': "Score"}
+
+        layout = self._zone_layout()
+        if not layout:
+            return debug_image
+
+        # Zone de date (date_j1 de la configuration, si elle est sélectionnée)
+        for zone in layout.extra.get('date_j1') or []:
+            try:
+                x = int(float(zone['x_percent']) * width)
+                y = int(float(zone['y_percent']) * height)
+                w = int(float(zone['width_percent']) * width)
+                h = int(float(zone['height_percent']) * height)
+            except (KeyError, TypeError, ValueError):
+                continue
+            cv2.rectangle(debug_image, (x, y), (x + w, y + h), colors['date'], 2)
+            cv2.putText(debug_image, "Date", (x, y - 5),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, colors['date'], 2)
+
+        # Zones des entrées, autant de lignes que dans la configuration
+        boxes = layout.boxes(width, height)
+        for row in range(layout.num_entries):
+            for field_idx, field in enumerate(FIELDS):
+                x, y, w, h = (int(v) for v in boxes[row, field_idx])
+                cv2.rectangle(debug_image, (x, y), (x + w, y + h), colors[field], 2)
+                if row == 0:
+                    cv2.putText(debug_image, labels[field], (x, y - 5),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, colors[field], 2)
         
         # Sauvegarder l'image de debug
         output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'debug')
@@ -383,128 +405,81 @@ class DreamlandRank(RankBase):
         
         return debug_image
 
-    def extract_data(self):
+    def read_players(self, workers=None):
+        """
+        Reconnaît les joueurs des captures, sans les enregistrer.
+        
+        Args:
+            workers (int): Nombre de processus OCR (par défaut : ocr.workers de config.yaml)
+        
+        Returns:
+            list: Joueurs triés par rang [{'rank': int, 'name': str, 'guild': str, 'score': int}, ...]
+                  ou None en cas d'échec
+        """
+        if not hasattr(self, 'captures') or not self.captures:
+            logger.error("Aucune capture à analyser")
+            return None
+        
+        # Charger la configuration des zones
+        layout = self._zone_layout()
+        if not layout:
+            return None
+        
+        # Reconnaissance par lots de toutes les zones de toutes les captures
+        workers = workers or get_setting('ocr.workers', 1)
+        if self.stream:
+            # Les captures ont déjà été reconnues pendant le défilement
+            all_players = self.stream.finish()
+            self.stream = None
+        elif workers > 1:
+            with ParallelExtractor(layout, workers=workers, aligner=self._aligner(layout),
+                                   use_cache=get_setting('ocr.cache', True)) as extractor:
+                all_players = extractor.extract(self.captures)
+        else:
+            extractor = ZoneExtractor(self._ocr_engine(), layout,
+                                      aligner=self._aligner(layout), debug=self._debug_sink())
+            all_players = extractor.extract(self.captures)
+        self._close_debug_sink()
+        
+        # Conserver les régions reconnues pour les prochaines sessions
+        if get_setting('ocr.cache', True):
+            get_recognition_cache().save()
+        
+        # Convertir le dictionnaire en liste triée par rang
+        players = [all_players[rank] for rank in sorted(all_players.keys())]
+        logger.info(f"Nombre total de joueurs extraits : {len(players)}")
+        return players
+
+    def extract_data(self, workers=None):
         """
         Extrait les données du classement en utilisant OCR par zones.
         
+        Args:
+            workers (int): Nombre de processus OCR (par défaut : ocr.workers de config.yaml)
+        
         Returns:
             list: Liste de dictionnaires contenant les données de chaque joueur
-                 [{'rank': int, 'name': str, 'guild': str, 'score': str}, ...]
+                 [{'rank': int, 'name': str, 'guild': str, 'score': int}, ...]
         """
         try:
-            if not hasattr(self, 'captures') or not self.captures:
-                logger.error("Aucune capture à analyser")
-                return None
-            
-            # Charger la configuration des zones
-            config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'resources', 'config', 'ocr_zones.json')
-            if not os.path.exists(config_path):
-                logger.error("Configuration des zones OCR non trouvée")
-                return None
-            
-            with open(config_path, 'r') as f:
-                zones_config = json.load(f)
-            
-            # Dictionnaire pour stocker tous les joueurs (clé = rank pour éviter les doublons)
-            all_players = {}
-            
             # La date du classement est celle d'aujourd'hui
             current_date = datetime.now().strftime("%Y-%m-%d")
             date_j1 = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")  # J-1 est hier
             logger.info(f"Date du classement : {current_date} (J-1 : {date_j1})")
             
             # Vérifier si la date existe déjà dans ranking_dates
-            cursor = self.db.conn.cursor()
-            cursor.execute("""
-                SELECT id FROM ranking_dates 
-                WHERE date = ? AND type = ?
-            """, (current_date, 'dreamland'))
-            existing_date = cursor.fetchone()
+            with self.db.connections.reader() as conn:
+                existing_date = conn.execute("""
+                    SELECT id FROM ranking_dates
+                    WHERE date = ? AND type = ?
+                """, (current_date, 'dreamland')).fetchone()
             
             if not existing_date:
                 logger.info(f"Création d'une nouvelle entrée pour la date {current_date}")
             else:
                 logger.info(f"Mise à jour du classement pour la date {current_date}")
             
-            # Traiter chaque capture
-            for idx, image in enumerate(self.captures):
-                self.current_image = image
-                height, width = image.shape[:2]
-                
-                # Extraire les données des joueurs
-                num_entries = len(zones_config['rank'])
-                logger.debug(f"Traitement de la capture {idx+1}, recherche de {num_entries} entrées")
-                
-                for i in range(num_entries):
-                    try:
-                        # Extraire le rang
-                        rank_zone = zones_config['rank'][i]
-                        rank_x = int(rank_zone['x_percent'] * width)
-                        rank_y = int(rank_zone['y_percent'] * height)
-                        rank_w = int(rank_zone['width_percent'] * width)
-                        rank_h = int(rank_zone['height_percent'] * height)
-                        rank_text = self._extract_region(image, (rank_x, rank_y, rank_w, rank_h), is_rank=True)
-                        
-                        if not rank_text:
-                            continue
-                            
-                        # Extraire le nom
-                        name_zone = zones_config['name'][i]
-                        name_x = int(name_zone['x_percent'] * width)
-                        name_y = int(name_zone['y_percent'] * height)
-                        name_w = int(name_zone['width_percent'] * width)
-                        name_h = int(name_zone['height_percent'] * height)
-                        name_text = self._extract_region(image, (name_x, name_y, name_w, name_h))
-                        
-                        # Extraire la guilde
-                        guild_zone = zones_config['guild'][i]
-                        guild_x = int(guild_zone['x_percent'] * width)
-                        guild_y = int(guild_zone['y_percent'] * height)
-                        guild_w = int(guild_zone['width_percent'] * width)
-                        guild_h = int(guild_zone['height_percent'] * height)
-                        guild_text = self._extract_region(image, (guild_x, guild_y, guild_w, guild_h))
-                        
-                        # Extraire le score
-                        score_zone = zones_config['score'][i]
-                        score_x = int(score_zone['x_percent'] * width)
-                        score_y = int(score_zone['y_percent'] * height)
-                        score_w = int(score_zone['width_percent'] * width)
-                        score_h = int(score_zone['height_percent'] * height)
-                        score_text = self._extract_region(image, (score_x, score_y, score_w, score_h), is_score=True)
-                        
-                        # Vérifier si l'entrée est valide
-                        if rank_text and name_text:
-                            try:
-                                rank_digits = ''.join(filter(str.isdigit, rank_text))
-                                if not rank_digits:
-                                    continue
-                                    
-                                rank = int(rank_digits)
-                                player = {
-                                    'rank': rank,
-                                    'name': name_text.strip(),
-                                    'guild': guild_text.strip(),
-                                    'score': ''.join(filter(str.isdigit, score_text)) or "0"
-                                }
-                                
-                                # Ajouter ou mettre à jour le joueur
-                                if rank not in all_players:
-                                    all_players[rank] = player
-                                    logger.debug(f"Nouveau joueur extrait : {player}")
-                                else:
-                                    logger.debug(f"Joueur déjà extrait au rang {rank}, ignoré")
-                                
-                            except ValueError as ve:
-                                logger.warning(f"Impossible de convertir le rang '{rank_text}' : {ve}")
-                                continue
-                    
-                    except Exception as e:
-                        logger.warning(f"Erreur lors de l'extraction de l'entrée {i+1} de la capture {idx+1}: {e}")
-                        continue
-            
-            # Convertir le dictionnaire en liste triée par rang
-            players = [all_players[rank] for rank in sorted(all_players.keys())]
-            logger.info(f"Nombre total de joueurs extraits : {len(players)}")
+            players = self.read_players(workers)
             
             # Sauvegarder les données dans la base de données
             if players:
@@ -519,4 +494,4 @@ class DreamlandRank(RankBase):
                 
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction des données : {e}")
-            return None 
\ No newline at end of file
+            return None 
@@ -0,0 +1,226 @@
+"""
+Extraction des joueurs à partir des captures du classement.
+"""
+
+import time
+from dataclasses import dataclass
+import cv2
+from loguru import logger
+
+from storage.scores import parse_score
+
+from .ocr import DIGITS_ALLOWLIST
+from .zones import FIELDS, FIELD_INDEX
+
+
+@dataclass
+class ThroughputReport:
+    """Débit d'une extraction."""
+    frames: int
+    rois: int
+    seconds: float
+    workers: int = 1
+
+    @property
+    def frames_per_second(self):
+        return self.frames / self.seconds if self.seconds else 0.0
+
+    @property
+    def rois_per_second(self):
+        return self.rois / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.frames} captures, {self.rois} régions en {self.seconds:.2f} s "
+                f"avec {self.workers} worker(s) : {self.frames_per_second:.2f} captures/s, "
+                f"{self.rois_per_second:.1f} régions/s")
+
+
+class ZoneExtractor:
+    """Extrait les joueurs d'une série de captures à partir des zones OCR."""
+
+    # Prétraitement des régions : agrandissement, contraste et seuil de binarisation
+    SCALE = 2.5
+    CONTRAST = 1.5
+    THRESHOLD = 240
+
+    def __init__(self, ocr, layout, aligner=None, debug=None):
+        """
+        Initialise l'extracteur.
+
+        Args:
+            ocr (BatchOCR): Moteur de reconnaissance par lots
+            layout (ZoneLayout): Disposition des zones OCR
+            aligner (FrameAligner): Alignement des captures pour ignorer les
+                                    lignes déjà lues (optionnel)
+            debug (DebugSink): Destination des images de debug (optionnel)
+        """
+        self.ocr = ocr
+        self.layout = layout
+        self.num_entries = layout.num_entries
+        self.aligner = aligner
+        self.debug = debug
+        self.workers = 1
+        self.last_report = None
+        self._rois = 0
+        self._frames = {}
+
+    def binarize(self, image):
+        """
+        Binarise en une seule passe la partie de la capture couverte par les zones.
+
+        Args:
+            image: Capture source (BGR)
+
+        Returns:
+            tuple: (image binaire de la zone englobante, origine (x0, y0))
+        """
+        height, width = image.shape[:2]
+        x0, y0, x1, y1 = self.layout.area(width, height)
+
+        # Niveaux de gris, contraste (1.5) et seuil (240) sur toute la zone de liste
+        gray = cv2.cvtColor(image[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+        gray = cv2.convertScaleAbs(gray, alpha=self.CONTRAST, beta=0)
+        _, binary = cv2.threshold(gray, self.THRESHOLD, 255, cv2.THRESH_BINARY)
+        return binary, (x0, y0)
+
+    def _binarized(self, captures, capture_idx):
+        """Capture binarisée, calculée une fois par passage de reconnaissance."""
+        if capture_idx not in self._frames:
+            self._frames[capture_idx] = self.binarize(captures[capture_idx])
+        return self._frames[capture_idx]
+
+    def _region(self, captures, capture_idx, row, field):
+        """
+        Prépare une région à reconnaître.
+
+        Returns:
+            tuple: (clé, image binaire, allowlist) ou None en cas d'erreur
+        """
+        try:
+            image = captures[capture_idx]
+            height, width = image.shape[:2]
+            x, y, w, h = self.layout.boxes(width, height)[row, FIELD_INDEX[field]]
+            frame, (x0, y0) = self._binarized(captures, capture_idx)
+
+            # Agrandissement de la région déjà binarisée, puis retour au binaire
+            roi = frame[y - y0:y - y0 + h, x - x0:x - x0 + w]
+            roi = cv2.resize(roi, (int(w * self.SCALE), int(h * self.SCALE)), interpolation=cv2.INTER_CUBIC)
+            _, binary = cv2.threshold(roi, 127, 255, cv2.THRESH_BINARY)
+
+            if self.debug is not None:
+                self.debug.submit(capture_idx, row, field, image[y:y+h, x:x+w].copy(), binary)
+            allowlist = DIGITS_ALLOWLIST if field in ('rank', 'score') else None
+            return ((capture_idx, row, field), binary, allowlist)
+        except Exception as e:
+            logger.warning(f"Erreur lors de la préparation de l'entrée {row+1} de la capture {capture_idx+1}: {e}")
+            return None
+
+    def _recognize(self, captures, keys):
+        """
+        Reconnaît un ensemble de régions en un seul passage par lots.
+
+        Args:
+            captures (list): Captures sources
+            keys (list): Tuples (index de capture, ligne, champ)
+
+        Returns:
+            dict: Texte reconnu pour chaque clé
+        """
+        try:
+            regions = [r for r in (self._region(captures, *key) for key in keys) if r]
+        finally:
+            self._frames.clear()
+        self._rois += len(regions)
+        return self.ocr.recognize(regions)
+
+    def rows_to_read(self, image):
+        """
+        Retourne les emplacements d'une capture à transmettre à l'OCR.
+
+        Sans alignement, tous les emplacements sont lus. Les captures doivent
+        être fournies dans l'ordre de défilement.
+        """
+        if self.aligner is None:
+            return list(range(self.num_entries))
+        return self.aligner.new_rows(image)
+
+    def _player(self, rank, texts, capture_idx, row):
+        """
+        Construit un joueur à partir des textes reconnus d'une ligne.
+
+        Returns:
+            dict: Joueur ou None si le nom n'a pas pu être lu
+        """
+        name_text = texts.get((capture_idx, row, 'name'), '')
+        if not name_text:
+            return None
+
+        player = {
+            'rank': rank,
+            'name': name_text.strip(),
+            'guild': texts.get((capture_idx, row, 'guild'), '').strip(),
+            'score': parse_score(texts.get((capture_idx, row, 'score'), ''))
+        }
+        logger.debug(f"Nouveau joueur extrait : {player}")
+        return player
+
+    def extract(self, captures):
+        """
+        Extrait les joueurs de toutes les captures.
+
+        Les rangs de toutes les captures sont lus en un premier lot. Les autres
+        champs ne sont lus que pour la première occurrence de chaque rang ;
+        les occurrences suivantes ne servent que si le nom n'a pas pu être lu.
+
+        Args:
+            captures (list): Captures du classement dans l'ordre de défilement
+
+        Returns:
+            dict: Joueurs indexés par rang
+                 {rank: {'rank': int, 'name': str, 'guild': str, 'score': int}}
+        """
+        start = time.perf_counter()
+        self._rois = 0
+
+        # Premier passage : les rangs de toutes les lignes nouvelles
+        if self.aligner is not None:
+            self.aligner.reset()
+        rows = [(idx, row) for idx in range(len(captures)) for row in self.rows_to_read(captures[idx])]
+        rank_texts = self._recognize(captures, [(idx, row, 'rank') for idx, row in rows])
+
+        # Occurrences de chaque rang, dans l'ordre des captures
+        occurrences = {}
+        for idx, row in rows:
+            rank_digits = ''.join(filter(str.isdigit, rank_texts.get((idx, row, 'rank'), '')))
+            if rank_digits:
+                occurrences.setdefault(int(rank_digits), []).append((idx, row))
+
+        # Passages suivants : les autres champs des occurrences non encore résolues
+        all_players = {}
+        attempt = 0
+        pending = sorted(occurrences)
+        while pending:
+            batch = {rank: occurrences[rank][attempt] for rank in pending
+                     if attempt < len(occurrences[rank])}
+            if not batch:
+                break
+
+            keys = [(idx, row, field) for idx, row in batch.values() for field in FIELDS[1:]]
+            texts = self._recognize(captures, keys)
+
+            for rank, (idx, row) in batch.items():
+                player = self._player(rank, texts, idx, row)
+                if player:
+                    all_players[rank] = player
+
+            pending = [rank for rank in batch if rank not in all_players]
+            attempt += 1
+
+        self.last_report = ThroughputReport(
+            frames=len(captures),
+            rois=self._rois,
+            seconds=time.perf_counter() - start,
+            workers=self.workers
+        )
+        logger.info(f"Extraction : {self.last_report}")
+        return all_players
@@ -5,7 +5,10 @@ Point d'entrée principal pour la récupération des classements.
 import os
 from loguru import logger
 import time
+import threading
 from .dreamland import DreamlandRank
+from .ocr import ocr_registry
+from .settings import get_setting
 from mapper.config_writer import load_mapping
 
 def clear_screen():
@@ -89,6 +92,11 @@ def capture_dreamland():
         logger.info("Initialisation de la capture du Royaume Onirique...")
         manager = DreamlandRank()
         
+        # Charger le modèle OCR en arrière-plan pendant la navigation et la capture
+        # (en mode multi-processus, chaque worker charge son propre modèle)
+        if get_setting('ocr.streaming', True) or get_setting('ocr.workers', 1) <= 1:
+            threading.Thread(target=ocr_registry.warmup, daemon=True).start()
+        
         input("\nAppuyez sur Entrée quand le jeu est prêt...")
         
         # Navigation vers le classement
@@ -97,24 +105,30 @@ def capture_dreamland():
             logger.error("Échec de la navigation")
             return False
         
-        # Capture des données
+        # Capture des données, reconnues au fil du défilement
         logger.info("Capture des données...")
-        if not manager.scroll_and_capture(num_scrolls=24):
-            logger.error("Échec de la capture")
+        if get_setting('ocr.streaming', True) and not manager.start_streaming():
             return False
+        try:
+            if not manager.scroll_and_capture(num_scrolls=24):
+                logger.error("Échec de la capture")
+                return False
+                
+            # Retour au menu principal
+            logger.info("Retour au menu principal...")
+            for i in range(3):
+                manager.click_position("Retour", delay=1.0)
+                time.sleep(1.0)
             
-        # Retour au menu principal
-        logger.info("Retour au menu principal...")
-        for i in range(3):
-            manager.click_position("Retour", delay=1.0)
-            time.sleep(1.0)
-        
-        # Extraction et stockage des données
-        logger.info("Extraction et stockage des données...")
-        players = manager.extract_data()
-        if not players:
-            logger.error("Échec de l'extraction des données")
-            return False
+            # Extraction et stockage des données
+            logger.info("Extraction et stockage des données...")
+            players = manager.extract_data()
+            if not players:
+                logger.error("Échec de l'extraction des données")
+                return False
+        finally:
+            # Flux non terminé par l'extraction (échec) : arrêter son thread
+            manager.stop_streaming()
         
         logger.info(f"Données extraites avec succès : {len(players)} joueurs")
         return True
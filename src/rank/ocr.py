@@ -0,0 +1,240 @@
+"""
+Moteur OCR par lots pour la reconnaissance des zones de classement.
+"""
+
+import threading
+import time
+import numpy as np
+from loguru import logger
+
+# Caractères autorisés pour les rangs et les scores
+DIGITS_ALLOWLIST = '0123456789M'
+
+# Langues utilisées par défaut pour la reconnaissance
+DEFAULT_LANGUAGES = ('en',)
+
+
+def _load_easyocr_reader(languages, **options):
+    """
+    Construit un lecteur EasyOCR.
+
+    L'import d'easyocr (et donc de torch) n'a lieu qu'ici, au premier usage.
+    """
+    import easyocr
+    return easyocr.Reader(list(languages), **options)
+
+
+class OCRRegistry:
+    """
+    Registre des lecteurs OCR partagé par tout le processus.
+
+    Chaque jeu de langues n'est chargé qu'une seule fois, paresseusement, au
+    premier usage. L'allowlist n'est pas un modèle distinct pour EasyOCR : elle
+    est appliquée au décodage, lors de chaque appel de reconnaissance, et tous
+    les jeux de caractères partagent donc le même lecteur.
+    """
+
+    def __init__(self, factory=_load_easyocr_reader):
+        """
+        Initialise le registre.
+
+        Args:
+            factory: Fonction (languages, **options) -> lecteur
+        """
+        self._factory = factory
+        self._readers = {}
+        self._lock = threading.Lock()
+        self.load_times = {}
+
+    @staticmethod
+    def _key(languages, options):
+        """Clé de registre normalisée."""
+        return (tuple(languages), tuple(sorted(options.items())))
+
+    def is_loaded(self, languages=DEFAULT_LANGUAGES, **options):
+        """Indique si le lecteur est déjà chargé."""
+        return self._key(languages, options) in self._readers
+
+    def get_reader(self, languages=DEFAULT_LANGUAGES, **options):
+        """
+        Retourne le lecteur des langues demandées, en le chargeant si besoin.
+
+        Args:
+            languages (tuple): Langues du modèle
+            **options: Options transmises à `easyocr.Reader`
+
+        Returns:
+            Lecteur OCR partagé
+        """
+        key = self._key(languages, options)
+        reader = self._readers.get(key)
+        if reader is not None:
+            return reader
+
+        with self._lock:
+            # Un autre thread a pu charger le modèle pendant l'attente du verrou
+            if key not in self._readers:
+                logger.info(f"Chargement du modèle OCR {list(languages)}...")
+                start = time.perf_counter()
+                self._readers[key] = self._factory(languages, **options)
+                self.load_times[key] = time.perf_counter() - start
+                logger.info(f"Modèle OCR {list(languages)} chargé en {self.load_times[key]:.2f} s")
+            return self._readers[key]
+
+    def get_engine(self, languages=DEFAULT_LANGUAGES, **engine_options):
+        """
+        Retourne un moteur de reconnaissance par lots sur le lecteur partagé.
+
+        Args:
+            languages (tuple): Langues du modèle
+            **engine_options: Options de `BatchOCR`
+
+        Returns:
+            BatchOCR: Moteur prêt à l'emploi
+        """
+        return BatchOCR(self.get_reader(languages), **engine_options)
+
+    def warmup(self, languages=DEFAULT_LANGUAGES, **options):
+        """
+        Charge explicitement un lecteur.
+
+        Returns:
+            float: Durée du chargement en secondes (0 si déjà chargé)
+        """
+        key = self._key(languages, options)
+        already_loaded = key in self._readers
+        self.get_reader(languages, **options)
+        return 0.0 if already_loaded else self.load_times[key]
+
+    def clear(self):
+        """Libère tous les lecteurs chargés."""
+        with self._lock:
+            self._readers.clear()
+            self.load_times.clear()
+
+
+class BatchOCR:
+    """
+    Reconnaissance par lots de régions déjà découpées.
+
+    Les zones de `ocr_zones.json` donnent des boîtes exactes : la détection de
+    texte d'EasyOCR est donc inutile. Les régions sont empilées sur des
+    planches verticales et seul le réseau de reconnaissance est exécuté, par
+    lots, via `Reader.recognize`.
+    """
+
+    def __init__(self, reader, batch_size=64, regions_per_sheet=128, padding=8, cache=None):
+        """
+        Initialise le moteur.
+
+        Args:
+            reader: Instance d'`easyocr.Reader` (ou objet compatible)
+            batch_size (int): Taille des lots envoyés au réseau de reconnaissance
+            regions_per_sheet (int): Nombre maximum de régions par planche
+            padding (int): Marge verticale en pixels entre deux régions
+            cache (RecognitionCache): Cache des régions déjà reconnues (optionnel)
+        """
+        self.reader = reader
+        self.batch_size = batch_size
+        self.regions_per_sheet = regions_per_sheet
+        self.padding = padding
+        self.cache = cache
+
+    def recognize(self, regions):
+        """
+        Reconnaît le texte d'un ensemble de régions.
+
+        Args:
+            regions (list): Tuples (clé, image binaire 2D, allowlist ou None)
+
+        Returns:
+            dict: Texte reconnu pour chaque clé ('' si rien n'a été lu)
+        """
+        results = {key: '' for key, _, _ in regions}
+
+        # Regrouper les régions inconnues du cache par jeu de caractères autorisés
+        groups = {}
+        for key, image, allowlist in regions:
+            if image is None or image.size == 0:
+                continue
+            if self.cache is not None:
+                text = self.cache.get(image, allowlist)
+                if text is not None:
+                    results[key] = text
+                    continue
+            groups.setdefault(allowlist, []).append((key, image))
+
+        for allowlist, items in groups.items():
+            for start in range(0, len(items), self.regions_per_sheet):
+                chunk = items[start:start + self.regions_per_sheet]
+                texts = self._recognize_sheet(chunk, allowlist)
+                results.update(texts)
+                if self.cache is not None:
+                    for key, image in chunk:
+                        self.cache.put(image, allowlist, texts.get(key, ''))
+
+        logger.debug(f"{len(regions)} régions, {sum(len(items) for items in groups.values())} "
+                     f"reconnues en {len(groups)} groupe(s)")
+        return results
+
+    def _build_sheet(self, items):
+        """
+        Empile les régions sur une planche unique.
+
+        Args:
+            items (list): Tuples (clé, image binaire 2D)
+
+        Returns:
+            tuple: (planche, boîtes [x_min, x_max, y_min, y_max], clé par ordonnée)
+        """
+        width = max(image.shape[1] for _, image in items)
+        height = sum(image.shape[0] + self.padding for _, image in items) + self.padding
+        sheet = np.zeros((height, width), dtype=np.uint8)
+
+        boxes = []
+        keys_by_top = {}
+        y = self.padding
+        for key, image in items:
+            h, w = image.shape[:2]
+            sheet[y:y + h, :w] = image
+            boxes.append([0, w, y, y + h])
+            keys_by_top[y] = key
+            y += h + self.padding
+
+        return sheet, boxes, keys_by_top
+
+    def _recognize_sheet(self, items, allowlist):
+        """
+        Lance la reconnaissance sur une planche de régions.
+
+        Args:
+            items (list): Tuples (clé, image binaire 2D)
+            allowlist (str): Caractères autorisés ou None
+
+        Returns:
+            dict: Texte reconnu pour chaque clé
+        """
+        sheet, boxes, keys_by_top = self._build_sheet(items)
+
+        detections = self.reader.recognize(
+            sheet,
+            horizontal_list=boxes,
+            free_list=[],
+            allowlist=allowlist,
+            batch_size=self.batch_size,
+            detail=1,
+            paragraph=False
+        )
+
+        # EasyOCR trie les résultats par position : on retrouve la région via son ordonnée
+        texts = {}
+        for box, text, _confidence in detections:
+            key = keys_by_top.get(int(box[0][1]))
+            if key is not None and text and key not in texts:
+                texts[key] = text
+
+        return texts
+
+
+# Registre partagé par le processus
+ocr_registry = OCRRegistry()
@@ -0,0 +1,203 @@
+"""
+Cache de reconnaissance OCR adressé par le contenu des régions.
+
+Les mêmes rangs, noms et guildes réapparaissent d'une capture à l'autre et
+d'un jour à l'autre. Chaque région binarisée est réduite à une empreinte
+perceptuelle ; une région dont l'empreinte est identique ou très proche d'une
+région déjà reconnue reprend son texte sans passer par le réseau.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+import cv2
+import numpy as np
+from loguru import logger
+
+# Emplacement par défaut du cache persistant
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'resources', 'data', 'cache', 'ocr_cache.json')
+
+CACHE_VERSION = 1
+
+
+class RecognitionCache:
+    """
+    Cache LRU des textes reconnus, indexé par empreinte perceptuelle.
+
+    La tolérance aux pixels parasites repose sur une distance de Hamming entre
+    empreintes. Les empreintes sont découpées en blocs indexés séparément :
+    tant que la distance tolérée est inférieure au nombre de blocs, deux
+    empreintes proches partagent au moins un bloc identique, ce qui évite de
+    parcourir tout le cache.
+    """
+
+    def __init__(self, path=None, max_entries=20000, max_distance=8, hash_size=(64, 16), chunks=16):
+        """
+        Args:
+            path (str): Fichier de persistance (None pour un cache en mémoire)
+            max_entries (int): Nombre maximum d'entrées avant éviction
+            max_distance (int): Nombre de bits différents tolérés
+            hash_size (tuple): Résolution (largeur, hauteur) de l'empreinte
+            chunks (int): Nombre de blocs indexés (doit dépasser max_distance)
+        """
+        if max_distance >= chunks:
+            raise ValueError("max_distance doit être inférieur au nombre de blocs")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.hash_size = tuple(hash_size)
+        self.chunks = chunks
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """Compteurs du cache."""
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate
+        }
+
+    def fingerprint(self, binary, allowlist=None):
+        """
+        Calcule l'empreinte d'une région binarisée.
+
+        Returns:
+            tuple: (préfixe, empreinte en bytes) où le préfixe distingue le jeu
+                   de caractères et le rapport largeur/hauteur de la région
+        """
+        h, w = binary.shape[:2]
+        small = cv2.resize(binary, self.hash_size, interpolation=cv2.INTER_AREA)
+        bits = np.packbits(small > 127).tobytes()
+        prefix = (allowlist or '', round(2 * w / max(h, 1)))
+        return prefix, bits
+
+    def _chunks(self, bits):
+        """Découpe une empreinte en blocs indexés."""
+        size = -(-len(bits) // self.chunks)
+        return [(i, bits[i * size:(i + 1) * size]) for i in range(self.chunks)]
+
+    @staticmethod
+    def _distance(a, b):
+        """Distance de Hamming entre deux empreintes."""
+        return bin(int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).count('1')
+
+    def _lookup(self, prefix, bits):
+        """Retourne la clé la plus proche, ou None."""
+        key = (prefix, bits)
+        if key in self._entries or self.max_distance == 0:
+            return key if key in self._entries else None
+
+        candidates = set()
+        for chunk in self._chunks(bits):
+            candidates |= self._index.get((prefix,) + chunk, set())
+
+        best, best_distance = None, self.max_distance + 1
+        for candidate in candidates:
+            distance = self._distance(bits, candidate)
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+        return (prefix, best) if best is not None else None
+
+    def get(self, binary, allowlist=None):
+        """
+        Cherche le texte d'une région.
+
+        Returns:
+            str: Texte mémorisé ou None si la région est inconnue
+        """
+        prefix, bits = self.fingerprint(binary, allowlist)
+        with self._lock:
+            key = self._lookup(prefix, bits)
+            if key is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, binary, allowlist, text):
+        """Mémorise le texte reconnu d'une région."""
+        prefix, bits = self.fingerprint(binary, allowlist)
+        with self._lock:
+            self._store(prefix, bits, text)
+
+    def _store(self, prefix, bits, text):
+        """Ajoute une entrée et évince les plus anciennes si nécessaire."""
+        key = (prefix, bits)
+        if key not in self._entries:
+            for chunk in self._chunks(bits):
+                self._index.setdefault((prefix,) + chunk, set()).add(bits)
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            (old_prefix, old_bits), _ = self._entries.popitem(last=False)
+            for chunk in self._chunks(old_bits):
+                bucket = self._index.get((old_prefix,) + chunk)
+                if bucket is not None:
+                    bucket.discard(old_bits)
+                    if not bucket:
+                        del self._index[(old_prefix,) + chunk]
+
+    def load(self):
+        """Charge les entrées persistées (du plus ancien au plus récent)."""
+        if not self.path or not os.path.exists(self.path):
+            return self
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_VERSION or tuple(data.get('hash_size', ())) != self.hash_size:
+                logger.warning("Cache OCR incompatible, il sera reconstruit")
+                return self
+
+            with self._lock:
+                for allowlist, bucket, bits, text in data['entries']:
+                    self._store((allowlist, bucket), bytes.fromhex(bits), text)
+            logger.info(f"Cache OCR chargé : {len(self)} entrées")
+        except Exception as e:
+            logger.error(f"Erreur lors du chargement du cache OCR : {e}")
+        return self
+
+    def save(self):
+        """Écrit le cache sur disque."""
+        if not self.path:
+            return
+
+        with self._lock:
+            entries = [[prefix[0], prefix[1], bits.hex(), text]
+                       for (prefix, bits), text in self._entries.items()]
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'hash_size': list(self.hash_size), 'entries': entries},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        logger.info(f"Cache OCR sauvegardé : {len(entries)} entrées ({self.hits} succès, {self.misses} échecs)")
+
+
+_default_cache = None
+
+
+def get_recognition_cache():
+    """Retourne le cache persistant partagé par le processus."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RecognitionCache(CACHE_PATH).load()
+    return _default_cache
@@ -0,0 +1,116 @@
+"""
+Extraction multi-processus des captures du classement.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from loguru import logger
+
+from .extraction import ZoneExtractor
+from .ocr import ocr_registry, DEFAULT_LANGUAGES
+from .ocr_cache import get_recognition_cache
+
+# Extracteur propre à chaque processus worker (modèle OCR résident)
+_worker_extractor = None
+
+
+def _init_worker(layout, languages, use_cache):
+    """
+    Charge le modèle OCR une fois pour toute la durée de vie du worker.
+
+    Le cache de reconnaissance persistant est chargé par chaque worker ; les
+    entrées qu'un worker y ajoute ne servent qu'à ce worker et ne sont pas
+    réécrites sur disque.
+    """
+    global _worker_extractor
+    cache = get_recognition_cache() if use_cache else None
+    _worker_extractor = ZoneExtractor(ocr_registry.get_engine(languages, cache=cache), layout)
+    logger.debug(f"Worker OCR {os.getpid()} prêt")
+
+
+def _recognize_capture(capture_idx, image, keys):
+    """
+    Reconnaît les régions d'une capture dans un worker.
+
+    Args:
+        capture_idx (int): Index de la capture
+        image: Capture source
+        keys (list): Tuples (index de capture, ligne, champ) de cette capture
+
+    Returns:
+        tuple: (texte reconnu par clé, nombre de régions traitées)
+    """
+    _worker_extractor._rois = 0
+    texts = _worker_extractor._recognize({capture_idx: image}, keys)
+    return texts, _worker_extractor._rois
+
+
+class ParallelExtractor(ZoneExtractor):
+    """
+    Extracteur répartissant les captures sur un pool de processus.
+
+    Chaque passage de `ZoneExtractor.extract` est découpé par capture et
+    distribué aux workers ; les résultats sont fusionnés par clé, de sorte que
+    l'assemblage des joueurs reste identique à l'extraction séquentielle.
+    """
+
+    def __init__(self, layout, workers=None, languages=DEFAULT_LANGUAGES, aligner=None, use_cache=False):
+        """
+        Initialise l'extracteur.
+
+        Args:
+            layout (ZoneLayout): Disposition des zones OCR
+            workers (int): Nombre de processus (par défaut : nombre de cœurs)
+            languages (tuple): Langues du modèle OCR
+            aligner (FrameAligner): Alignement des captures (optionnel, exécuté
+                                    dans le processus principal)
+            use_cache (bool): Utiliser le cache de reconnaissance dans les workers
+        """
+        super().__init__(None, layout, aligner)
+        self.workers = workers or os.cpu_count() or 1
+        self.languages = languages
+        self.use_cache = use_cache
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_pool(self):
+        """Démarre le pool de workers au premier usage."""
+        if self._pool is None:
+            logger.info(f"Démarrage de {self.workers} worker(s) OCR")
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.layout, self.languages, self.use_cache)
+            )
+        return self._pool
+
+    def _recognize(self, captures, keys):
+        """Répartit les régions par capture sur les workers."""
+        by_capture = {}
+        for key in keys:
+            by_capture.setdefault(key[0], []).append(key)
+
+        pool = self._get_pool()
+        futures = [
+            pool.submit(_recognize_capture, capture_idx, captures[capture_idx], capture_keys)
+            for capture_idx, capture_keys in sorted(by_capture.items())
+        ]
+
+        # Fusion dans l'ordre des captures pour un résultat déterministe
+        texts = {}
+        for future in futures:
+            capture_texts, rois = future.result()
+            texts.update(capture_texts)
+            self._rois += rois
+        return texts
+
+    def close(self):
+        """Arrête les workers."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
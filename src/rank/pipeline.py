@@ -0,0 +1,181 @@
+"""
+Pipeline de capture en flux : l'OCR démarre dès qu'une capture est disponible.
+"""
+
+import glob
+import os
+import queue
+import threading
+import time
+import cv2
+from loguru import logger
+
+from .extraction import FIELDS, ThroughputReport
+
+# Marqueur de fin de flux
+_END = object()
+
+
+class FileFrameSource:
+    """
+    Source de captures lues depuis des fichiers PNG.
+
+    Remplace la capture d'écran du jeu pour rejouer une session enregistrée
+    hors ligne (tests, mise au point des zones).
+    """
+
+    def __init__(self, paths):
+        """
+        Args:
+            paths (list): Chemins des captures, dans l'ordre de défilement
+        """
+        self.paths = list(paths)
+        self._index = 0
+
+    @classmethod
+    def from_directory(cls, directory, pattern='*.png'):
+        """Crée une source à partir des fichiers d'un dossier, triés par nom."""
+        return cls(sorted(glob.glob(os.path.join(directory, pattern))))
+
+    def __len__(self):
+        return len(self.paths)
+
+    def capture(self):
+        """
+        Lit la capture suivante.
+
+        Returns:
+            numpy.ndarray: Image BGR ou None quand la source est épuisée
+        """
+        if self._index >= len(self.paths):
+            return None
+        image = cv2.imread(self.paths[self._index])
+        self._index += 1
+        return image
+
+
+class StreamingExtractor:
+    """
+    Extraction OCR en arrière-plan, alimentée capture par capture.
+
+    Chaque capture soumise est traitée par un thread dédié pendant que le
+    thread principal continue de faire défiler le classement : la durée totale
+    tend vers la plus longue des deux phases au lieu de leur somme. Pour chaque
+    capture, les rangs sont lus d'abord, puis les autres champs des seuls rangs
+    encore inconnus.
+    """
+
+    def __init__(self, extractor, max_pending=8):
+        """
+        Args:
+            extractor (ZoneExtractor): Extracteur utilisé pour chaque capture
+            max_pending (int): Nombre maximum de captures en attente d'OCR
+        """
+        self.extractor = extractor
+        self.players = {}
+        self.last_report = None
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._error = None
+        self._aborted = False
+        self._frames = 0
+        self._busy = 0.0
+        self._start = None
+
+    def start(self):
+        """Démarre le thread d'OCR."""
+        self._start = time.perf_counter()
+        self.extractor._rois = 0
+        if self.extractor.aligner is not None:
+            self.extractor.aligner.reset()
+        self._thread = threading.Thread(target=self._run, name="ocr-stream", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, image):
+        """
+        Soumet une capture à l'OCR (bloque si trop de captures sont en attente).
+
+        Args:
+            image: Capture BGR
+        """
+        if self._thread is None:
+            raise RuntimeError("Le flux OCR n'est pas démarré")
+        self._queue.put((self._frames, image))
+        self._frames += 1
+
+    def finish(self):
+        """
+        Attend la fin du traitement des captures soumises.
+
+        Returns:
+            dict: Joueurs indexés par rang
+        """
+        if self._thread is None:
+            raise RuntimeError("Le flux OCR n'est pas démarré")
+        self._queue.put(_END)
+        self._thread.join()
+        self._thread = None
+
+        if self._error is not None:
+            raise self._error
+
+        self.last_report = ThroughputReport(
+            frames=self._frames,
+            rois=self.extractor._rois,
+            seconds=time.perf_counter() - self._start,
+            workers=1
+        )
+        logger.info(f"Extraction en flux : {self.last_report} (OCR actif {self._busy:.2f} s)")
+        return self.players
+
+    def abort(self):
+        """Arrête le flux sans traiter les captures en attente (capture interrompue)."""
+        if self._thread is None:
+            return
+        self._aborted = True
+        self._queue.put(_END)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        """Boucle du thread d'OCR."""
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                break
+            if self._error is not None or self._aborted:
+                # Vider la file pour ne pas bloquer le producteur
+                continue
+            try:
+                start = time.perf_counter()
+                self._process(*item)
+                self._busy += time.perf_counter() - start
+            except Exception as e:
+                logger.error(f"Erreur lors de l'OCR en flux : {e}")
+                self._error = e
+
+    def _process(self, capture_idx, image):
+        """Extrait les nouveaux joueurs d'une capture."""
+        captures = {capture_idx: image}
+        rows = self.extractor.rows_to_read(image)
+
+        rank_texts = self.extractor._recognize(captures, [(capture_idx, row, 'rank') for row in rows])
+
+        new_rows = {}
+        for row in rows:
+            rank_digits = ''.join(filter(str.isdigit, rank_texts.get((capture_idx, row, 'rank'), '')))
+            if rank_digits and int(rank_digits) not in self.players:
+                new_rows.setdefault(int(rank_digits), row)
+
+        if not new_rows:
+            logger.debug(f"Capture {capture_idx+1} : aucun nouveau rang")
+            return
+
+        keys = [(capture_idx, row, field) for row in new_rows.values() for field in FIELDS[1:]]
+        texts = self.extractor._recognize(captures, keys)
+
+        for rank, row in new_rows.items():
+            player = self.extractor._player(rank, texts, capture_idx, row)
+            if player:
+                self.players[rank] = player
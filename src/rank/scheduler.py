@@ -0,0 +1,575 @@
+"""
+Capture planifiée et sans surveillance des classements.
+
+Le planificateur enchaîne, à chaque échéance, les étapes d'une capture :
+navigation jusqu'au classement, capture par défilement, reconnaissance des
+joueurs et enregistrement dans la base. Chaque étape s'exécute dans un thread
+dédié avec un délai maximum ; une tentative échouée est reprise depuis la
+navigation après un délai qui double à chaque essai. Une étape qui dépasse son
+délai est annulée ; si elle ne s'arrête pas, la capture prend fin sans reprise
+pour que deux threads ne pilotent jamais le jeu en même temps, et sa fin est
+journalisée quand elle survient. Les captures et
+la durée de chacune de leurs étapes sont enregistrées dans la base
+(`storage.jobs`).
+
+Le jeu est piloté par un « backend » (voir `CaptureBackend`) : `DreamlandBackend`
+pour le vrai jeu, ou un backend factice pour les tests.
+
+Échéances (config.yaml, section rankings) :
+    schedule: "30 5 * * *"   expression cron (minute heure jour mois jour_semaine)
+    update_frequency: 86400  intervalle en secondes, si `schedule` est absent
+
+Utilisation :
+    python -m rank.scheduler run        capture à chaque échéance
+    python -m rank.scheduler once       une capture immédiate
+    python -m rank.scheduler history [nombre]
+"""
+
+import random
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime, timedelta
+from loguru import logger
+
+from storage import jobs
+from storage.database import RankDatabase
+from .settings import get_setting
+
+# Étapes d'une tentative, dans l'ordre
+STAGES = ('navigate', 'capture', 'extract', 'save')
+
+# Délais par défaut des étapes (s), surchargés par rankings.stage_timeouts
+STAGE_TIMEOUTS = {
+    'navigate': 120.0,
+    'capture': 600.0,
+    'extract': 900.0,
+    'save': 120.0,
+}
+# Attente de la fin d'une étape annulée avant d'abandonner son thread (s) ;
+# une étape abandonnée met fin à la capture sans reprise
+CANCEL_GRACE = 5.0
+# Délai maximum entre deux tentatives (s)
+MAX_RETRY_DELAY = 600.0
+
+
+class StageFailed(Exception):
+    """Étape terminée sans résultat."""
+
+
+class StageTimeout(Exception):
+    """Étape non terminée dans son délai."""
+
+
+class StageAbandoned(StageTimeout):
+    """Étape toujours en cours après son annulation : son thread est abandonné."""
+
+
+class CronSchedule:
+    """
+    Échéances décrites par une expression cron à cinq champs.
+
+    Chaque champ accepte `*`, une valeur, un intervalle `a-b`, un pas `*/n`
+    ou `a-b/n`, et des listes séparées par des virgules. Le jour de la semaine
+    va de 0 (dimanche) à 6 (7 désigne aussi le dimanche).
+    """
+
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Expression cron invalide (5 champs attendus) : {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse(part, low, high) for part, (low, high) in zip(parts, self.FIELDS))
+        self.weekdays = {day % 7 for day in weekdays}
+        # Jour du mois et jour de la semaine restreints tous deux : l'un ou l'autre suffit
+        self._any_day = parts[2] == '*'
+        self._any_weekday = parts[4] == '*'
+
+    @staticmethod
+    def _parse(field, low, high):
+        values = set()
+        for part in field.split(','):
+            span, _, step = part.partition('/')
+            if span == '*':
+                start, end = low, high
+            elif '-' in span:
+                start, end = (int(v) for v in span.split('-', 1))
+            else:
+                start = end = int(span)
+            step = int(step) if step else 1
+            if not (low <= start <= end <= high) or step < 1:
+                raise ValueError(f"Champ cron invalide : {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment):
+        """Première échéance strictement postérieure à `moment`."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Aucune échéance pour {self.expression!r}")
+
+    def next_run(self, last_run, now):
+        """Prochaine capture ; une échéance manquée est rattrapée immédiatement."""
+        return max(now, self.next_after(last_run or now))
+
+    def __repr__(self):
+        return f"CronSchedule({self.expression!r})"
+
+
+class IntervalSchedule:
+    """Échéances à intervalle fixe depuis la dernière capture."""
+
+    def __init__(self, seconds):
+        self.interval = timedelta(seconds=seconds)
+
+    def next_run(self, last_run, now):
+        """Prochaine capture ; immédiate s'il n'y en a jamais eu."""
+        if last_run is None:
+            return now
+        return max(now, last_run + self.interval)
+
+    def __repr__(self):
+        return f"IntervalSchedule({self.interval.total_seconds():.0f} s)"
+
+
+def schedule_from_settings():
+    """Échéances de config.yaml : `rankings.schedule` ou `rankings.update_frequency`."""
+    expression = get_setting('rankings.schedule')
+    if expression:
+        return CronSchedule(expression)
+    return IntervalSchedule(get_setting('rankings.update_frequency', 86400))
+
+
+class CaptureBackend(ABC):
+    """
+    Pilotage du jeu pour une capture.
+
+    Une instance est créée par capture et réutilisée pour ses reprises. Les
+    étapes sont bloquantes et renvoient une valeur fausse en cas d'échec ;
+    elles s'arrêtent au plus tôt après un appel à `cancel`. `reset`, `cancel`
+    et `resume` sont facultatifs.
+    """
+
+    ranking_type = None
+
+    @abstractmethod
+    def navigate(self):
+        """Ouvre le classement depuis l'écran principal."""
+
+    @abstractmethod
+    def capture(self):
+        """Fait défiler et capture le classement, puis revient à l'écran principal."""
+
+    @abstractmethod
+    def extract(self):
+        """Reconnaît les joueurs capturés (liste triée par rang)."""
+
+    def reset(self):
+        """Revient à l'écran principal après un échec."""
+
+    def cancel(self):
+        """Demande l'arrêt de l'étape en cours (délai dépassé)."""
+
+    def resume(self):
+        """Autorise de nouveau les étapes, une fois l'étape annulée terminée."""
+
+
+class DreamlandBackend(CaptureBackend):
+    """Capture du Royaume Onirique dans la fenêtre du jeu."""
+
+    ranking_type = 'dreamland'
+
+    def __init__(self, num_scrolls=24):
+        # Modules Windows (win32, pyautogui) chargés au premier usage
+        from .dreamland import DreamlandRank
+        from .ocr import ocr_registry
+
+        self.manager = DreamlandRank()
+        self.num_scrolls = num_scrolls
+        self.streaming = get_setting('ocr.streaming', True)
+        # Modèle OCR chargé en arrière-plan pendant la navigation et la capture
+        if self.streaming or get_setting('ocr.workers', 1) <= 1:
+            threading.Thread(target=ocr_registry.warmup, daemon=True).start()
+
+    def navigate(self):
+        return self.manager.navigate_to_ranking()
+
+    def capture(self):
+        # Flux d'une tentative précédente interrompue
+        self.manager.stop_streaming()
+        if self.streaming and not self.manager.start_streaming():
+            return False
+        if not self.manager.scroll_and_capture(num_scrolls=self.num_scrolls):
+            self.manager.stop_streaming()
+            return False
+        self._back_to_main()
+        return True
+
+    def extract(self):
+        return self.manager.read_players()
+
+    def reset(self):
+        self.manager.stop_streaming()
+        self._back_to_main()
+
+    def cancel(self):
+        self.manager.cancel()
+
+    def resume(self):
+        self.manager.resume()
+
+    def _back_to_main(self):
+        for _ in range(3):
+            self.manager.click_position("Retour", delay=2.0)
+
+
+class CaptureScheduler:
+    """Planificateur des captures, avec reprises et délais par étape."""
+
+    def __init__(self, backend_factory=DreamlandBackend, db=None, schedule=None, max_retries=None,
+                 retry_delay=None, stage_timeouts=None, max_retry_delay=MAX_RETRY_DELAY, jitter=0.1,
+                 sleep=None, cancel_grace=CANCEL_GRACE):
+        """
+        Args:
+            backend_factory (callable): Crée le backend d'une capture
+            db (RankDatabase): Base des classements (défaut : base par défaut)
+            schedule: Échéances (défaut : config.yaml, voir `schedule_from_settings`)
+            max_retries (int): Reprises après un échec (défaut : rankings.max_retries)
+            retry_delay (float): Délai avant la première reprise (défaut : rankings.retry_delay)
+            stage_timeouts (dict): Délais des étapes (défaut : rankings.stage_timeouts)
+            max_retry_delay (float): Délai maximum entre deux tentatives (s)
+            jitter (float): Variation aléatoire relative des délais de reprise
+            sleep (callable): Attente entre deux tentatives (défaut : interrompue par `stop`)
+            cancel_grace (float): Attente de la fin d'une étape annulée (s)
+        """
+        self.backend_factory = backend_factory
+        self.db = db if db is not None else RankDatabase()
+        self.schedule = schedule or schedule_from_settings()
+        self.max_retries = get_setting('rankings.max_retries', 3) if max_retries is None else max_retries
+        self.retry_delay = get_setting('rankings.retry_delay', 5) if retry_delay is None else retry_delay
+        self.stage_timeouts = dict(STAGE_TIMEOUTS)
+        self.stage_timeouts.update(get_setting('rankings.stage_timeouts', None) or {})
+        self.stage_timeouts.update(stage_timeouts or {})
+        self.max_retry_delay = max_retry_delay
+        self.jitter = jitter
+        self.stopping = threading.Event()
+        self._sleep = sleep or self.stopping.wait
+        self.cancel_grace = cancel_grace
+        self._executor = None
+        # Backend de la capture en cours (créé et utilisé par le thread du planificateur)
+        self._backend = None
+        # Étape abandonnée, peut-être toujours en train de piloter le jeu
+        self._stuck = None
+
+    # Exécution des étapes
+
+    def _run_stage(self, name, func):
+        """
+        Exécute une étape dans le thread des étapes, dans son délai.
+
+        Raises:
+            StageTimeout: Délai dépassé, étape arrêtée par le backend
+            StageAbandoned: Délai dépassé, étape toujours en cours
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='capture')
+        timeout = self.stage_timeouts[name]
+        future = self._executor.submit(func, time.monotonic() + timeout)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            pass
+
+        logger.error(f"Étape {name} : délai de {timeout:.0f} s dépassé")
+        if not self._cancel(name, future):
+            raise StageAbandoned(f"{name} : délai de {timeout:.0f} s dépassé, étape non arrêtée")
+        raise StageTimeout(f"{name} : délai de {timeout:.0f} s dépassé")
+
+    def _cancel(self, name, future):
+        """
+        Demande au backend d'arrêter l'étape et attend qu'elle se termine.
+
+        Returns:
+            bool: True si l'étape s'est arrêtée ; sinon son thread est abandonné
+                  et sa fin sera journalisée
+        """
+        backend = self._backend
+        if backend is not None:
+            try:
+                backend.cancel()
+            except Exception as e:
+                logger.warning(f"Annulation de l'étape impossible : {e}")
+        try:
+            future.result(self.cancel_grace)
+        except FutureTimeout:
+            logger.error(f"Étape {name} toujours en cours : son thread est abandonné")
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._stuck = future
+            abandoned_at = time.monotonic()
+            future.add_done_callback(lambda f: self._abandoned_stage_done(name, f, abandoned_at))
+            return False
+        except Exception:
+            pass
+        # Étape terminée : le jeu peut de nouveau être piloté
+        if backend is not None:
+            backend.resume()
+        return True
+
+    @staticmethod
+    def _abandoned_stage_done(name, future, abandoned_at):
+        """Journalise la fin d'une étape abandonnée : le jeu est de nouveau libre."""
+        elapsed = time.monotonic() - abandoned_at
+        error = future.exception()
+        outcome = f"en échec ({error!r})" if error is not None else "terminée"
+        logger.warning(f"Étape abandonnée {name} {outcome} {elapsed:.0f} s après son abandon : "
+                       f"le jeu est de nouveau libre")
+
+    def _attempt(self, job_id, attempt, ranking_type):
+        """
+        Une tentative complète, étape par étape.
+
+        Returns:
+            int: Nombre de joueurs enregistrés
+        """
+        # Backend créé ici et non dans une étape : une étape terminée après
+        # son délai ne peut pas remplacer celui de la tentative suivante
+        if self._backend is None:
+            self._backend = self.backend_factory()
+        backend = self._backend
+        state = {}
+
+        def navigate(deadline):
+            if not backend.navigate():
+                raise StageFailed("échec de la navigation")
+
+        def capture(deadline):
+            if not backend.capture():
+                raise StageFailed("échec de la capture")
+
+        def extract(deadline):
+            state['players'] = backend.extract()
+            if not state['players']:
+                raise StageFailed("aucun joueur reconnu")
+
+        def save(deadline):
+            # La date du classement est celle d'aujourd'hui, J-1 celle d'hier
+            now = datetime.now()
+            with self.db.connections.deadline(deadline):
+                self.db.save_ranking(ranking_type, state['players'], now.strftime("%Y-%m-%d"),
+                                     (now - timedelta(days=1)).strftime("%Y-%m-%d"))
+
+        for position, (name, func) in enumerate(zip(STAGES, (navigate, capture, extract, save))):
+            started_at = datetime.now()
+            start = time.perf_counter()
+            status, error = jobs.SUCCEEDED, None
+            try:
+                self._run_stage(name, func)
+            except StageTimeout as e:
+                status, error = jobs.TIMEOUT, str(e)
+                raise
+            except Exception as e:
+                status, error = jobs.FAILED, str(e) or type(e).__name__
+                raise
+            finally:
+                duration = time.perf_counter() - start
+                logger.info(f"Capture {job_id}, tentative {attempt} : {name} {status} en {duration:.1f} s")
+                with self.db.connections.writer() as conn:
+                    jobs.record_stage(conn, job_id, attempt, position, name, started_at.isoformat(' ', 'seconds'),
+                                      duration, status, error)
+                    conn.commit()
+        return len(state['players'])
+
+    def _reset(self):
+        """Ramène le jeu à l'écran principal après un échec (au mieux)."""
+        backend = self._backend
+        if backend is None:
+            return
+        try:
+            self._run_stage('navigate', lambda deadline: backend.reset())
+        except Exception as e:
+            logger.warning(f"Retour à l'écran principal impossible : {e}")
+
+    def retry_delay_for(self, attempt):
+        """Délai avant la tentative suivant la tentative `attempt` (1, 2...)."""
+        delay = min(self.retry_delay * 2 ** (attempt - 1), self.max_retry_delay)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    # Captures
+
+    def run_job(self, scheduled_at=None):
+        """
+        Exécute une capture, avec ses reprises.
+
+        Args:
+            scheduled_at (datetime): Échéance à l'origine de la capture
+
+        Returns:
+            dict: Capture enregistrée (voir `RankDatabase.get_capture_jobs`)
+        """
+        ranking_type = getattr(self.backend_factory, 'ranking_type', None) or 'dreamland'
+        started_at = datetime.now()
+        start = time.perf_counter()
+        with self.db.connections.writer() as conn:
+            job_id = jobs.start_job(conn, ranking_type, started_at.isoformat(' ', 'seconds'),
+                                    scheduled_at.isoformat(' ', 'seconds') if scheduled_at else None)
+            conn.commit()
+        logger.info(f"Capture {job_id} ({ranking_type}) démarrée")
+
+        if self._stuck is not None and not self._stuck.done():
+            status, players, error, attempt = (jobs.FAILED, None,
+                                               "étape d'une capture précédente toujours en cours", 0)
+        else:
+            self._stuck = None
+            try:
+                status, players, error, attempt = self._run_attempts(job_id, ranking_type)
+            finally:
+                self._backend = None
+
+        duration = time.perf_counter() - start
+        with self.db.connections.writer() as conn:
+            jobs.finish_job(conn, job_id, datetime.now().isoformat(' ', 'seconds'), duration, status,
+                            attempt, players, error)
+            conn.commit()
+        if status == jobs.SUCCEEDED:
+            logger.info(f"Capture {job_id} terminée en {duration:.0f} s : {players} joueurs")
+        else:
+            logger.error(f"Capture {job_id} abandonnée après {attempt} tentative(s) : {error}")
+        return self.db.get_capture_jobs(limit=1)[0]
+
+    def _run_attempts(self, job_id, ranking_type):
+        """
+        Tentatives d'une capture, jusqu'à la première réussie.
+
+        Returns:
+            tuple: (état, nombre de joueurs, erreur, nombre de tentatives)
+        """
+        status, players, error, attempt = jobs.FAILED, None, None, 0
+        for attempt in range(1, self.max_retries + 2):
+            try:
+                players = self._attempt(job_id, attempt, ranking_type)
+                return jobs.SUCCEEDED, players, None, attempt
+            except StageAbandoned as e:
+                # L'étape pilote peut-être encore le jeu : ni retour à l'écran
+                # principal ni nouvelle tentative
+                logger.error(f"Capture {job_id}, tentative {attempt} abandonnée : {e}")
+                return jobs.TIMEOUT, None, str(e), attempt
+            except StageTimeout as e:
+                status, error = jobs.TIMEOUT, str(e)
+            except Exception as e:
+                status, error = jobs.FAILED, str(e) or type(e).__name__
+            logger.warning(f"Capture {job_id}, tentative {attempt} échouée : {error}")
+            self._reset()
+            if attempt > self.max_retries or self.stopping.is_set() or self._stuck is not None:
+                break
+            delay = self.retry_delay_for(attempt)
+            logger.info(f"Nouvelle tentative dans {delay:.0f} s")
+            self._sleep(delay)
+        return status, players, error, attempt
+
+    def last_run(self):
+        """
+        Échéance de la dernière capture, réussie ou non (son début pour une
+        capture lancée hors échéance), None si aucune.
+
+        La prochaine échéance est calculée après celle-ci : un réveil en avance
+        sur l'horloge ne peut pas exécuter deux fois la même échéance.
+        """
+        history = self.db.get_capture_jobs(limit=1)
+        if not history:
+            return None
+        return datetime.fromisoformat(history[0]['scheduled_at'] or history[0]['started_at'])
+
+    def run(self, max_jobs=None):
+        """
+        Capture à chaque échéance jusqu'à l'appel de `stop`.
+
+        Args:
+            max_jobs (int): Nombre de captures avant de s'arrêter (défaut : sans limite)
+        """
+        logger.info(f"Planificateur démarré : {self.schedule}")
+        done = 0
+        while not self.stopping.is_set() and (max_jobs is None or done < max_jobs):
+            now = datetime.now()
+            due = self.schedule.next_run(self.last_run(), now)
+            wait = (due - now).total_seconds()
+            if wait > 0:
+                logger.info(f"Prochaine capture le {due:%d/%m/%Y à %H:%M}")
+                if self.stopping.wait(wait):
+                    break
+            self.run_job(scheduled_at=due)
+            done += 1
+        logger.info("Planificateur arrêté")
+
+    def stop(self):
+        """Arrête le planificateur après l'étape en cours."""
+        self.stopping.set()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def print_history(history):
+    """Affiche les dernières captures et la durée de leurs étapes."""
+    print(f"{'Capture':>8}  {'Début':<20}{'État':<11}{'Essais':>7}{'Joueurs':>9}{'Durée':>9}  Étapes")
+    print("─" * 100)
+    for job in history:
+        last_attempt = max((s['attempt'] for s in job['stages']), default=0)
+        stages = " ".join(
+            f"{s['stage']} {s['duration']:.1f}s" + ("" if s['status'] == jobs.SUCCEEDED else f" ({s['status']})")
+            for s in job['stages'] if s['attempt'] == last_attempt
+        )
+        duration = f"{job['duration']:.0f} s" if job['duration'] is not None else ""
+        print(f"{job['id']:>8}  {job['started_at']:<20}{job['status']:<11}{job['attempts']:>7}"
+              f"{job['players'] or '':>9}{duration:>9}  {stages}")
+        if job['error']:
+            print(f"{'':>10}{job['error']}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ('run', 'once', 'history'):
+        print(__doc__.strip())
+        return 1
+
+    if argv[0] == 'history':
+        print_history(RankDatabase().get_capture_jobs(limit=int(argv[1]) if len(argv) > 1 else 20))
+        return 0
+
+    scheduler = CaptureScheduler()
+    try:
+        if argv[0] == 'once':
+            return 0 if scheduler.run_job()['status'] == jobs.SUCCEEDED else 1
+        scheduler.run()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    finally:
+        scheduler.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
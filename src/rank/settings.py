@@ -0,0 +1,57 @@
+"""
+Lecture de la configuration générale (resources/config/config.yaml).
+"""
+
+import os
+import yaml
+from loguru import logger
+
+# Chemin du fichier de configuration générale
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'resources', 'config', 'config.yaml')
+
+_settings = None
+
+
+def load_settings(path=CONFIG_PATH):
+    """
+    Charge la configuration générale.
+
+    Args:
+        path (str): Chemin du fichier YAML
+
+    Returns:
+        dict: Configuration chargée ou {} si absente ou invalide
+    """
+    if not os.path.exists(path):
+        logger.warning(f"Configuration générale non trouvée : {path}")
+        return {}
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except Exception as e:
+        logger.error(f"Erreur lors du chargement de la configuration : {e}")
+        return {}
+
+
+def get_setting(name, default=None):
+    """
+    Retourne une valeur de la configuration générale.
+
+    Args:
+        name (str): Chemin pointé de la valeur (ex: "ocr.workers")
+        default: Valeur retournée si la clé est absente
+
+    Returns:
+        Valeur de configuration
+    """
+    global _settings
+    if _settings is None:
+        _settings = load_settings()
+
+    value = _settings
+    for part in name.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return default
+        value = value[part]
+    return value
@@ -4,10 +4,11 @@ Outil de sélection des zones pour l'OCR.
 
 import cv2
 import numpy as np
-import json
 import os
 from loguru import logger
 
+from .zones import ZoneLayout, ZoneLayoutError
+
 class ZoneSelector:
     def __init__(self, image_path):
         self.image = cv2.imread(image_path)
@@ -103,8 +104,8 @@ class ZoneSelector:
             
             if key == ord('s'):  # Sauvegarder
                 if self.current_zone_index >= len(self.zones_to_define):
-                    self.save_zones()
-                    break
+                    if self.save_zones():
+                        break
                 else:
                     print("\nVeuillez définir toutes les zones avant de sauvegarder.")
             
@@ -130,33 +131,22 @@ class ZoneSelector:
         cv2.destroyAllWindows()
     
     def save_zones(self):
-        # Calculer les pourcentages relatifs
-        height, width = self.image.shape[:2]
-        zones_percent = {}
-        
-        for zone_name, zones_list in self.zones.items():
-            zones_percent[zone_name] = []
-            for coords in zones_list:
-                zone_percent = {
-                    'x_percent': coords['x'] / width,
-                    'y_percent': coords['y'] / height,
-                    'width_percent': coords['width'] / width,
-                    'height_percent': coords['height'] / height
-                }
-                zones_percent[zone_name].append(zone_percent)
-        
-        # Sauvegarder dans un fichier JSON
-        config_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'resources', 'config')
-        config_path = os.path.join(config_dir, 'ocr_zones.json')
+        """
+        Valide les zones sélectionnées et les enregistre.
         
-        # Créer le dossier si nécessaire
-        os.makedirs(config_dir, exist_ok=True)
-        
-        # Sauvegarder la configuration
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(zones_percent, f, indent=4, ensure_ascii=False)
+        Returns:
+            bool: True si la configuration a été enregistrée
+        """
+        # Les zones en pixels sont converties en fractions de la capture
+        height, width = self.image.shape[:2]
+        try:
+            layout = ZoneLayout.from_pixels(self.zones, width, height)
+        except ZoneLayoutError as e:
+            print(f"\nConfiguration invalide : {e}")
+            return False
         
-        logger.info(f"Zones sauvegardées dans {config_path}")
+        layout.save()
+        return True
 
 def main():
     """Point d'entrée pour la sélection des zones."""
@@ -0,0 +1,202 @@
+"""
+Disposition des zones OCR du classement.
+
+`ocr_zones.json` décrit chaque zone en fraction de la taille de la capture.
+Le fichier est chargé et validé une seule fois ; les boîtes en pixels sont
+calculées d'un bloc pour toutes les lignes et mémorisées par résolution.
+"""
+
+import json
+import os
+import threading
+import numpy as np
+from loguru import logger
+
+# Emplacement de la configuration produite par l'outil de sélection des zones
+ZONES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'resources', 'config', 'ocr_zones.json')
+
+# Champs lus pour chaque ligne du classement
+FIELDS = ('rank', 'name', 'guild', 'score')
+FIELD_INDEX = {field: i for i, field in enumerate(FIELDS)}
+
+# Clés d'une zone relative, dans l'ordre des colonnes des boîtes
+ZONE_KEYS = ('x_percent', 'y_percent', 'width_percent', 'height_percent')
+
+
+class ZoneLayoutError(ValueError):
+    """Configuration des zones invalide."""
+
+
+class ZoneLayout:
+    """
+    Zones des lignes du classement, compilées en tableau NumPy.
+
+    Le nombre de lignes est celui défini dans la configuration : il suffit de
+    sélectionner plus de zones pour lire plus de lignes par capture. Les zones
+    qui ne sont pas des champs de ligne (date_j1, date_j2...) sont conservées
+    telles quelles pour être réécrites avec la configuration.
+    """
+
+    def __init__(self, zones):
+        """
+        Args:
+            zones (dict): Contenu de `ocr_zones.json`
+
+        Raises:
+            ZoneLayoutError: Si un champ manque, si les champs n'ont pas tous le
+                             même nombre de lignes ou si une zone sort de l'image
+        """
+        missing = [field for field in FIELDS if not zones.get(field)]
+        if missing:
+            raise ZoneLayoutError(f"Zones manquantes : {', '.join(missing)}")
+
+        counts = {field: len(zones[field]) for field in FIELDS}
+        if len(set(counts.values())) != 1:
+            detail = ', '.join(f"{field}={count}" for field, count in counts.items())
+            raise ZoneLayoutError(f"Les champs n'ont pas le même nombre de lignes ({detail})")
+
+        try:
+            fractions = np.array([[[float(zones[field][row][key]) for key in ZONE_KEYS]
+                                   for field in FIELDS] for row in range(counts['rank'])])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ZoneLayoutError(f"Zone mal formée : {e}") from e
+
+        x, y, w, h = np.moveaxis(fractions, -1, 0)
+        if (w <= 0).any() or (h <= 0).any():
+            raise ZoneLayoutError("Une zone a une largeur ou une hauteur nulle")
+        # Tolérance d'un pixel pour les sélections qui touchent le bord
+        if (x < 0).any() or (y < 0).any() or (x + w > 1.001).any() or (y + h > 1.001).any():
+            raise ZoneLayoutError("Une zone dépasse les bords de la capture")
+
+        fractions.setflags(write=False)
+        self.fractions = fractions
+        self.extra = {name: value for name, value in zones.items() if name not in FIELDS}
+        self._boxes = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Les boîtes mémorisées et le verrou ne sont pas transmis aux workers
+        return {'fractions': self.fractions, 'extra': self.extra}
+
+    def __setstate__(self, state):
+        self.fractions = state['fractions']
+        self.extra = state['extra']
+        self._boxes = {}
+        self._lock = threading.Lock()
+
+    @property
+    def num_entries(self):
+        """Nombre de lignes lues par capture."""
+        return self.fractions.shape[0]
+
+    @classmethod
+    def from_file(cls, path=ZONES_PATH):
+        """Charge et valide un fichier `ocr_zones.json`."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_pixels(cls, zones, width, height):
+        """
+        Construit la disposition à partir de zones en pixels (outil de sélection).
+
+        Args:
+            zones (dict): {nom: [{'x', 'y', 'width', 'height'}, ...]}
+            width (int): Largeur de la capture de référence
+            height (int): Hauteur de la capture de référence
+        """
+        return cls({
+            name: [{
+                'x_percent': zone['x'] / width,
+                'y_percent': zone['y'] / height,
+                'width_percent': zone['width'] / width,
+                'height_percent': zone['height'] / height
+            } for zone in zones_list]
+            for name, zones_list in zones.items()
+        })
+
+    def to_dict(self):
+        """Configuration au format de `ocr_zones.json`."""
+        zones = dict(self.extra)
+        for field in FIELDS:
+            zones[field] = [dict(zip(ZONE_KEYS, map(float, self.fractions[row, FIELD_INDEX[field]])))
+                            for row in range(self.num_entries)]
+        return zones
+
+    def save(self, path=ZONES_PATH):
+        """Écrit la configuration et la rend immédiatement active."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=4, ensure_ascii=False)
+        _layouts[os.path.abspath(path)] = (os.path.getmtime(path), self)
+        logger.info(f"Zones sauvegardées dans {path} ({self.num_entries} ligne(s))")
+
+    def boxes(self, width, height):
+        """
+        Boîtes en pixels de toutes les zones pour une résolution.
+
+        Returns:
+            numpy.ndarray: Tableau (lignes, champs, 4) de (x, y, w, h), en
+                           lecture seule, dans l'ordre de FIELDS
+        """
+        size = (width, height)
+        boxes = self._boxes.get(size)
+        if boxes is None:
+            with self._lock:
+                scale = np.array([width, height, width, height], dtype=np.float64)
+                boxes = (self.fractions * scale).astype(np.int64)
+                boxes.setflags(write=False)
+                self._boxes[size] = boxes
+        return boxes
+
+    def box(self, row, field, width, height):
+        """Boîte (x, y, w, h) d'un champ d'une ligne."""
+        return tuple(int(v) for v in self.boxes(width, height)[row, FIELD_INDEX[field]])
+
+    def area(self, width, height):
+        """
+        Zone englobant toutes les boîtes, limitée à la capture.
+
+        Returns:
+            tuple: (x0, y0, x1, y1)
+        """
+        boxes = self.boxes(width, height).reshape(-1, 4)
+        x, y, w, h = boxes.T
+        return (max(0, int(x.min())), max(0, int(y.min())),
+                min(width, int((x + w).max())), min(height, int((y + h).max())))
+
+    def row_bands(self):
+        """
+        Étendue verticale de chaque ligne, tous champs confondus.
+
+        Returns:
+            numpy.ndarray: Tableau (lignes, 2) de (haut, bas) en fraction de la hauteur
+        """
+        top = self.fractions[:, :, 1]
+        bottom = top + self.fractions[:, :, 3]
+        return np.stack([top.min(axis=1), bottom.max(axis=1)], axis=1)
+
+
+# Dispositions chargées, par chemin : (date de modification, disposition)
+_layouts = {}
+
+
+def get_zone_layout(path=ZONES_PATH):
+    """
+    Retourne la disposition des zones, chargée une seule fois.
+
+    Le fichier n'est relu que s'il a été modifié depuis (par exemple par
+    l'outil de sélection lancé dans un autre processus).
+
+    Raises:
+        FileNotFoundError: Si la configuration n'existe pas
+        ZoneLayoutError: Si elle est invalide
+    """
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    cached = _layouts.get(path)
+    if cached is None or cached[0] != mtime:
+        layout = ZoneLayout.from_file(path)
+        _layouts[path] = (mtime, layout)
+        logger.info(f"Zones OCR chargées : {layout.num_entries} ligne(s) par capture")
+    return _layouts[path][1]
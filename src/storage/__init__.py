@@ -0,0 +1,10 @@
+"""
+Module de stockage des classements.
+
+Ne dépend que de la bibliothèque standard et de loguru : il peut être importé
+sans la pile de capture (OCR, OpenCV, win32).
+"""
+
+from .database import RankDatabase
+
+__all__ = ['RankDatabase']
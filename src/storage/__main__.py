@@ -0,0 +1,57 @@
+"""
+Commandes d'administration de la base des classements.
+
+Utilisation :
+    python -m storage status [chemin_de_la_base]
+    python -m storage migrate [chemin_de_la_base]
+    python -m storage rebuild-stats [chemin_de_la_base]
+"""
+
+import os
+import sqlite3
+import sys
+
+from .database import RankDatabase, DB_PATH
+from .migrations import status
+
+
+def print_status(conn, db_path):
+    """Affiche les migrations appliquées et en attente."""
+    print(f"Base : {db_path}\n")
+    print(f"{'Version':>8}  {'Appliquée le':<20}{'Durée':>9}  Description")
+    print("─" * 72)
+    for entry in status(conn):
+        applied_at = entry['applied_at'] or "en attente"
+        duration = f"{entry['duration']:.2f} s" if entry['duration'] is not None else ""
+        print(f"{entry['version']:>8}  {applied_at:<20}{duration:>9}  {entry['name']}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ('status', 'migrate', 'rebuild-stats'):
+        print(__doc__.strip())
+        return 1
+
+    db_path = argv[1] if len(argv) > 1 else DB_PATH
+    if argv[0] == 'rebuild-stats':
+        db = RankDatabase(db_path)
+        count = db.rebuild_stats()
+        print(f"Statistiques recalculées pour {count} classements")
+        return 0
+    if argv[0] == 'migrate':
+        # L'ouverture de la base applique les migrations en attente
+        db = RankDatabase(db_path)
+        conn = db.conn
+    elif not os.path.exists(db_path):
+        print(f"Base introuvable : {db_path}")
+        return 1
+    else:
+        # Lecture seule : l'état des migrations ne modifie pas la base
+        conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+
+    print_status(conn, db_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Accès asynchrone à la base des classements.
+
+Les requêtes de `RankDatabase` sont bloquantes. `AsyncRankDatabase` les
+exécute dans un pool de threads dédié pour ne pas bloquer la boucle
+d'événements du bot, avec un délai par requête : au-delà, SQLite interrompt la
+requête et l'appelant reçoit `QueryTimeout`.
+"""
+
+import asyncio
+import functools
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .database import RankDatabase
+
+# Délai par défaut d'une requête (s), attente d'un thread libre comprise
+DEFAULT_TIMEOUT = 5.0
+# Marge laissée à SQLite pour interrompre la requête avant d'abandonner le thread
+INTERRUPT_GRACE = 0.5
+
+
+class QueryTimeout(Exception):
+    """Requête abandonnée après son délai."""
+
+
+class AsyncRankDatabase:
+    """Façade asynchrone de `RankDatabase`."""
+
+    def __init__(self, db=None, workers=4, timeout=DEFAULT_TIMEOUT):
+        """
+        Args:
+            db (RankDatabase, optional): Base à utiliser (défaut : base par défaut)
+            workers (int): Nombre de requêtes exécutées simultanément
+            timeout (float): Délai par défaut d'une requête (s)
+        """
+        self.db = db if db is not None else RankDatabase(readers=workers)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rank-db')
+
+    def _call(self, method, args, kwargs, deadline):
+        with self.db.connections.deadline(deadline):
+            try:
+                result = method(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if time.monotonic() > deadline:
+                    raise QueryTimeout(f"{method.__name__} : délai dépassé") from e
+                raise
+        # Requête terminée, mais après l'échéance
+        if time.monotonic() > deadline:
+            raise QueryTimeout(f"{method.__name__} : délai dépassé")
+        return result
+
+    async def run(self, method, *args, timeout=None, **kwargs):
+        """
+        Exécute une méthode de la base dans le pool de threads.
+
+        Args:
+            method (callable): Méthode de `self.db`
+            timeout (float, optional): Délai de la requête (défaut : self.timeout)
+
+        Raises:
+            QueryTimeout: Délai dépassé, attente d'un thread libre comprise
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor, functools.partial(self._call, method, args, kwargs, deadline))
+        try:
+            # Une requête encore en file d'attente est annulée avec l'attente
+            return await asyncio.wait_for(future, timeout + INTERRUPT_GRACE)
+        except asyncio.TimeoutError:
+            raise QueryTimeout(f"{method.__name__} : délai dépassé") from None
+
+    async def data_version(self, timeout=None):
+        """Voir `RankDatabase.data_version`."""
+        return await self.run(self.db.data_version, timeout=timeout)
+
+    async def get_leaderboard(self, *args, timeout=None, **kwargs):
+        """Voir `RankDatabase.get_leaderboard`."""
+        return await self.run(self.db.get_leaderboard, *args, timeout=timeout, **kwargs)
+
+    async def get_leaderboard_page(self, *args, timeout=None, **kwargs):
+        """Voir `RankDatabase.get_leaderboard_page`."""
+        return await self.run(self.db.get_leaderboard_page, *args, timeout=timeout, **kwargs)
+
+    async def get_latest_ranking(self, *args, timeout=None, **kwargs):
+        """Voir `RankDatabase.get_latest_ranking`."""
+        return await self.run(self.db.get_latest_ranking, *args, timeout=timeout, **kwargs)
+
+    async def get_player_history(self, *args, timeout=None, **kwargs):
+        """Voir `RankDatabase.get_player_history`."""
+        return await self.run(self.db.get_player_history, *args, timeout=timeout, **kwargs)
+
+    async def get_player_stats(self, *args, timeout=None, **kwargs):
+        """Voir `RankDatabase.get_player_stats`."""
+        return await self.run(self.db.get_player_stats, *args, timeout=timeout, **kwargs)
+
+    async def get_guild_members(self, *args, timeout=None, **kwargs):
+        """Voir `RankDatabase.get_guild_members`."""
+        return await self.run(self.db.get_guild_members, *args, timeout=timeout, **kwargs)
+
+    async def get_score_deltas(self, *args, timeout=None, **kwargs):
+        """Voir `RankDatabase.get_score_deltas`."""
+        return await self.run(self.db.get_score_deltas, *args, timeout=timeout, **kwargs)
+
+    async def get_score_distribution(self, *args, timeout=None, **kwargs):
+        """Voir `RankDatabase.get_score_distribution`."""
+        return await self.run(self.db.get_score_distribution, *args, timeout=timeout, **kwargs)
+
+    async def get_score_curve(self, *args, timeout=None, **kwargs):
+        """Voir `RankDatabase.get_score_curve`."""
+        return await self.run(self.db.get_score_curve, *args, timeout=timeout, **kwargs)
+
+    async def search_players(self, *args, timeout=None, **kwargs):
+        """Voir `RankDatabase.search_players`."""
+        return await self.run(self.db.search_players, *args, timeout=timeout, **kwargs)
+
+    async def search_guilds(self, *args, timeout=None, **kwargs):
+        """Voir `RankDatabase.search_guilds`."""
+        return await self.run(self.db.search_guilds, *args, timeout=timeout, **kwargs)
+
+    def close(self):
+        """Arrête le pool de threads et ferme la base."""
+        self._executor.shutdown(wait=True)
+        self.db.close()
@@ -0,0 +1,142 @@
+"""
+Cache des résultats de requêtes.
+
+Les classements ne changent qu'à l'enregistrement d'un nouveau jour : les
+lectures répétées du bot peuvent réutiliser le même résultat. Chaque entrée est
+associée à la version des données (`data_version`), incrémentée dans la
+transaction de chaque écriture, y compris depuis un autre processus : une
+entrée d'une version antérieure n'est jamais servie. La taille du cache et la
+durée de vie des entrées sont bornées.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    )
+"""
+
+
+def bump_data_version(conn):
+    """Invalide les résultats en cache ; ne valide pas la transaction."""
+    conn.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+
+
+def read_data_version(conn):
+    """Version courante des données."""
+    return conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()[0]
+
+
+class QueryCache:
+    """Cache LRU borné des résultats, invalidé par la version des données."""
+
+    def __init__(self, max_entries=256, ttl=300.0):
+        """
+        Args:
+            max_entries (int): Nombre maximum de résultats conservés
+            ttl (float): Durée de vie d'un résultat (s)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Durée des requêtes évitées par les succès
+        self.saved_seconds = 0.0
+
+    def get(self, key, version):
+        """
+        Résultat en cache pour une clé et une version des données.
+
+        Returns:
+            tuple: (trouvé, résultat)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, expires_at, duration, result = entry
+                if entry_version == version and time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.saved_seconds += duration
+                    return True, result
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, version, result, duration):
+        """Conserve un résultat calculé en `duration` secondes."""
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl, duration, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Compteurs du cache : succès, échecs, taux de succès, temps de requête évité."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'saved_seconds': self.saved_seconds,
+            }
+
+
+def _normalize(value):
+    # Une date cible ne compte qu'au jour près (les requêtes utilisent %Y-%m-%d)
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+def cached_query(method):
+    """
+    Sert une méthode de lecture de `RankDatabase` depuis `self.cache`.
+
+    La clé est formée du nom de la méthode et de ses arguments normalisés
+    (valeurs par défaut comprises). Le résultat en cache est partagé entre
+    les appelants : il ne doit pas être modifié. Une méthode qui échoue lève
+    son exception sans rien mettre en cache : les méthodes servies par le
+    cache ne doivent pas masquer leurs erreurs derrière un résultat vide.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.cache is None:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(_normalize(value) for value in list(bound.arguments.values())[1:])
+        version = self.data_version()
+
+        found, result = self.cache.get(key, version)
+        if found:
+            return result
+        start = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        # Un résultat obtenu après l'échéance de l'appelant n'est pas servi
+        if not self.connections.expired():
+            self.cache.put(key, version, result, time.perf_counter() - start)
+        return result
+
+    return wrapper
@@ -0,0 +1,140 @@
+"""
+Connexions à la base des classements.
+
+Le bot lit la base pendant que la capture y écrit. La base est ouverte en mode
+WAL : les lectures ne bloquent pas l'écriture et voient le dernier état validé.
+Les lectures passent par un petit pool de connexions en lecture seule ; les
+écritures du processus sont sérialisées sur une connexion unique. Une
+échéance peut être fixée aux requêtes d'un thread : SQLite les interrompt
+lorsqu'elle est dépassée.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# Réglages appliqués à chaque connexion
+PRAGMAS = {
+    # En WAL, NORMAL ne synchronise qu'aux points de contrôle
+    'synchronous': 'NORMAL',
+    # 16 Mo de cache de pages par connexion
+    'cache_size': -16000,
+    # Lecture de la base par projection mémoire (256 Mo)
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Instructions SQLite entre deux vérifications de l'échéance d'une requête
+PROGRESS_STEPS = 10000
+
+
+class ConnectionManager:
+    """Connexion d'écriture unique et pool de connexions de lecture."""
+
+    def __init__(self, db_path, readers=4, timeout=30.0):
+        """
+        Args:
+            db_path (str): Chemin de la base
+            readers (int): Nombre maximum de connexions de lecture simultanées
+            timeout (float): Attente maximale (s) d'un verrou de la base ou
+                             d'une connexion de lecture libre
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        # Une base en mémoire n'existe que dans sa connexion : tout passe par
+        # la connexion d'écriture
+        self.in_memory = db_path in ('', ':memory:')
+
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        self._writer = self._connect()
+        if not self.in_memory:
+            self._writer.execute("PRAGMA journal_mode = WAL")
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(readers)
+        self._readers = []
+        self._readers_lock = threading.Lock()
+
+    def _connect(self, read_only=False):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        for name, value in PRAGMAS.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+        conn.set_progress_handler(self.expired, PROGRESS_STEPS)
+        return conn
+
+    def expired(self):
+        """Échéance du thread appelant dépassée (voir `deadline`)."""
+        # Pour le gestionnaire de progression, une valeur vraie interrompt la
+        # requête (OperationalError "interrupted")
+        deadline = getattr(self._local, 'deadline', None)
+        return deadline is not None and time.monotonic() > deadline
+
+    @contextmanager
+    def deadline(self, deadline):
+        """
+        Interrompt les requêtes du thread appelant au-delà d'une échéance.
+
+        Args:
+            deadline (float): Échéance, en secondes de `time.monotonic()`
+        """
+        previous = getattr(self._local, 'deadline', None)
+        self._local.deadline = deadline
+        try:
+            yield
+        finally:
+            self._local.deadline = previous
+
+    @property
+    def write_connection(self):
+        """Connexion d'écriture, sans prise du verrou (migrations, administration)."""
+        return self._writer
+
+    @contextmanager
+    def writer(self):
+        """Connexion d'écriture, réservée au thread appelant pendant le bloc."""
+        with self._write_lock:
+            yield self._writer
+
+    @contextmanager
+    def reader(self):
+        """
+        Connexion de lecture du pool, rendue à la sortie du bloc.
+
+        Raises:
+            sqlite3.OperationalError: Aucune connexion libre dans le délai
+        """
+        if self.in_memory:
+            with self.writer() as conn:
+                yield conn
+            return
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError("Aucune connexion de lecture disponible")
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect(read_only=True)
+                with self._readers_lock:
+                    self._readers.append(conn)
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Ferme toutes les connexions."""
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        self._writer.close()
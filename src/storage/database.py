@@ -0,0 +1,831 @@
+"""
+Module de gestion de la base de données pour le stockage des classements.
+"""
+
+import sqlite3
+import os
+from datetime import datetime
+from loguru import logger
+import threading
+import time
+
+from .cache import QueryCache, bump_data_version, cached_query, read_data_version
+from .connection import ConnectionManager
+from .days import link_ranking_days
+from .jobs import job_history
+from .migrations import migrate
+from .scores import parse_score
+from .search import NameIndex
+from .snapshots import (PAGE_SIZE, build_snapshot, format_pages, format_table, load_pages, publish_snapshot,
+                        rebuild_snapshots)
+from .stats import refresh_rank_stats, rebuild_rank_stats
+
+# Emplacement par défaut de la base des classements
+DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'resources', 'data', 'database', 'rankings.db')
+
+class RankDatabase:
+    """Gestionnaire de la base de données des classements."""
+    
+    def __init__(self, db_path=None, readers=4, cache_size=256, cache_ttl=300.0):
+        """
+        Initialise la connexion à la base de données.
+        
+        Args:
+            db_path (str): Chemin de la base (par défaut : resources/data/database/rankings.db)
+            readers (int): Nombre maximum de lectures simultanées
+            cache_size (int): Nombre de résultats de requêtes en cache (0 : pas de cache)
+            cache_ttl (float): Durée de vie d'un résultat en cache (s)
+        """
+        if db_path is None:
+            # Créer le dossier resources/data s'il n'existe pas
+            os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+            db_path = DB_PATH
+        
+        # Chemin de la base de données
+        self.db_path = db_path
+        
+        # Connexion d'écriture et pool de connexions de lecture (WAL)
+        self.connections = ConnectionManager(self.db_path, readers=readers)
+        
+        # Résultats des lectures fréquentes, invalidés à chaque écriture
+        self.cache = QueryCache(cache_size, cache_ttl) if cache_size else None
+        
+        # Index de recherche des noms, reconstruits à chaque version des données
+        self._name_indexes = {}
+        self._name_indexes_lock = threading.Lock()
+        
+        # Classements complets calculés à la demande, pour les vues par guilde
+        self._snapshots = {}
+        self._snapshots_version = None
+        self._snapshots_lock = threading.Lock()
+        
+        # Initialiser la base de données
+        self._init_database()
+    
+    @property
+    def conn(self):
+        """Connexion d'écriture (migrations, administration, tests)."""
+        return self.connections.write_connection
+    
+    def data_version(self):
+        """Version des données, incrémentée à chaque écriture (tous processus)."""
+        with self.connections.reader() as conn:
+            return read_data_version(conn)
+    
+    def close(self):
+        """Ferme les connexions à la base de données."""
+        self.connections.close()
+    
+    def __del__(self):
+        """Ferme les connexions à la base de données."""
+        if hasattr(self, 'connections'):
+            self.connections.close()
+    
+    def _init_database(self):
+        """Initialise la structure de la base de données."""
+        try:
+            cursor = self.conn.cursor()
+            
+            # Table des dates de classement
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ranking_dates (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    date_j1 TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(date, type)
+                )
+            """)
+            
+            # Table des joueurs
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS players (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    guild TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(name)
+                )
+            """)
+            
+            # Table des classements
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS rankings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ranking_date_id INTEGER,
+                    player_id INTEGER,
+                    rank INTEGER NOT NULL,
+                    score TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (ranking_date_id) REFERENCES ranking_dates (id),
+                    FOREIGN KEY (player_id) REFERENCES players (id),
+                    UNIQUE(ranking_date_id, rank)
+                )
+            """)
+            
+            self.conn.commit()
+            
+            # Évolutions du schéma (index...)
+            migrate(self.conn)
+            logger.info("Base de données initialisée avec succès")
+            
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de l'initialisation de la base de données : {e}")
+            raise
+    
+    def save_ranking(self, ranking_type, players, date, date_j1):
+        """
+        Sauvegarde les données d'un classement.
+        
+        Tous les joueurs sont chargés dans une table temporaire, puis les
+        joueurs, leurs guildes et les classements sont écrits en quelques
+        requêtes ensemblistes, dans une seule transaction.
+        
+        Args:
+            ranking_type (str): Type de classement (dreamland, arena, etc.)
+            players (list): Liste des joueurs avec leurs données
+            date (str): Date du classement
+            date_j1 (str): Date du classement J-1
+        """
+        with self.connections.writer() as conn:
+            try:
+                cursor = conn.cursor()
+                
+                # Créer la date ou mettre à jour sa date J-1
+                cursor.execute("""
+                    INSERT INTO ranking_dates (date, type, date_j1)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(date, type) DO UPDATE SET date_j1 = excluded.date_j1
+                """, (date, ranking_type, date_j1))
+                
+                cursor.execute("""
+                    SELECT id FROM ranking_dates
+                    WHERE date = ? AND type = ?
+                """, (date, ranking_type))
+                result = cursor.fetchone()
+                if not result:
+                    raise Exception("Impossible de récupérer l'ID de la date de classement")
+                ranking_date_id = result[0]
+                
+                # Classement précédent du même type
+                link_ranking_days(conn, ranking_type)
+                
+                # Supprimer les anciens classements pour cette date
+                cursor.execute("""
+                    DELETE FROM rankings
+                    WHERE ranking_date_id = ?
+                """, (ranking_date_id,))
+                
+                # Charger le classement dans une table temporaire
+                cursor.execute("DROP TABLE IF EXISTS temp.ranking_import")
+                cursor.execute("""
+                    CREATE TEMP TABLE ranking_import (
+                        rank INTEGER NOT NULL,
+                        name TEXT NOT NULL,
+                        guild TEXT NOT NULL,
+                        score INTEGER NOT NULL
+                    )
+                """)
+                cursor.executemany("""
+                    INSERT INTO ranking_import (rank, name, guild, score)
+                    VALUES (?, ?, ?, ?)
+                """, [(player['rank'], player['name'], player.get('guild', ''), parse_score(player.get('score')))
+                      for player in players])
+                cursor.execute("CREATE INDEX temp.idx_ranking_import_name ON ranking_import (name)")
+                
+                # Nouveaux joueurs
+                cursor.execute("""
+                    INSERT OR IGNORE INTO players (name, guild)
+                    SELECT name, guild FROM ranking_import ORDER BY rowid
+                """)
+                
+                # Guildes modifiées (la dernière occurrence d'un nom l'emporte)
+                cursor.execute("""
+                    UPDATE players
+                    SET guild = (
+                        SELECT guild FROM ranking_import
+                        WHERE rowid = (SELECT MAX(rowid) FROM ranking_import WHERE name = players.name)
+                    )
+                    WHERE id IN (
+                        SELECT p.id FROM ranking_import i
+                        JOIN players p ON p.name = i.name
+                        WHERE p.guild IS NOT i.guild
+                    )
+                """)
+                
+                # Classements
+                cursor.execute("""
+                    INSERT INTO rankings (ranking_date_id, player_id, rank, score)
+                    SELECT ?, p.id, i.rank, i.score
+                    FROM ranking_import i
+                    JOIN players p ON p.name = i.name
+                    ORDER BY i.rowid
+                """, (ranking_date_id,))
+                
+                cursor.execute("DROP TABLE temp.ranking_import")
+                
+                # Moyennes glissantes du jour (et des jours suivants en cas de reprise)
+                refresh_rank_stats(conn, ranking_date_id)
+                
+                # Classement complet du jour, prêt à être affiché par le bot
+                publish_snapshot(conn, ranking_date_id)
+                
+                # Les résultats en cache ne sont plus à jour
+                bump_data_version(conn)
+                
+                conn.commit()
+                logger.info(f"Classement {ranking_type} sauvegardé avec succès ({len(players)} joueurs)")
+                
+            except Exception as e:
+                logger.error(f"Erreur lors de la sauvegarde du classement : {e}")
+                conn.rollback()
+                raise
+    
+    @cached_query
+    def get_player_history(self, player_name: str, limit: int = 7) -> list:
+        """Récupère l'historique d'un joueur.
+        
+        Args:
+            player_name: Nom du joueur
+            limit: Nombre de jours d'historique (défaut: 7)
+            
+        Returns:
+            Liste des classements du joueur avec date, rang et score
+        """
+        try:
+            with self.connections.reader() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute("""
+                    SELECT 
+                        rd.date_j1 as date,
+                        r.rank,
+                        r.score,
+                        ROUND(CAST(s.rank_sum AS REAL) / s.rank_count, 1) as avg_rank
+                    FROM players p
+                    JOIN rankings r ON r.player_id = p.id
+                    JOIN ranking_dates rd ON r.ranking_date_id = rd.id
+                    LEFT JOIN player_rank_stats s ON s.ranking_date_id = r.ranking_date_id
+                        AND s.player_id = r.player_id
+                    WHERE p.name = ?
+                    ORDER BY rd.date_j1 DESC
+                    LIMIT ?
+                """, (player_name, limit))
+                
+                history = []
+                for row in cursor.fetchall():
+                    history.append({
+                        "date": row[0],
+                        "rank": row[1],
+                        "score": row[2],
+                        "avg_rank": row[3] if row[3] is not None else row[1]  # Utiliser le rang actuel si pas de moyenne
+                    })
+                    
+                return history
+                
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de la récupération de l'historique: {e}")
+            raise
+    
+    def get_player_stats(self, player_name: str, ranking_type: str = 'dreamland') -> dict:
+        """Récupère les statistiques glissantes d'un joueur à son dernier classement.
+        
+        Args:
+            player_name: Nom du joueur
+            ranking_type: Type de classement
+            
+        Returns:
+            Dictionnaire (date, rang moyen, meilleur et pire rang, nombre de
+            jours classés sur la période) ou None si le joueur n'est pas classé
+        """
+        try:
+            with self.connections.reader() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute("""
+                    SELECT 
+                        rd.date_j1,
+                        CAST(s.rank_sum AS REAL) / s.rank_count,
+                        s.best_rank,
+                        s.worst_rank,
+                        s.rank_count
+                    FROM players p
+                    JOIN player_rank_stats s ON s.player_id = p.id
+                    JOIN ranking_dates rd ON s.ranking_date_id = rd.id
+                    WHERE p.name = ? AND rd.type = ?
+                    ORDER BY rd.date_j1 DESC
+                    LIMIT 1
+                """, (player_name, ranking_type))
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                
+                return {
+                    'date': row[0],
+                    'avg_rank': row[1],
+                    'best_rank': row[2],
+                    'worst_rank': row[3],
+                    'days': row[4]
+                }
+                
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de la récupération des statistiques du joueur : {e}")
+            raise
+    
+    def rebuild_stats(self):
+        """Recalcule les statistiques glissantes à partir de tout l'historique."""
+        with self.connections.writer() as conn:
+            count = rebuild_rank_stats(conn)
+            rebuild_snapshots(conn)
+            bump_data_version(conn)
+            conn.commit()
+            return count
+    
+    def get_capture_jobs(self, limit: int = 20) -> list:
+        """Dernières captures planifiées avec la durée de chaque étape (voir storage.jobs)."""
+        with self.connections.reader() as conn:
+            return job_history(conn, limit)
+    
+    def _name_index(self, kind):
+        """Index de recherche des noms de joueurs ('players') ou de guildes ('guilds')."""
+        version = self.data_version()
+        with self._name_indexes_lock:
+            cached = self._name_indexes.get(kind)
+            if cached and cached[0] == version:
+                return cached[1]
+            
+            with self.connections.reader() as conn:
+                if kind == 'players':
+                    names = [row[0] for row in conn.execute("SELECT name FROM players")]
+                else:
+                    names = [row[0] for row in conn.execute("SELECT DISTINCT guild FROM players")]
+            index = NameIndex(names)
+            self._name_indexes[kind] = (version, index)
+            return index
+    
+    def search_players(self, query: str, limit: int = 10) -> list:
+        """Recherche approchée d'un joueur par son nom.
+        
+        Args:
+            query: Nom ou partie du nom, tel que saisi (fautes d'OCR tolérées)
+            limit: Nombre maximum de résultats
+            
+        Returns:
+            Liste des joueurs (nom, guilde, similarité) du plus proche au moins proche
+        """
+        matches = self._name_index('players').search(query, limit)
+        if not matches:
+            return []
+        
+        with self.connections.reader() as conn:
+            guilds = dict(conn.execute(
+                f"SELECT name, guild FROM players WHERE name IN ({','.join('?' * len(matches))})",
+                [name for name, _ in matches]
+            ).fetchall())
+        return [{'name': name, 'guild': guilds.get(name), 'similarity': similarity}
+                for name, similarity in matches]
+    
+    def search_guilds(self, query: str, limit: int = 10) -> list:
+        """Recherche approchée d'une guilde par son nom.
+        
+        Args:
+            query: Nom ou partie du nom de la guilde
+            limit: Nombre maximum de résultats
+            
+        Returns:
+            Liste des guildes (nom, nombre de joueurs, similarité) de la plus
+            proche à la moins proche
+        """
+        matches = self._name_index('guilds').search(query, limit)
+        if not matches:
+            return []
+        
+        with self.connections.reader() as conn:
+            members = dict(conn.execute(
+                f"SELECT guild, COUNT(*) FROM players WHERE guild IN ({','.join('?' * len(matches))}) GROUP BY guild",
+                [name for name, _ in matches]
+            ).fetchall())
+        return [{'name': name, 'members': members.get(name, 0), 'similarity': similarity}
+                for name, similarity in matches]
+    
+    @cached_query
+    def get_guild_members(self, guild_name: str, ranking_type: str = None):
+        """
+        Récupère les derniers classements des membres d'une guilde.
+        
+        Args:
+            guild_name (str): Nom de la guilde
+            ranking_type (str, optional): Type de classement spécifique
+            
+        Returns:
+            list: Liste des derniers classements des membres
+        """
+        try:
+            with self.connections.reader() as conn:
+                cursor = conn.cursor()
+                
+                query = """
+                    WITH LastRankings AS (
+                        SELECT 
+                            p.name,
+                            p.guild,
+                            rd.type,
+                            r.rank,
+                            r.score,
+                            rd.date,
+                            ROW_NUMBER() OVER (
+                                PARTITION BY p.id, rd.type 
+                                ORDER BY rd.date DESC
+                            ) as rn
+                        FROM players p
+                        JOIN rankings r ON p.id = r.player_id
+                        JOIN ranking_dates rd ON r.ranking_date_id = rd.id
+                        WHERE p.guild = ?
+                    )
+                    SELECT name, guild, type, rank, score, date
+                    FROM LastRankings
+                    WHERE rn = 1
+                """
+                
+                params = [guild_name]
+                if ranking_type:
+                    query += " AND type = ?"
+                    params.append(ranking_type)
+                
+                query += " ORDER BY rank"
+                
+                cursor.execute(query, params)
+                members = cursor.fetchall()
+                
+                return [{
+                    'name': row[0],
+                    'guild': row[1],
+                    'type': row[2],
+                    'rank': row[3],
+                    'score': row[4],
+                    'date': row[5]
+                } for row in members]
+                
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors de la récupération des membres de la guilde : {e}")
+            raise
+    
+    def clear_database(self):
+        """Vide complètement la base de données."""
+        with self.connections.writer() as conn:
+            try:
+                cursor = conn.cursor()
+                
+                # Supprimer toutes les données des tables
+                cursor.execute("DELETE FROM leaderboard_snapshots")
+                cursor.execute("DELETE FROM player_rank_stats")
+                cursor.execute("DELETE FROM rankings")
+                cursor.execute("DELETE FROM players")
+                cursor.execute("DELETE FROM ranking_dates")
+                cursor.execute("DELETE FROM capture_job_stages")
+                cursor.execute("DELETE FROM capture_jobs")
+                
+                # Réinitialiser les compteurs d'auto-incrémentation
+                cursor.execute("DELETE FROM sqlite_sequence")
+                bump_data_version(conn)
+                
+                conn.commit()
+                logger.info("Base de données vidée avec succès")
+                
+            except sqlite3.Error as e:
+                logger.error(f"Erreur lors du nettoyage de la base de données : {e}")
+                raise
+    
+    @cached_query
+    def get_leaderboard(self, target_date: datetime = None, ranking_type: str = 'dreamland',
+                        guild_name: str = None) -> dict:
+        """Récupère les pages du classement le plus récent ou d'une date J-1.
+        
+        Les pages complètes sont lues dans l'instantané publié à
+        l'enregistrement du jour ; celles d'une guilde sont dérivées en mémoire
+        du classement complet du jour, calculé à la première demande. Le résultat est partagé par le cache : il
+        ne doit pas être modifié.
+        
+        Args:
+            target_date: Date J-1 du classement (défaut : le plus récent)
+            ranking_type: Type de classement
+            guild_name: Nom (ou partie du nom) de la guilde à filtrer
+        
+        Returns:
+            dict: date (J-1), count (nombre de joueurs classés) et pages
+                  (tableaux mis en forme des premiers joueurs), ou None
+        """
+        ranking_date_id = self._leaderboard_day(target_date, ranking_type)
+        if ranking_date_id is None:
+            return None
+        if not guild_name:
+            with self.connections.reader() as conn:
+                return load_pages(conn, ranking_date_id)
+        
+        date = self._snapshot(ranking_date_id)['date']
+        members = self._leaderboard_players(ranking_date_id, guild_name)
+        return {'date': date, 'count': len(members), 'pages': format_pages(members)}
+    
+    @cached_query
+    def get_leaderboard_page(self, page: int = 0, target_date: datetime = None, ranking_type: str = 'dreamland',
+                             guild_name: str = None) -> dict:
+        """Récupère une page du classement, au-delà des pages précalculées comprises.
+        
+        Args:
+            page: Numéro de la page (à partir de 0)
+            target_date: Date J-1 du classement (défaut : le plus récent)
+            ranking_type: Type de classement
+            guild_name: Nom (ou partie du nom) de la guilde à filtrer
+        
+        Returns:
+            dict: date (J-1), count (nombre de joueurs classés), page,
+                  page_count et table (tableau mis en forme, None hors des
+                  pages existantes), ou None si le classement n'existe pas
+        """
+        leaderboard = self.get_leaderboard(target_date, ranking_type, guild_name)
+        if leaderboard is None:
+            return None
+        
+        if page < len(leaderboard['pages']):
+            table = leaderboard['pages'][page]
+        else:
+            # Pages suivantes : mises en forme à la demande depuis le classement complet
+            players = self._leaderboard_players(self._leaderboard_day(target_date, ranking_type), guild_name)
+            shown = players[page * PAGE_SIZE:(page + 1) * PAGE_SIZE] if page >= 0 else []
+            table = format_table(shown) if shown else None
+        
+        return {
+            'date': leaderboard['date'],
+            'count': leaderboard['count'],
+            'page': page,
+            'page_count': -(-leaderboard['count'] // PAGE_SIZE),
+            'table': table
+        }
+    
+    def _leaderboard_day(self, target_date, ranking_type):
+        """Identifiant du classement le plus récent, ou de la date J-1 demandée."""
+        with self.connections.reader() as conn:
+            query = "SELECT id FROM ranking_dates WHERE type = ?"
+            params = [ranking_type]
+            if target_date:
+                query += " AND date_j1 = ?"
+                params.append(target_date.strftime("%Y-%m-%d"))
+            row = conn.execute(query + " ORDER BY date_j1 DESC LIMIT 1", params).fetchone()
+            return row[0] if row else None
+    
+    def _leaderboard_players(self, ranking_date_id, guild_name=None):
+        """Joueurs d'un classement, filtrés par guilde comme LIKE '%guilde%'."""
+        players = self._snapshot(ranking_date_id)['players']
+        if not guild_name:
+            return players
+        needle = guild_name.lower()
+        return [p for p in players if needle in (p['guild'] or '').lower()]
+    
+    def _snapshot(self, ranking_date_id):
+        """Classement complet d'un jour, conservé jusqu'à la prochaine version des données."""
+        version = self.data_version()
+        with self._snapshots_lock:
+            if self._snapshots_version != version:
+                self._snapshots, self._snapshots_version = {}, version
+            snapshot = self._snapshots.get(ranking_date_id)
+            if snapshot is None:
+                with self.connections.reader() as conn:
+                    snapshot = build_snapshot(conn, ranking_date_id)
+                self._snapshots[ranking_date_id] = snapshot
+            return snapshot
+    
+    @cached_query
+    def get_latest_ranking(self, limit: int = 100, guild_name: str = None, target_date: datetime = None,
+                           ranking_type: str = 'dreamland') -> list:
+        """Récupère le classement le plus récent.
+        
+        Args:
+            limit: Nombre maximum de joueurs à retourner
+            guild_name: Nom de la guilde à filtrer
+            target_date: Date spécifique pour le classement
+            ranking_type: Type de classement
+        """
+        try:
+            with self.connections.reader() as conn:
+                cursor = conn.cursor()
+                
+                # Construction de la requête SQL de base ; l'évolution du rang se
+                # lit dans le classement précédent du même type (prev_id)
+                query = """
+                    WITH latest_day AS (
+                        SELECT id, prev_id
+                        FROM ranking_dates
+                        WHERE type = ?
+                        {}
+                        ORDER BY date_j1 DESC
+                        LIMIT 1
+                    )
+                    SELECT 
+                        r.rank,
+                        p.name,
+                        p.guild,
+                        COALESCE(prev_r.rank - r.rank, 0) as rank_change,
+                        COALESCE(CAST(s.rank_sum AS REAL) / s.rank_count, r.rank) as avg_rank
+                    FROM rankings r
+                    JOIN players p ON r.player_id = p.id
+                    LEFT JOIN rankings prev_r ON prev_r.player_id = r.player_id
+                        AND prev_r.ranking_date_id = (SELECT prev_id FROM latest_day)
+                    LEFT JOIN player_rank_stats s ON s.ranking_date_id = r.ranking_date_id
+                        AND s.player_id = r.player_id
+                    WHERE r.ranking_date_id = (SELECT id FROM latest_day)
+                """
+                
+                # Ajout de la condition de date si spécifiée
+                date_condition = ""
+                if target_date:
+                    date_condition = f"AND date_j1 = ?"
+                
+                # Finalisation de la requête avec les filtres
+                query = query.format(date_condition)
+                
+                # Ajout du filtre de guilde si spécifié
+                if guild_name:
+                    query += " AND p.guild LIKE ?"
+                
+                # Ajout de la limite
+                query += " ORDER BY r.rank LIMIT ?"
+                
+                # Préparation des paramètres
+                params = [ranking_type]
+                if target_date:
+                    params.append(target_date.strftime("%Y-%m-%d"))
+                if guild_name:
+                    params.append(f"%{guild_name}%")
+                params.append(limit)
+                
+                # Exécution de la requête
+                cursor.execute(query, params)
+                results = cursor.fetchall()
+                
+                # Conversion en liste de dictionnaires
+                players = []
+                for row in results:
+                    players.append({
+                        'rank': row[0],
+                        'name': row[1],
+                        'guild': row[2],
+                        'rank_change': row[3],
+                        'avg_rank': row[4]
+                    })
+                
+                return players
+                
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération du classement: {e}")
+            raise
+    
+    def get_score_deltas(self, ranking_type: str = 'dreamland', target_date: datetime = None, limit: int = 100) -> list:
+        """Récupère la progression du score de chaque joueur depuis le classement précédent.
+        
+        Args:
+            ranking_type: Type de classement
+            target_date: Date J-1 du classement (défaut: le plus récent)
+            limit: Nombre maximum de joueurs à retourner
+            
+        Returns:
+            Liste des joueurs triés par progression décroissante ; delta vaut
+            None pour un joueur absent du classement précédent
+        """
+        try:
+            with self.connections.reader() as conn:
+                cursor = conn.cursor()
+                
+                params = [ranking_type]
+                date_condition = ""
+                if target_date:
+                    date_condition = "AND date_j1 = ?"
+                    params.append(target_date.strftime("%Y-%m-%d"))
+                params.append(limit)
+                
+                cursor.execute(f"""
+                    WITH current_day AS (
+                        SELECT id, prev_id
+                        FROM ranking_dates
+                        WHERE type = ?
+                        {date_condition}
+                        ORDER BY date_j1 DESC
+                        LIMIT 1
+                    )
+                    SELECT 
+                        p.name,
+                        p.guild,
+                        r.rank,
+                        r.score,
+                        prev_r.score,
+                        r.score - prev_r.score as delta
+                    FROM current_day d
+                    JOIN rankings r ON r.ranking_date_id = d.id
+                    JOIN players p ON r.player_id = p.id
+                    LEFT JOIN rankings prev_r ON prev_r.player_id = r.player_id
+                        AND prev_r.ranking_date_id = d.prev_id
+                    ORDER BY delta IS NULL, delta DESC, r.rank
+                    LIMIT ?
+                """, params)
+                
+                return [{
+                    'name': row[0],
+                    'guild': row[1],
+                    'rank': row[2],
+                    'score': row[3],
+                    'previous_score': row[4],
+                    'delta': row[5]
+                } for row in cursor.fetchall()]
+                
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors du calcul de la progression des scores : {e}")
+            raise
+    
+    def get_score_distribution(self, ranking_type: str = 'dreamland', days: int = 30) -> list:
+        """Récupère la répartition des scores de chaque jour.
+        
+        Args:
+            ranking_type: Type de classement
+            days: Nombre de jours à couvrir, jusqu'au classement le plus récent
+            
+        Returns:
+            Liste par date J-1 croissante : nombre de joueurs, score minimum,
+            maximum, moyen et total
+        """
+        try:
+            with self.connections.reader() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute("""
+                    SELECT 
+                        rd.date_j1,
+                        COUNT(*),
+                        MIN(r.score),
+                        MAX(r.score),
+                        AVG(r.score),
+                        SUM(r.score)
+                    FROM ranking_dates rd
+                    JOIN rankings r ON r.ranking_date_id = rd.id
+                    WHERE rd.type = ?
+                    AND rd.date_j1 > date(
+                        (SELECT MAX(date_j1) FROM ranking_dates WHERE type = ?), ?
+                    )
+                    GROUP BY rd.id
+                    ORDER BY rd.date_j1
+                """, (ranking_type, ranking_type, f"-{days} days"))
+                
+                return [{
+                    'date': row[0],
+                    'players': row[1],
+                    'min_score': row[2],
+                    'max_score': row[3],
+                    'avg_score': row[4],
+                    'total_score': row[5]
+                } for row in cursor.fetchall()]
+                
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors du calcul de la répartition des scores : {e}")
+            raise
+    
+    def get_score_curve(self, ranking_type: str = 'dreamland', days: int = 1, max_rank: int = 100) -> list:
+        """Récupère le score en fonction du rang.
+        
+        Args:
+            ranking_type: Type de classement
+            days: Nombre de jours moyennés, jusqu'au classement le plus récent
+            max_rank: Dernier rang de la courbe
+            
+        Returns:
+            Liste par rang croissant : score moyen, minimum et maximum sur la période
+        """
+        try:
+            with self.connections.reader() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute("""
+                    SELECT 
+                        r.rank,
+                        AVG(r.score),
+                        MIN(r.score),
+                        MAX(r.score)
+                    FROM ranking_dates rd
+                    JOIN rankings r ON r.ranking_date_id = rd.id
+                    WHERE rd.type = ?
+                    AND rd.date_j1 > date(
+                        (SELECT MAX(date_j1) FROM ranking_dates WHERE type = ?), ?
+                    )
+                    AND r.rank <= ?
+                    GROUP BY r.rank
+                    ORDER BY r.rank
+                """, (ranking_type, ranking_type, f"-{days} days", max_rank))
+                
+                return [{
+                    'rank': row[0],
+                    'avg_score': row[1],
+                    'min_score': row[2],
+                    'max_score': row[3]
+                } for row in cursor.fetchall()]
+                
+        except sqlite3.Error as e:
+            logger.error(f"Erreur lors du calcul de la courbe des scores : {e}")
+            raise
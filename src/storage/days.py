@@ -0,0 +1,44 @@
+"""
+Chaînage des jours de classement.
+
+Chaque ligne de `ranking_dates` pointe (`prev_id`) vers le classement
+précédent du même type. Comparer un classement à la veille se fait ainsi par
+une simple jointure sur `prev_id`, sans rechercher la date précédente.
+"""
+
+
+def link_ranking_days(conn, ranking_type=None):
+    """
+    Met à jour le chaînage des classements d'un type.
+
+    Tout le chaînage du type est recalculé : un jour repris ou dont la date
+    J-1 a changé peut modifier ses deux voisins. Une recherche indexée par
+    classement ; seules les lignes modifiées sont écrites. Ne valide pas la
+    transaction.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base
+        ranking_type (str, optional): Type de classement (défaut : tous)
+    """
+    query = """
+        UPDATE ranking_dates
+        SET prev_id = (
+            SELECT p.id FROM ranking_dates p
+            WHERE p.type = ranking_dates.type
+            AND p.date_j1 < ranking_dates.date_j1
+            ORDER BY p.date_j1 DESC
+            LIMIT 1
+        )
+        WHERE prev_id IS NOT (
+            SELECT p.id FROM ranking_dates p
+            WHERE p.type = ranking_dates.type
+            AND p.date_j1 < ranking_dates.date_j1
+            ORDER BY p.date_j1 DESC
+            LIMIT 1
+        )
+    """
+    params = ()
+    if ranking_type is not None:
+        query += " AND type = ?"
+        params = (ranking_type,)
+    conn.execute(query, params)
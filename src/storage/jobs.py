@@ -0,0 +1,105 @@
+"""
+Historique des captures planifiées.
+
+Chaque exécution du planificateur (`rank.scheduler`) est enregistrée dans
+`capture_jobs`, et chaque étape de chaque tentative (navigation, capture,
+reconnaissance, enregistrement) dans `capture_job_stages` avec sa durée et son
+erreur éventuelle.
+"""
+
+CREATE_JOBS = """
+    CREATE TABLE IF NOT EXISTS capture_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ranking_type TEXT NOT NULL,
+        scheduled_at TIMESTAMP,
+        started_at TIMESTAMP NOT NULL,
+        finished_at TIMESTAMP,
+        duration REAL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        players INTEGER,
+        error TEXT
+    )
+"""
+
+CREATE_STAGES = """
+    CREATE TABLE IF NOT EXISTS capture_job_stages (
+        job_id INTEGER NOT NULL REFERENCES capture_jobs (id),
+        attempt INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        stage TEXT NOT NULL,
+        started_at TIMESTAMP NOT NULL,
+        duration REAL NOT NULL,
+        status TEXT NOT NULL,
+        error TEXT,
+        PRIMARY KEY (job_id, attempt, position)
+    ) WITHOUT ROWID
+"""
+
+# États d'une capture et d'une étape
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+TIMEOUT = 'timeout'
+
+
+def start_job(conn, ranking_type, started_at, scheduled_at=None):
+    """
+    Enregistre le début d'une capture ; ne valide pas la transaction.
+
+    Returns:
+        int: Identifiant de la capture
+    """
+    cursor = conn.execute("""
+        INSERT INTO capture_jobs (ranking_type, scheduled_at, started_at, status)
+        VALUES (?, ?, ?, ?)
+    """, (ranking_type, scheduled_at, started_at, RUNNING))
+    return cursor.lastrowid
+
+
+def record_stage(conn, job_id, attempt, position, stage, started_at, duration, status, error=None):
+    """
+    Enregistre une étape d'une tentative ; ne valide pas la transaction.
+
+    `position` est le rang de l'étape dans la tentative (0 pour la première).
+    """
+    conn.execute("""
+        INSERT OR REPLACE INTO capture_job_stages (job_id, attempt, position, stage, started_at, duration, status, error)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, (job_id, attempt, position, stage, started_at, duration, status, error))
+
+
+def finish_job(conn, job_id, finished_at, duration, status, attempts, players=None, error=None):
+    """Enregistre la fin d'une capture ; ne valide pas la transaction."""
+    conn.execute("""
+        UPDATE capture_jobs
+        SET finished_at = ?, duration = ?, status = ?, attempts = ?, players = ?, error = ?
+        WHERE id = ?
+    """, (finished_at, duration, status, attempts, players, error, job_id))
+
+
+def job_history(conn, limit=20):
+    """
+    Dernières captures, de la plus récente à la plus ancienne.
+
+    Returns:
+        list: Captures avec leurs étapes (liste `stages`, par tentative)
+    """
+    columns = ['id', 'ranking_type', 'scheduled_at', 'started_at', 'finished_at', 'duration',
+               'status', 'attempts', 'players', 'error']
+    jobs = [dict(zip(columns, row)) for row in conn.execute(f"""
+        SELECT {', '.join(columns)}
+        FROM capture_jobs
+        ORDER BY id DESC
+        LIMIT ?
+    """, (limit,))]
+
+    stage_columns = ['attempt', 'stage', 'started_at', 'duration', 'status', 'error']
+    for job in jobs:
+        job['stages'] = [dict(zip(stage_columns, row)) for row in conn.execute(f"""
+            SELECT {', '.join(stage_columns)}
+            FROM capture_job_stages
+            WHERE job_id = ?
+            ORDER BY attempt, position
+        """, (job['id'],))]
+    return jobs
@@ -0,0 +1,294 @@
+"""
+Migrations du schéma de la base des classements.
+
+`_init_database` crée les tables d'origine ; les évolutions ultérieures du
+schéma sont décrites ici, numérotées, et appliquées une seule fois par base.
+Chaque migration s'exécute dans sa propre transaction et son numéro est
+enregistré dans `schema_migrations` avec sa durée. Les reconstructions de
+grandes tables se font par lots (voir `rebuild_table`) pour ne pas bloquer
+les lecteurs pendant toute la copie.
+
+Utilisation en ligne de commande :
+    python -m storage status
+    python -m storage migrate
+"""
+
+import time
+from loguru import logger
+
+from .cache import CREATE_TABLE as CREATE_DATA_VERSION
+from .days import link_ranking_days
+from .jobs import CREATE_JOBS, CREATE_STAGES
+from .scores import parse_score
+from .snapshots import CREATE_TABLE as CREATE_SNAPSHOTS, rebuild_snapshots
+from .stats import CREATE_TABLE as CREATE_RANK_STATS, rebuild_rank_stats
+
+# Migrations enregistrées, dans l'ordre des versions
+MIGRATIONS = []
+
+
+class Migration:
+    """Évolution numérotée du schéma."""
+
+    def __init__(self, version, name, apply, transactional=True):
+        """
+        Args:
+            version (int): Numéro de version, strictement croissant
+            name (str): Description
+            apply (callable): Fonction appliquant la migration à une connexion
+            transactional (bool): Exécuter la migration dans une seule
+                                  transaction ; False pour les migrations qui
+                                  valident elles-mêmes leurs lots
+        """
+        self.version = version
+        self.name = name
+        self.apply = apply
+        self.transactional = transactional
+
+    def __repr__(self):
+        return f"Migration({self.version}, {self.name!r})"
+
+
+def migration(version, name, transactional=True):
+    """Décorateur enregistrant une fonction de migration."""
+    def register(apply):
+        if any(m.version == version for m in MIGRATIONS):
+            raise ValueError(f"Migration {version} déjà définie")
+        MIGRATIONS.append(Migration(version, name, apply, transactional))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return apply
+    return register
+
+
+def _ensure_history(conn):
+    """Crée la table des versions appliquées."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            duration REAL
+        )
+    """)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(schema_migrations)")}
+    if 'duration' not in columns:
+        conn.execute("ALTER TABLE schema_migrations ADD COLUMN duration REAL")
+    conn.commit()
+
+
+def applied_versions(conn):
+    """Versions déjà appliquées à la base."""
+    _ensure_history(conn)
+    return {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+
+
+def status(conn):
+    """
+    État des migrations d'une base.
+
+    N'écrit pas dans la base : si `schema_migrations` n'existe pas encore,
+    toutes les migrations sont en attente.
+
+    Returns:
+        list: Dictionnaires {version, name, applied_at, duration} ; applied_at
+              vaut None pour une migration en attente
+    """
+    # Lecture seule : la table des versions n'est ni créée ni mise à jour
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(schema_migrations)")}
+    applied = {}
+    if columns:
+        duration = 'duration' if 'duration' in columns else 'NULL'
+        applied = {row[0]: row[1:] for row in conn.execute(
+            f"SELECT version, applied_at, {duration} FROM schema_migrations")}
+    return [{
+        'version': m.version,
+        'name': m.name,
+        'applied_at': applied.get(m.version, (None, None))[0],
+        'duration': applied.get(m.version, (None, None))[1]
+    } for m in MIGRATIONS]
+
+
+def migrate(conn, target=None):
+    """
+    Applique les migrations manquantes.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base
+        target (int): Dernière version à appliquer (par défaut : toutes)
+
+    Returns:
+        list: Versions appliquées par cet appel
+    """
+    done = applied_versions(conn)
+    applied = []
+    for m in MIGRATIONS:
+        if m.version in done or (target is not None and m.version > target):
+            continue
+
+        logger.info(f"Migration {m.version} : {m.name}...")
+        start = time.perf_counter()
+        try:
+            if m.transactional:
+                # Les instructions DDL n'ouvrent pas de transaction implicite
+                conn.execute("BEGIN")
+            m.apply(conn)
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            duration = time.perf_counter() - start
+            conn.execute("INSERT INTO schema_migrations (version, name, duration) VALUES (?, ?, ?)",
+                         (m.version, m.name, duration))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Échec de la migration {m.version} ({m.name}) : {e}")
+            raise
+
+        logger.info(f"Migration {m.version} appliquée en {duration:.2f} s")
+        applied.append(m.version)
+    return applied
+
+
+def rebuild_table(conn, table, create_sql, columns, expressions=None, indexes=(), batch_size=10000):
+    """
+    Reconstruit une table avec un nouveau schéma, par lots.
+
+    Les lignes sont copiées par tranches de `rowid` dans une table
+    `<table>_rebuild`, chaque tranche dans sa propre transaction, de sorte que
+    les lecteurs ne sont jamais bloqués plus d'un lot. Les lignes ajoutées
+    pendant la copie sont reprises au remplacement final (renommage, index),
+    qui se fait dans une seule transaction ; les lignes déjà copiées ne
+    doivent pas être modifiées entre-temps. Une reconstruction interrompue
+    reprend après la dernière tranche copiée.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base
+        table (str): Table à reconstruire
+        create_sql (str): CREATE TABLE de la nouvelle table, avec `{name}`
+                          à la place de son nom
+        columns (list): Colonnes de la nouvelle table à remplir (dont la clé)
+        expressions (list): Expressions SQL sur l'ancienne table produisant
+                            chaque colonne (par défaut : colonnes de même nom)
+        indexes (list): CREATE INDEX à recréer sur la nouvelle table
+        batch_size (int): Nombre de lignes par lot
+
+    Returns:
+        int: Nombre de lignes copiées
+    """
+    new_table = f"{table}_rebuild"
+    expressions = expressions or columns
+    if conn.in_transaction:
+        conn.commit()
+
+    conn.execute(create_sql.format(name=f"IF NOT EXISTS {new_table}"))
+    conn.commit()
+
+    total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    copy = f"""
+        INSERT INTO {new_table} (rowid, {', '.join(columns)})
+        SELECT rowid, {', '.join(expressions)} FROM {table}
+        WHERE rowid > ? ORDER BY rowid LIMIT ?
+    """
+    last = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {new_table}").fetchone()[0]
+    copied = conn.execute(f"SELECT COUNT(*) FROM {new_table}").fetchone()[0]
+    start = time.perf_counter()
+    while True:
+        conn.execute("BEGIN")
+        count = conn.execute(copy, (last, batch_size)).rowcount
+        conn.commit()
+        if count <= 0:
+            break
+        copied += count
+        last = conn.execute(f"SELECT MAX(rowid) FROM {new_table}").fetchone()[0]
+        logger.info(f"{table} : {copied}/{total} lignes copiées ({time.perf_counter() - start:.1f} s)")
+
+    # Remplacement atomique
+    conn.execute("BEGIN")
+    copied += max(0, conn.execute(copy, (last, -1)).rowcount)
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+    for statement in indexes:
+        conn.execute(statement)
+    logger.info(f"{table} reconstruite : {copied} lignes en {time.perf_counter() - start:.1f} s")
+    return copied
+
+
+@migration(1, "Index des requêtes de classement")
+def _ranking_indexes(conn):
+    # Dernier classement et classement précédent d'un type
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ranking_dates_type_date_j1 ON ranking_dates (type, date_j1)")
+    # Recherche d'une date J-1 tous types confondus
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ranking_dates_date_j1 ON ranking_dates (date_j1)")
+    # Historique d'un joueur
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_rankings_player ON rankings (player_id, ranking_date_id)")
+    # Membres d'une guilde
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_players_guild ON players (guild)")
+
+
+@migration(2, "Scores entiers", transactional=False)
+def _integer_scores(conn):
+    # Les scores étaient stockés tels que lus par l'OCR ("12M", "1234567")
+    conn.create_function('parse_score', 1, parse_score, deterministic=True)
+    rebuild_table(
+        conn, 'rankings',
+        create_sql="""
+            CREATE TABLE {name} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ranking_date_id INTEGER,
+                player_id INTEGER,
+                rank INTEGER NOT NULL,
+                score INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (ranking_date_id) REFERENCES ranking_dates (id),
+                FOREIGN KEY (player_id) REFERENCES players (id),
+                UNIQUE(ranking_date_id, rank)
+            )
+        """,
+        columns=['id', 'ranking_date_id', 'player_id', 'rank', 'score', 'created_at'],
+        expressions=['id', 'ranking_date_id', 'player_id', 'rank', 'parse_score(score)', 'created_at'],
+        indexes=[
+            "CREATE INDEX idx_rankings_player ON rankings (player_id, ranking_date_id)",
+            # Agrégats de scores par jour
+            "CREATE INDEX idx_rankings_date_score ON rankings (ranking_date_id, score)",
+        ]
+    )
+
+
+@migration(3, "Statistiques glissantes des rangs", transactional=False)
+def _rank_stats(conn):
+    conn.execute(CREATE_RANK_STATS)
+    rebuild_rank_stats(conn)
+    conn.execute("BEGIN")
+
+
+@migration(4, "Chaînage des jours de classement")
+def _ranking_day_chain(conn):
+    conn.execute("ALTER TABLE ranking_dates ADD COLUMN prev_id INTEGER REFERENCES ranking_dates (id)")
+    link_ranking_days(conn)
+    # Le classement précédent ne se recherche plus par date J-1 seule
+    conn.execute("DROP INDEX IF EXISTS idx_ranking_dates_date_j1")
+
+
+@migration(5, "Version des données pour le cache des requêtes")
+def _data_version(conn):
+    conn.execute(CREATE_DATA_VERSION)
+    conn.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+
+
+@migration(6, "Instantanés des classements journaliers")
+def _leaderboard_snapshots(conn):
+    conn.execute(CREATE_SNAPSHOTS)
+    rebuild_snapshots(conn)
+
+
+@migration(7, "Historique des captures planifiées")
+def _capture_jobs(conn):
+    conn.execute(CREATE_JOBS)
+    conn.execute(CREATE_STAGES)
+
+
+@migration(8, "Instantanés réduits aux pages affichées")
+def _snapshot_pages(conn):
+    # Les instantanés sont dérivés des classements : recréés sans la liste complète des joueurs
+    conn.execute("DROP TABLE IF EXISTS leaderboard_snapshots")
+    conn.execute(CREATE_SNAPSHOTS)
+    rebuild_snapshots(conn)
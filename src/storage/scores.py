@@ -0,0 +1,31 @@
+"""
+Conversion des scores lus par l'OCR en entiers.
+"""
+
+# Suffixes d'abréviation affichés par le jeu pour les grands scores
+SUFFIXES = {'M': 1_000_000}
+
+
+def parse_score(text):
+    """
+    Convertit un score lu par l'OCR en entier.
+
+    Les caractères parasites sont ignorés ; un suffixe M en fin de score
+    multiplie la valeur : "12M" donne 12 000 000.
+
+    Args:
+        text (str|int): Score brut
+
+    Returns:
+        int: Score, 0 si aucun chiffre n'a été lu
+    """
+    if text is None:
+        return 0
+    if isinstance(text, int):
+        return text
+
+    text = str(text).strip().upper()
+    digits = ''.join(filter(str.isdigit, text))
+    if not digits:
+        return 0
+    return int(digits) * SUFFIXES.get(text[-1], 1)
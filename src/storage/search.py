@@ -0,0 +1,104 @@
+"""
+Recherche approchée des noms de joueurs et de guildes.
+
+Les noms enregistrés sont lus par l'OCR et contiennent des confusions de
+caractères (0 et O, l et I...) : une recherche exacte échoue souvent. Les noms
+sont normalisés (casse, accents, caractères confondus par l'OCR) puis
+découpés en trigrammes ; un index inversé donne, en quelques millisecondes,
+les noms partageant le plus de trigrammes avec la recherche, classés par
+similarité.
+
+L'index est construit en mémoire : le tokenizer trigram de FTS5 n'existe pas
+dans le SQLite livré avec Python 3.8 sous Windows.
+"""
+
+import heapq
+import unicodedata
+from collections import Counter, defaultdict
+
+# Caractères que l'OCR confond, ramenés à un représentant
+OCR_CONFUSIONS = str.maketrans({
+    '0': 'o',
+    '1': 'l',
+    'i': 'l',
+    '|': 'l',
+    '5': 's',
+    '8': 'b',
+})
+
+# Similarité minimale d'un résultat (0 à 1)
+MIN_SIMILARITY = 0.2
+# Candidats évalués par résultat demandé
+SHORTLIST_FACTOR = 20
+
+
+def search_key(name):
+    """
+    Forme normalisée d'un nom pour la recherche.
+
+    Exemple : "Élodie_01" donne "elodle_ol".
+    """
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.lower().translate(OCR_CONFUSIONS).split())
+
+
+def trigrams(key):
+    """Trigrammes d'une clé, bornés par des espaces (un mot court en a aussi)."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Index inversé de trigrammes sur une liste de noms."""
+
+    def __init__(self, names):
+        """
+        Args:
+            names (iterable): Noms à indexer (doublons ignorés)
+        """
+        self.names = sorted(set(name for name in names if name))
+        self._keys = [search_key(name) for name in self.names]
+        self._trigrams = []
+        self._postings = defaultdict(list)
+        for position, key in enumerate(self._keys):
+            grams = trigrams(key)
+            self._trigrams.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(position)
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, query, limit=10, min_similarity=MIN_SIMILARITY):
+        """
+        Noms les plus proches d'une recherche.
+
+        La similarité est le coefficient de Jaccard des trigrammes ; un nom
+        qui commence par la recherche passe devant à similarité égale.
+
+        Returns:
+            list: Tuples (nom, similarité) par similarité décroissante
+        """
+        key = search_key(query)
+        if not key:
+            return []
+        grams = trigrams(key)
+
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        # Une ou deux lettres : tous les noms qui commencent ainsi
+        if len(key) < 3:
+            min_similarity = 0
+
+        # Similarité exacte sur les noms partageant le plus de trigrammes
+        results = []
+        for position, count in shared.most_common(limit * SHORTLIST_FACTOR):
+            similarity = count / (len(grams) + self._trigrams[position] - count)
+            if similarity >= min_similarity:
+                results.append((similarity, position))
+
+        best = heapq.nsmallest(limit, results, key=lambda r: (
+            -r[0], not self._keys[r[1]].startswith(key), self.names[r[1]]))
+        return [(self.names[position], round(similarity, 3)) for similarity, position in best]
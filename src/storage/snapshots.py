@@ -0,0 +1,200 @@
+"""
+Instantanés des classements journaliers.
+
+À l'enregistrement d'un jour, les `DISPLAY_LIMIT` premiers joueurs (évolution
+du rang depuis le classement précédent, moyenne sur 30 jours) sont calculés une
+fois et conservés dans `leaderboard_snapshots` sous forme des tableaux déjà mis
+en forme des pages affichées par le bot, avec le nombre de joueurs classés. Le
+bot sert ensuite le classement sans requête d'agrégation ni mise en forme.
+
+Le classement complet n'est pas sérialisé : les vues filtrées (guilde) et les
+pages au-delà des pages affichées le calculent à la demande (`build_snapshot`).
+
+Seuls les `KEEP_DAYS` derniers jours de chaque type sont conservés ; un jour
+plus ancien est recalculé à la demande (`build_snapshot`) sans être écrit.
+"""
+
+import json
+
+# Joueurs affichés par page et nombre de joueurs affichés
+PAGE_SIZE = 25
+DISPLAY_LIMIT = 100
+# Jours conservés par type de classement
+KEEP_DAYS = 7
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS leaderboard_snapshots (
+        ranking_date_id INTEGER PRIMARY KEY REFERENCES ranking_dates (id),
+        player_count INTEGER NOT NULL,
+        pages TEXT NOT NULL
+    )
+"""
+
+
+def format_table(players):
+    """
+    Tableau texte d'une page de classement (bloc de code Discord).
+
+    Args:
+        players (list): Joueurs avec rank, name, guild, rank_change et avg_rank
+    """
+    table = "```\n"
+    # En-tête avec alignement
+    table += "Rang    Joueur          Guilde        J-1    Moy30j\n"
+    table += "─" * 50 + "\n"
+
+    for player in players:
+        # Rang (4 caractères + 2 espaces), nom (15) et guilde (12)
+        rank = str(player['rank']).rjust(4) + "  "
+        name = player['name'][:15].ljust(15)
+        guild = (player['guild'] or 'Sans')[:12].ljust(12)
+
+        # Changement de rang (6 caractères)
+        if player['rank_change'] > 0:
+            rank_change = f"(+{player['rank_change']})".rjust(6)
+        elif player['rank_change'] < 0:
+            rank_change = f"({player['rank_change']})".rjust(6)
+        else:
+            rank_change = "(=)".rjust(6)
+
+        # Moyenne (6 caractères)
+        avg_rank = str(int(float(player['avg_rank']))).rjust(6)
+
+        table += f"{rank}{name}{guild}{rank_change}  {avg_rank}\n"
+
+    table += "```"
+    return table
+
+
+def format_pages(players, limit=DISPLAY_LIMIT, page_size=PAGE_SIZE):
+    """Tableaux des pages affichées : les `limit` premiers joueurs par `page_size`."""
+    shown = players[:limit]
+    return [format_table(shown[i:i + page_size]) for i in range(0, len(shown), page_size)]
+
+
+def build_snapshot(conn, ranking_date_id, limit=None):
+    """
+    Calcule le classement d'un jour.
+
+    Args:
+        limit (int): Nombre de premiers joueurs à calculer (défaut : tous)
+
+    Returns:
+        dict: date (J-1), players (joueurs par rang croissant) et pages
+    """
+    day = conn.execute("SELECT date_j1, prev_id FROM ranking_dates WHERE id = ?", (ranking_date_id,)).fetchone()
+    if day is None:
+        return None
+    rows = [
+        {'rank': row[0], 'name': row[1], 'guild': row[2], 'rank_change': row[3], 'avg_rank': row[4]}
+        for row in conn.execute("""
+            SELECT
+                r.rank,
+                p.name,
+                p.guild,
+                COALESCE(prev_r.rank - r.rank, 0),
+                COALESCE(CAST(s.rank_sum AS REAL) / s.rank_count, r.rank)
+            FROM (
+                -- Les joueurs sont limités avant les jointures
+                SELECT ranking_date_id, player_id, rank
+                FROM rankings
+                WHERE ranking_date_id = ?
+                ORDER BY rank
+                LIMIT ?
+            ) r
+            JOIN players p ON r.player_id = p.id
+            LEFT JOIN rankings prev_r ON prev_r.player_id = r.player_id
+                AND prev_r.ranking_date_id = ?
+            LEFT JOIN player_rank_stats s ON s.ranking_date_id = r.ranking_date_id
+                AND s.player_id = r.player_id
+            ORDER BY r.rank
+        """, (ranking_date_id, -1 if limit is None else limit, day[1]))
+    ]
+    return {'date': day[0], 'players': rows, 'pages': format_pages(rows)}
+
+
+def _write_snapshot(conn, ranking_date_id):
+    snapshot = build_snapshot(conn, ranking_date_id, DISPLAY_LIMIT)
+    count = conn.execute("SELECT COUNT(*) FROM rankings WHERE ranking_date_id = ?", (ranking_date_id,)).fetchone()[0]
+    conn.execute("""
+        INSERT OR REPLACE INTO leaderboard_snapshots (ranking_date_id, player_count, pages)
+        VALUES (?, ?, ?)
+    """, (ranking_date_id, count, json.dumps(snapshot['pages'], ensure_ascii=False)))
+
+
+def publish_snapshot(conn, ranking_date_id):
+    """
+    Écrit les pages d'un jour qui vient d'être enregistré ; ne valide pas la
+    transaction.
+
+    Les instantanés des jours suivants du même type (évolution du rang et
+    moyennes modifiées par une reprise) et ceux au-delà de `KEEP_DAYS` jours
+    sont supprimés.
+    """
+    conn.execute("""
+        DELETE FROM leaderboard_snapshots
+        WHERE ranking_date_id IN (
+            SELECT later.id
+            FROM ranking_dates day
+            JOIN ranking_dates later ON later.type = day.type AND later.date_j1 > day.date_j1
+            WHERE day.id = ?
+        )
+    """, (ranking_date_id,))
+
+    _write_snapshot(conn, ranking_date_id)
+
+    conn.execute("""
+        DELETE FROM leaderboard_snapshots
+        WHERE ranking_date_id IN (
+            SELECT rd.id
+            FROM ranking_dates day
+            JOIN ranking_dates rd ON rd.type = day.type
+            WHERE day.id = ?
+            ORDER BY rd.date_j1 DESC
+            LIMIT -1 OFFSET ?
+        )
+    """, (ranking_date_id, KEEP_DAYS))
+
+
+def load_pages(conn, ranking_date_id):
+    """
+    Pages d'un jour, sans décoder les joueurs.
+
+    Returns:
+        dict: date (J-1), count (nombre de joueurs) et pages, ou None si le
+              jour n'existe pas
+    """
+    row = conn.execute("""
+        SELECT rd.date_j1, s.player_count, s.pages
+        FROM leaderboard_snapshots s
+        JOIN ranking_dates rd ON rd.id = s.ranking_date_id
+        WHERE s.ranking_date_id = ?
+    """, (ranking_date_id,)).fetchone()
+    if row is None:
+        snapshot = build_snapshot(conn, ranking_date_id)
+        if snapshot is None:
+            return None
+        return {'date': snapshot['date'], 'count': len(snapshot['players']), 'pages': snapshot['pages']}
+    return {'date': row[0], 'count': row[1], 'pages': json.loads(row[2])}
+
+
+def rebuild_snapshots(conn):
+    """
+    Recalcule les instantanés des `KEEP_DAYS` derniers jours de chaque type ;
+    ne valide pas la transaction.
+
+    Returns:
+        int: Nombre d'instantanés écrits
+    """
+    conn.execute("DELETE FROM leaderboard_snapshots")
+    days = [row[0] for row in conn.execute("""
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY type ORDER BY date_j1 DESC) AS age
+            FROM ranking_dates
+        )
+        WHERE age <= ?
+        ORDER BY id
+    """, (KEEP_DAYS,))]
+    for ranking_date_id in days:
+        _write_snapshot(conn, ranking_date_id)
+    return len(days)
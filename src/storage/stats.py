@@ -0,0 +1,177 @@
+"""
+Statistiques glissantes des rangs des joueurs.
+
+`player_rank_stats` conserve, pour chaque classement et chaque joueur classé
+ce jour-là, la somme, le nombre, le meilleur et le pire de ses rangs sur les
+`WINDOW_DAYS` derniers jours. Les lectures n'ont plus à agréger l'historique :
+la moyenne d'un joueur à une date est une simple recherche par clé.
+"""
+
+import time
+from loguru import logger
+
+# Période couverte par les statistiques glissantes
+WINDOW_DAYS = 30
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS player_rank_stats (
+        ranking_date_id INTEGER NOT NULL,
+        player_id INTEGER NOT NULL,
+        rank_sum INTEGER NOT NULL,
+        rank_count INTEGER NOT NULL,
+        best_rank INTEGER NOT NULL,
+        worst_rank INTEGER NOT NULL,
+        PRIMARY KEY (ranking_date_id, player_id)
+    ) WITHOUT ROWID
+"""
+
+
+def _refresh_day(conn, ranking_date_id):
+    """
+    Recalcule les statistiques d'un classement.
+
+    Les statistiques d'un joueur sont déduites de celles du classement
+    précédent du même type : on ajoute le rang du jour et on retire les rangs
+    des jours sortis de la période. Si un rang retiré était le meilleur ou le
+    pire de la période, ou si le joueur n'avait pas de statistiques la veille,
+    ses statistiques sont recalculées à partir des jours de la période.
+
+    Un nom lu à plusieurs rangs le même jour (doublon d'OCR) compte pour
+    chacun de ses rangs : les rangs du jour sont d'abord agrégés par joueur.
+    """
+    window = f"-{WINDOW_DAYS} days"
+    conn.execute("DELETE FROM player_rank_stats WHERE ranking_date_id = ?", (ranking_date_id,))
+
+    # Mise à jour incrémentale à partir de la veille
+    conn.execute("""
+        WITH day AS (
+            SELECT id, type, date_j1 FROM ranking_dates WHERE id = ?
+        ),
+        today AS (
+            SELECT player_id, SUM(rank) as rank_sum, COUNT(*) as rank_count,
+                   MIN(rank) as best_rank, MAX(rank) as worst_rank
+            FROM rankings
+            WHERE ranking_date_id = (SELECT id FROM day)
+            GROUP BY player_id
+        ),
+        previous_day AS (
+            SELECT rd.id, rd.date_j1
+            FROM ranking_dates rd, day
+            WHERE rd.type = day.type
+            AND rd.date_j1 < day.date_j1
+            ORDER BY rd.date_j1 DESC
+            LIMIT 1
+        ),
+        dropped_days AS (
+            SELECT rd.id
+            FROM ranking_dates rd, day, previous_day
+            WHERE rd.type = day.type
+            AND rd.date_j1 > date(previous_day.date_j1, ?)
+            AND rd.date_j1 <= date(day.date_j1, ?)
+        ),
+        dropped AS (
+            SELECT w.player_id, SUM(w.rank) as rank_sum, COUNT(*) as rank_count,
+                   MIN(w.rank) as best_rank, MAX(w.rank) as worst_rank
+            FROM dropped_days dd
+            CROSS JOIN rankings w ON w.ranking_date_id = dd.id
+            GROUP BY w.player_id
+        )
+        INSERT INTO player_rank_stats
+            (ranking_date_id, player_id, rank_sum, rank_count, best_rank, worst_rank)
+        SELECT 
+            (SELECT id FROM day),
+            t.player_id,
+            ps.rank_sum + t.rank_sum - COALESCE(d.rank_sum, 0),
+            ps.rank_count + t.rank_count - COALESCE(d.rank_count, 0),
+            MIN(ps.best_rank, t.best_rank),
+            MAX(ps.worst_rank, t.worst_rank)
+        FROM today t
+        JOIN player_rank_stats ps ON ps.ranking_date_id = (SELECT id FROM previous_day)
+            AND ps.player_id = t.player_id
+        LEFT JOIN dropped d ON d.player_id = t.player_id
+        WHERE (d.player_id IS NULL OR (d.best_rank > ps.best_rank AND d.worst_rank < ps.worst_rank))
+    """, (ranking_date_id, window, window))
+
+    # Recalcul sur la période pour les autres joueurs du jour ; CROSS JOIN
+    # impose de partir des quelques joueurs restants plutôt que des jours
+    conn.execute("""
+        WITH day AS (
+            SELECT id, type, date_j1 FROM ranking_dates WHERE id = ?
+        ),
+        today AS (
+            SELECT DISTINCT player_id
+            FROM rankings
+            WHERE ranking_date_id = (SELECT id FROM day)
+        ),
+        window_days AS (
+            SELECT rd.id
+            FROM ranking_dates rd, day
+            WHERE rd.type = day.type
+            AND rd.date_j1 > date(day.date_j1, ?)
+            AND rd.date_j1 <= day.date_j1
+        )
+        INSERT INTO player_rank_stats
+            (ranking_date_id, player_id, rank_sum, rank_count, best_rank, worst_rank)
+        SELECT (SELECT id FROM day), t.player_id, SUM(w.rank), COUNT(*), MIN(w.rank), MAX(w.rank)
+        FROM today t
+        CROSS JOIN window_days wd
+        JOIN rankings w ON w.player_id = t.player_id AND w.ranking_date_id = wd.id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM player_rank_stats s
+            WHERE s.ranking_date_id = (SELECT id FROM day) AND s.player_id = t.player_id
+        )
+        GROUP BY t.player_id
+    """, (ranking_date_id, window))
+
+
+def refresh_rank_stats(conn, ranking_date_id):
+    """
+    Met à jour les statistiques après l'enregistrement d'un classement.
+
+    Le classement est recalculé, ainsi que les classements suivants du même
+    type dont la période le couvre (reprise d'un jour passé), dans l'ordre
+    chronologique. Le coût ne dépend pas de la longueur de l'historique.
+    Ne valide pas la transaction.
+
+    Args:
+        conn (sqlite3.Connection): Connexion à la base
+        ranking_date_id (int): Classement ajouté ou modifié
+    """
+    affected = [row[0] for row in conn.execute("""
+        SELECT later.id
+        FROM ranking_dates day
+        JOIN ranking_dates later ON later.type = day.type
+            AND later.date_j1 >= day.date_j1
+            AND later.date_j1 < date(day.date_j1, ?)
+        WHERE day.id = ?
+        ORDER BY later.date_j1
+    """, (f"+{WINDOW_DAYS} days", ranking_date_id))]
+
+    for day_id in affected:
+        _refresh_day(conn, day_id)
+
+
+def rebuild_rank_stats(conn):
+    """
+    Recalcule toutes les statistiques à partir de l'historique brut.
+
+    Les classements sont recalculés dans l'ordre chronologique et validés
+    séparément.
+
+    Returns:
+        int: Nombre de classements recalculés
+    """
+    start = time.perf_counter()
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("DELETE FROM player_rank_stats")
+    conn.commit()
+
+    day_ids = [row[0] for row in conn.execute("SELECT id FROM ranking_dates ORDER BY type, date_j1")]
+    for day_id in day_ids:
+        _refresh_day(conn, day_id)
+        conn.commit()
+
+    logger.info(f"Statistiques des rangs recalculées : {len(day_ids)} classements "
+                f"en {time.perf_counter() - start:.1f} s")
+    return len(day_ids)
@@ -0,0 +1,214 @@
+"""
+Charge du bot : interactions /royaumeonirique simultanées.
+
+Des centaines d'interactions simulées sont lancées en même temps sur les
+commandes réelles du bot (arbre de commandes et interactions factices), sur
+une base de 10 000 joueurs par jour. Une tâche mesure pendant ce temps le
+retard de la boucle d'événements. Le script compare les requêtes exécutées
+directement sur la boucle (ancien comportement) à la façade asynchrone, sans
+puis avec le cache des requêtes, dont il affiche le taux de succès.
+
+Utilisation :
+    python -m tests.bench_bot [interactions] [nombre_de_joueurs] [nombre_de_jours]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from loguru import logger
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from bot.commands import RankingCommands
+from storage.aio import AsyncRankDatabase
+from storage.database import RankDatabase
+from tests.bench_concurrency import percentile
+from tests.helpers import synthetic_rankings
+
+
+class FakeCommand:
+    """Commande enregistrée : sa fonction et ses autocomplétions."""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.autocompletes = {}
+
+    def autocomplete(self, name):
+        def register(callback):
+            self.autocompletes[name] = callback
+            return callback
+        return register
+
+    async def __call__(self, interaction, **kwargs):
+        return await self.callback(interaction, **kwargs)
+
+
+class FakeTree:
+    """Arbre de commandes qui conserve les fonctions des commandes."""
+
+    def __init__(self):
+        self.commands = {}
+
+    def command(self, name, description):
+        def register(callback):
+            self.commands[name] = FakeCommand(callback)
+            return self.commands[name]
+        return register
+
+
+class FakeBot:
+    def __init__(self):
+        self.tree = FakeTree()
+
+
+class FakeResponse:
+    def __init__(self):
+        self.edited = []
+
+    async def defer(self):
+        await asyncio.sleep(0)
+
+    async def edit_message(self, embed=None, view=None):
+        await asyncio.sleep(0.001)
+        self.edited.append(embed)
+
+    async def send_message(self, embed=None, ephemeral=False):
+        await asyncio.sleep(0.001)
+
+
+class FakeMessage:
+    async def edit(self, view=None):
+        await asyncio.sleep(0.001)
+
+
+class FakeFollowup:
+    def __init__(self):
+        self.sent = []
+        self.views = []
+
+    async def send(self, embed=None, file=None, view=None, wait=False):
+        # Aller-retour réseau simulé
+        await asyncio.sleep(0.001)
+        self.sent.append(embed)
+        self.views.append(view)
+        return FakeMessage() if wait else None
+
+
+class FakeInteraction:
+    """Interaction Discord réduite à ce qu'utilisent les commandes."""
+
+    def __init__(self):
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
+
+
+class BlockingDatabase:
+    """Requêtes exécutées directement sur la boucle, comme avant la façade."""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_leaderboard_page(self, *args, **kwargs):
+        return self.db.get_leaderboard_page(*args, **kwargs)
+
+    async def get_player_history(self, *args, **kwargs):
+        return self.db.get_player_history(*args, **kwargs)
+
+
+def ranking_commands(db):
+    """Commandes du bot enregistrées sur un arbre factice."""
+    commands = RankingCommands(FakeBot(), db=db)
+    commands.setup()
+    return commands
+
+
+async def measure_lag(stop, lags, interval=0.005):
+    """Retard de réveil de la boucle par rapport à l'intervalle demandé."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def load(commands, num_interactions, seed=0):
+    """
+    Lance les interactions simultanément.
+
+    Returns:
+        tuple: (latences des interactions, retards de la boucle) en s
+    """
+    rng = random.Random(seed)
+    command = commands.bot.tree.commands['royaumeonirique']
+
+    async def interaction(kwargs):
+        start = time.perf_counter()
+        fake = FakeInteraction()
+        await command(fake, **kwargs)
+        assert fake.followup.sent
+        return time.perf_counter() - start
+
+    requests = []
+    for _ in range(num_interactions):
+        draw = rng.random()
+        if draw < 0.5:
+            requests.append({'guilde': f"Guilde{rng.randrange(300)}"})
+        elif draw < 0.75:
+            requests.append({})
+        else:
+            requests.append({'joueur': f"Joueur{rng.randrange(1000)}"})
+
+    stop, lags = asyncio.Event(), []
+    monitor = asyncio.create_task(measure_lag(stop, lags))
+    await asyncio.sleep(0.05)
+    latencies = await asyncio.gather(*(interaction(kwargs) for kwargs in requests))
+    stop.set()
+    await monitor
+    return latencies, lags
+
+
+def main():
+    num_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    num_players = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    num_days = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rankings.db')
+        db = RankDatabase(path, cache_size=0)
+        for current, date_j1, players in synthetic_rankings(num_players, num_days):
+            db.save_ranking('dreamland', players, current, date_j1)
+
+        commands = ranking_commands(db)
+        cached = AsyncRankDatabase(RankDatabase(path))
+        modes = (
+            ('Sur la boucle', BlockingDatabase(db)),
+            ('Pool de threads', commands.db),
+            ('Pool + cache', cached),
+        )
+
+        print(f"\n{num_interactions} interactions, {num_players} joueurs, {num_days} jours")
+        print(f"{'':<18}{'durée':>8}{'interaction p50':>17}{'p95':>9}{'retard boucle p50':>19}{'p99':>9}{'max':>9}")
+        print("─" * 89)
+        for name, database in modes:
+            commands.db = database
+            start = time.perf_counter()
+            latencies, lags = asyncio.run(load(commands, num_interactions))
+            total = time.perf_counter() - start
+            ms = [latency * 1000 for latency in latencies]
+            lag = [value * 1000 for value in lags]
+            print(f"{name:<18}{total:>7.2f}s{percentile(ms, 50):>15.1f}ms{percentile(ms, 95):>7.1f}ms"
+                  f"{percentile(lag, 50):>17.1f}ms{percentile(lag, 99):>7.1f}ms{max(lag):>7.1f}ms")
+
+        stats = cached.db.cache.stats()
+        print(f"Cache : {stats['hits']} succès, {stats['misses']} échecs "
+              f"(taux {stats['hit_rate']:.0%}), {stats['saved_seconds']:.2f} s de requêtes évitées")
+        modes[1][1].close()
+        cached.close()
+
+
+if __name__ == "__main__":
+    main()
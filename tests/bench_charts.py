@@ -0,0 +1,129 @@
+"""
+Rendu des graphiques de /progression sous charge.
+
+Des demandes de graphiques simultanées sont lancées sur la boucle
+d'événements pendant qu'une tâche mesure son retard. Le script compare
+l'ancien rendu pyplot exécuté sur la boucle, le rendu objet (Figure et Agg)
+sur la boucle, et le pool de processus de `ChartRenderer`, et affiche le débit
+en graphiques par seconde et les latences.
+
+Utilisation :
+    python -m tests.bench_charts [demandes] [workers]
+"""
+
+import asyncio
+import io
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+from loguru import logger
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from bot.charts import ChartRenderer, render_progression
+from tests.bench_bot import measure_lag
+from tests.bench_concurrency import percentile
+
+
+def pyplot_progression(player_name, history):
+    """Rendu d'origine avec l'état global de pyplot (référence)."""
+    import matplotlib.pyplot as plt
+    from matplotlib.dates import DateFormatter
+    from matplotlib.ticker import MultipleLocator
+
+    plt.figure(figsize=(10, 6))
+    plt.style.use('dark_background')
+    dates = [datetime.strptime(entry['date'], "%Y-%m-%d") for entry in reversed(history)]
+    ranks = [entry['rank'] for entry in reversed(history)]
+    plt.plot(dates, ranks, 'b-', marker='o')
+    plt.gca().invert_yaxis()
+    plt.ylim(100.5, 0.5)
+    plt.gca().yaxis.set_major_locator(MultipleLocator(10))
+    plt.title(f"Progression de {player_name} - Royaume Onirique", color='white', pad=20)
+    plt.xlabel("Date", color='white')
+    plt.ylabel("Rang", color='white')
+    plt.grid(True, linestyle='--', alpha=0.3)
+    plt.gca().xaxis.set_major_formatter(DateFormatter('%d/%m'))
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format='png', facecolor='#2f3136')
+    plt.close()
+    return buffer.getvalue()
+
+
+class OnLoop:
+    """Rendu exécuté directement dans la coroutine."""
+
+    def __init__(self, render):
+        self.render = render
+
+    async def progression(self, player_name, history):
+        return self.render(player_name, history)
+
+
+def synthetic_history(index, days=10):
+    """Historique de 10 jours d'un joueur fictif, du plus récent au plus ancien."""
+    start = date(2024, 1, 1)
+    return [{'date': (start + timedelta(days=days - d)).isoformat(), 'rank': (index * 7 + d * 13) % 100 + 1}
+            for d in range(days)]
+
+
+async def load(renderer, num_requests):
+    """
+    Lance les demandes simultanément.
+
+    Returns:
+        tuple: (durée totale, latences des rendus, retards de la boucle) en s
+    """
+    # Latence depuis l'envoi commun de toutes les demandes
+    async def request(index):
+        chart = await renderer.progression(f"Joueur{index}", synthetic_history(index))
+        assert chart[:4] == b'\x89PNG'
+        return time.perf_counter() - start
+
+    stop, lags = asyncio.Event(), []
+    monitor = asyncio.create_task(measure_lag(stop, lags))
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(request(i) for i in range(num_requests)))
+    total = time.perf_counter() - start
+    stop.set()
+    await monitor
+    return total, latencies, lags
+
+
+def main():
+    num_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    logger.remove()
+
+    import matplotlib
+    matplotlib.use('Agg')
+    pool = ChartRenderer(workers=workers)
+    pool.warm_up()
+    modes = (
+        ('pyplot sur la boucle', OnLoop(pyplot_progression)),
+        ('Figure sur la boucle', OnLoop(render_progression)),
+        (f'Pool ({pool.workers} workers)', pool),
+    )
+    # Premier rendu hors mesure (polices) pour les modes sur la boucle
+    pyplot_progression("Préchauffage", synthetic_history(0))
+    render_progression("Préchauffage", synthetic_history(0))
+
+    print(f"\n{num_requests} graphiques demandés simultanément, {os.cpu_count()} cœur(s)")
+    print(f"{'':<22}{'débit':>12}{'latence p50':>14}{'p99':>9}{'retard boucle p99':>20}{'max':>9}")
+    print("─" * 86)
+    for name, renderer in modes:
+        total, latencies, lags = asyncio.run(load(renderer, num_requests))
+        ms = [latency * 1000 for latency in latencies]
+        lag = [value * 1000 for value in lags]
+        print(f"{name:<22}{num_requests / total:>7.1f} gr/s{percentile(ms, 50):>12.0f}ms{percentile(ms, 99):>7.0f}ms"
+              f"{percentile(lag, 99):>18.1f}ms{max(lag):>7.1f}ms")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
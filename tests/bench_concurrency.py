@@ -0,0 +1,106 @@
+"""
+Lectures concurrentes pendant l'enregistrement de classements.
+
+Des threads lecteurs interrogent la base (dernier classement, historique d'un
+joueur) pendant que le thread principal ingère des classements de 10 000
+joueurs. Le script compare le journal classique (DELETE), où l'écriture bloque
+les lectures, au mode WAL, et affiche les percentiles de latence des lectures
+ainsi que le nombre d'erreurs "database is locked".
+
+Utilisation :
+    python -m tests.bench_concurrency [lecteurs] [nombre_de_joueurs] [nombre_de_jours]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from loguru import logger
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from storage.database import RankDatabase
+from tests.helpers import synthetic_rankings
+
+
+def percentile(values, q):
+    """Percentile q (0-100) d'une liste de valeurs."""
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+def run(db, days, num_readers, history=2):
+    """
+    Ingère les classements pendant que des lecteurs interrogent la base.
+
+    Les `history` premiers jours sont enregistrés avant le démarrage des
+    lecteurs pour qu'ils aient des données à lire.
+
+    Returns:
+        tuple: (latences des lectures en s, erreurs de verrouillage, durée de l'ingestion en s)
+    """
+    for current, date_j1, players in days[:history]:
+        db.save_ranking('dreamland', players, current, date_j1)
+
+    latencies, errors = [], []
+    stop = threading.Event()
+
+    def reader(index):
+        name = f"Joueur{index}"
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                db.get_latest_ranking(limit=100)
+                db.get_player_history(name, limit=30)
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+                continue
+            latencies.append(time.perf_counter() - start)
+            # Une commande du bot toutes les quelques millisecondes par lecteur
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(num_readers)]
+    for thread in threads:
+        thread.start()
+    start = time.perf_counter()
+    for current, date_j1, players in days[history:]:
+        db.save_ranking('dreamland', players, current, date_j1)
+    ingest = time.perf_counter() - start
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, ingest
+
+
+def main():
+    num_readers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    num_players = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    num_days = int(sys.argv[3]) if len(sys.argv) > 3 else 6
+    days = synthetic_rankings(num_players, num_days)
+    logger.remove()
+
+    print(f"\n{num_readers} lecteurs, {num_players} joueurs, {num_days - 2} jours ingérés")
+    print(f"{'Journal':<10}{'lectures':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'erreurs':>9}{'ingestion':>11}")
+    print("─" * 75)
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('DELETE', 'WAL'):
+            # Délai court : un lecteur bloqué échoue au lieu d'attendre la fin de l'ingestion
+            db = RankDatabase(os.path.join(tmp, f"{mode}.db"), readers=num_readers)
+            db.connections.timeout = 0.5
+            db.conn.execute(f"PRAGMA journal_mode = {mode}")
+            latencies, errors, ingest = run(db, days, num_readers)
+            db.close()
+
+            ms = [latency * 1000 for latency in latencies]
+            print(f"{mode:<10}{len(ms):>9}{percentile(ms, 50):>7.1f}ms{percentile(ms, 95):>7.1f}ms"
+                  f"{percentile(ms, 99):>7.1f}ms{max(ms, default=float('nan')):>7.1f}ms"
+                  f"{len(errors):>9}{ingest:>10.2f}s")
+
+
+if __name__ == "__main__":
+    main()
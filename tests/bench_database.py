@@ -0,0 +1,99 @@
+"""
+Comparaison de l'enregistrement d'un classement : joueur par joueur ou en bloc.
+
+Chaque implémentation ingère les mêmes classements synthétiques de 10 000
+joueurs sur plusieurs jours (nouveaux joueurs, changements de guilde) dans une
+base vierge. Le script affiche le temps par jour et vérifie que les deux bases
+obtenues ont le même contenu.
+
+L'enregistrement en bloc calcule aussi les moyennes glissantes et l'instantané
+du jour, que l'implémentation historique ne faisait pas : ces deux étapes sont
+mesurées à part et l'accélération ne compare que l'enregistrement des joueurs.
+
+Utilisation :
+    python -m tests.bench_database [nombre_de_joueurs] [nombre_de_jours]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from functools import wraps
+from loguru import logger
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import storage.database
+from storage.database import RankDatabase
+from tests.helpers import dump, save_ranking_per_player, synthetic_rankings
+
+
+# Étapes de `save_ranking` mesurées à part
+PHASES = {'refresh_rank_stats': 'Moyennes glissantes', 'publish_snapshot': 'Instantané'}
+
+
+def _timed(func, timings):
+    """Enveloppe `func` en ajoutant la durée de chaque appel à `timings`."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings.append(time.perf_counter() - start)
+    return wrapper
+
+
+def main():
+    num_players = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    num_days = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    days = synthetic_rankings(num_players, num_days)
+    logger.remove()
+
+    implementations = (
+        ('Joueur par joueur', lambda db, current, date_j1, players:
+            save_ranking_per_player(db, 'dreamland', players, current, date_j1)),
+        ('En bloc', lambda db, current, date_j1, players:
+            db.save_ranking('dreamland', players, current, date_j1)),
+    )
+
+    results = {}
+    phases = {name: [] for name in PHASES}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Les bases sont créées avant d'envelopper les étapes : les migrations
+        # ne sont pas mesurées
+        databases = [RankDatabase(os.path.join(tmp, f"{i}.db")) for i in range(len(implementations))]
+        originals = {name: getattr(storage.database, name) for name in PHASES}
+        for name, func in originals.items():
+            setattr(storage.database, name, _timed(func, phases[name]))
+        try:
+            for db, (name, save) in zip(databases, implementations):
+                timings = []
+                for current, date_j1, players in days:
+                    start = time.perf_counter()
+                    save(db, current, date_j1, players)
+                    timings.append(time.perf_counter() - start)
+                results[name] = (sum(timings), dump(db))
+                db.conn.close()
+        finally:
+            for name, func in originals.items():
+                setattr(storage.database, name, func)
+
+    print(f"\n{num_players} joueurs, {num_days} jours")
+    print("─" * 46)
+    (old_name, (old, old_dump)), (new_name, (new, new_dump)) = results.items()
+    extra = sum(sum(timings) for timings in phases.values())
+    rows = [(old_name, old), (f"{new_name} (joueurs)", new - extra)]
+    rows += [(f"  + {PHASES[name].lower()}", sum(timings)) for name, timings in phases.items()]
+    rows.append((f"{new_name} (total)", new))
+    for name, total in rows:
+        per_day = total / num_days
+        print(f"{name:<28}{per_day * 1000:>10.1f} ms/jour")
+
+    print(f"Accélération de l'enregistrement : {old / (new - extra):.1f}x, "
+          f"contenu identique : {old_dump == new_dump}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Mesure du coût d'import à froid des points d'entrée.
+
+Chaque module est importé dans un interpréteur neuf, qui rapporte la durée de
+l'import et la mémoire résidente maximale du processus.
+
+Utilisation :
+    python -m tests.bench_imports
+"""
+
+import json
+import os
+import subprocess
+import sys
+from loguru import logger
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Modules mesurés : (libellé, module)
+TARGETS = [
+    ("Stockage seul", "storage.database"),
+    ("Alias rank.database", "rank.database"),
+    ("Bot Discord", "bot.discord_bot"),
+    ("Pile de capture (ancien coût de rank.database)", "rank.dreamland"),
+]
+
+PROBE = r"""
+import json, sys, time
+start = time.perf_counter()
+try:
+    __import__(sys.argv[1])
+    error = None
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en kilo-octets ailleurs
+    rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+except ImportError:
+    rss_mb = None
+heavy = sorted(m for m in ('easyocr', 'torch', 'cv2', 'pyautogui', 'win32gui') if m in sys.modules)
+print(json.dumps({'elapsed': elapsed, 'rss_mb': rss_mb, 'error': error, 'heavy': heavy}))
+"""
+
+
+def measure(module):
+    """
+    Importe un module dans un interpréteur neuf.
+
+    Returns:
+        dict: elapsed (s), rss_mb (Mo ou None), error, heavy (modules lourds chargés)
+    """
+    env = dict(os.environ, PYTHONPATH=SRC_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, module],
+        capture_output=True, text=True, env=env, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Affiche le coût d'import de chaque point d'entrée."""
+    baseline = measure("json")
+    logger.info(f"Interpréteur seul : {baseline['rss_mb'] or 0:.1f} Mo")
+
+    print(f"\n{'Module':<50}{'Import (ms)':>12}{'RSS (Mo)':>10}  Modules lourds")
+    print("─" * 100)
+    for label, module in TARGETS:
+        result = measure(module)
+        if result['error']:
+            print(f"{label:<50}{'—':>12}{'—':>10}  {result['error']}")
+            continue
+        rss = f"{result['rss_mb']:.1f}" if result['rss_mb'] is not None else "—"
+        heavy = ', '.join(result['heavy']) or 'aucun'
+        print(f"{label:<50}{result['elapsed'] * 1000:>12.1f}{rss:>10}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
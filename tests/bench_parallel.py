@@ -0,0 +1,87 @@
+"""
+Mesure du passage à l'échelle de l'extraction OCR multi-processus.
+
+Rejoue les captures d'une session enregistrée avec un nombre croissant de
+workers et affiche le débit (captures/s, régions/s) de chaque configuration.
+
+Utilisation :
+    python -m tests.bench_parallel [dossier_des_captures]
+"""
+
+import glob
+import os
+import sys
+import cv2
+from loguru import logger
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from rank.extraction import ZoneExtractor
+from rank.ocr import ocr_registry
+from rank.parallel import ParallelExtractor
+from rank.zones import ZoneLayout
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+CAPTURES_DIR = os.path.join(ROOT_DIR, 'resources', 'data', 'captures')
+
+
+def load_latest_session(captures_dir):
+    """
+    Charge les captures de la session la plus récente.
+
+    Returns:
+        list: Images de la session, dans l'ordre de défilement
+    """
+    paths = glob.glob(os.path.join(captures_dir, 'dreamland_capture_*.png'))
+    if not paths:
+        return []
+
+    # dreamland_capture_YYYYmmdd_HHMMSS_N.png
+    sessions = {}
+    for path in paths:
+        stem = os.path.basename(path)[:-4].split('_')
+        sessions.setdefault('_'.join(stem[2:4]), []).append((int(stem[4]), path))
+
+    latest = sorted(sessions)[-1]
+    logger.info(f"Session {latest} : {len(sessions[latest])} captures")
+    return [cv2.imread(path) for _, path in sorted(sessions[latest])]
+
+
+def main():
+    """Extrait la même session avec 1, 2, 4... workers."""
+    captures_dir = sys.argv[1] if len(sys.argv) > 1 else CAPTURES_DIR
+    captures = load_latest_session(captures_dir)
+    if not captures:
+        print(f"Aucune capture trouvée dans {captures_dir}")
+        return
+
+    layout = ZoneLayout.from_file()
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+        worker_counts.append(worker_counts[-1] * 2)
+
+    reports = []
+    for workers in worker_counts:
+        if workers == 1:
+            extractor = ZoneExtractor(ocr_registry.get_engine(), layout)
+            extractor.extract(captures)
+        else:
+            with ParallelExtractor(layout, workers=workers) as extractor:
+                # Premier passage pour charger les modèles dans les workers
+                extractor.extract(captures[:1])
+                extractor.extract(captures)
+        reports.append(extractor.last_report)
+
+    base = reports[0].frames_per_second
+    print(f"\n{'Workers':>8}{'Captures/s':>12}{'Régions/s':>12}{'Accélération':>14}")
+    print("─" * 46)
+    for report in reports:
+        speedup = report.frames_per_second / base if base else 0.0
+        print(f"{report.workers:>8}{report.frames_per_second:>12.2f}"
+              f"{report.rois_per_second:>12.1f}{speedup:>13.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Comparaison du prétraitement des régions OCR : région par région ou en une passe.
+
+L'ancien chemin agrandit, convertit et binarise chaque région séparément ;
+le nouveau binarise une seule fois la zone de liste de chaque capture puis
+découpe et agrandit les régions. Le script mesure le temps de prétraitement
+de toutes les régions d'une session et la concordance des pixels obtenus.
+
+Utilisation :
+    python -m tests.bench_preprocess [dossier_des_captures]
+"""
+
+import os
+import sys
+import time
+import cv2
+import numpy as np
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from rank.extraction import ZoneExtractor, FIELDS
+from rank.zones import ZoneLayout
+from tests.bench_parallel import load_latest_session, CAPTURES_DIR
+
+REPEAT = 5
+
+
+def preprocess_region_per_roi(image, region):
+    """Prétraitement historique d'une région (agrandissement puis binarisation)."""
+    x, y, w, h = region
+    roi = image[y:y+h, x:x+w].copy()
+    h, w = roi.shape[:2]
+    roi = cv2.resize(roi, (int(w * 2.5), int(h * 2.5)), interpolation=cv2.INTER_CUBIC)
+    gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+    gray = cv2.convertScaleAbs(gray, alpha=1.5, beta=0)
+    _, binary = cv2.threshold(gray, 240, 255, cv2.THRESH_BINARY)
+    return binary
+
+
+def synthetic_session(count=20, size=(1500, 1334)):
+    """Captures factices : texte blanc sur fond sombre bruité."""
+    rng = np.random.default_rng(0)
+    width, height = size
+    captures = []
+    for i in range(count):
+        image = rng.integers(0, 90, size=(height, width, 3), dtype=np.uint8)
+        for row in range(5):
+            y = int(height * (0.5 + 0.09 * row))
+            cv2.putText(image, f"{i * 5 + row + 1}   Joueur{i}{row}   Guilde   {rng.integers(10**6, 10**8)}",
+                        (80, y), cv2.FONT_HERSHEY_SIMPLEX, 1.4, (255, 255, 255), 3)
+        captures.append(image)
+    return captures
+
+
+def main():
+    captures_dir = sys.argv[1] if len(sys.argv) > 1 else CAPTURES_DIR
+    captures = load_latest_session(captures_dir) or synthetic_session()
+
+    layout = ZoneLayout.from_file()
+    extractor = ZoneExtractor(None, layout)
+    keys = [(idx, row, field) for idx in range(len(captures))
+            for row in range(extractor.num_entries) for field in FIELDS]
+
+    # L'ancien chemin recalcule chaque boîte à partir des pourcentages
+    zones_config = layout.to_dict()
+
+    def per_roi():
+        results = {}
+        for idx, row, field in keys:
+            image = captures[idx]
+            height, width = image.shape[:2]
+            zone = zones_config[field][row]
+            box = (int(zone['x_percent'] * width), int(zone['y_percent'] * height),
+                   int(zone['width_percent'] * width), int(zone['height_percent'] * height))
+            results[(idx, row, field)] = preprocess_region_per_roi(image, box)
+        return results
+
+    def single_pass():
+        results = {}
+        for key in keys:
+            region = extractor._region(captures, *key)
+            results[key] = region[1]
+        extractor._frames.clear()
+        return results
+
+    timings = {}
+    for name, run in (('Région par région', per_roi), ('Une passe par capture', single_pass)):
+        best = float('inf')
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            results = run()
+            best = min(best, time.perf_counter() - start)
+        timings[name] = (best, results)
+
+    (old_time, old), (new_time, new) = timings.values()
+    agreement = np.mean([np.mean(old[key] == new[key]) for key in keys])
+
+    print(f"\n{len(captures)} captures, {len(keys)} régions (meilleur de {REPEAT})")
+    print("─" * 52)
+    for name, (seconds, _) in timings.items():
+        print(f"{name:<24}{seconds * 1000:>10.1f} ms{len(keys) / seconds:>12.0f} rég./s")
+    print(f"Accélération : {old_time / new_time:.2f}x, pixels identiques : {agreement:.2%}")
+
+
+if __name__ == "__main__":
+    main()
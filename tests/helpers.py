@@ -0,0 +1,86 @@
+"""
+Données et utilitaires partagés par les tests et les benchmarks.
+"""
+
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+
+def save_ranking_per_player(db, ranking_type, players, date, date_j1):
+    """Enregistrement historique : quatre requêtes par joueur."""
+    cursor = db.conn.cursor()
+    cursor.execute("SELECT id FROM ranking_dates WHERE date = ? AND type = ?", (date, ranking_type))
+    result = cursor.fetchone()
+    if result:
+        ranking_date_id = result[0]
+        cursor.execute("UPDATE ranking_dates SET date_j1 = ? WHERE id = ?", (date_j1, ranking_date_id))
+    else:
+        cursor.execute("INSERT INTO ranking_dates (date, type, date_j1) VALUES (?, ?, ?)",
+                       (date, ranking_type, date_j1))
+        ranking_date_id = cursor.lastrowid
+    cursor.execute("DELETE FROM rankings WHERE ranking_date_id = ?", (ranking_date_id,))
+
+    for player in players:
+        cursor.execute("INSERT OR IGNORE INTO players (name, guild) VALUES (?, ?)",
+                       (player['name'], player.get('guild', '')))
+        cursor.execute("SELECT id FROM players WHERE name = ?", (player['name'],))
+        player_id = cursor.fetchone()[0]
+        cursor.execute("UPDATE players SET guild = ? WHERE id = ? AND guild != ?",
+                       (player.get('guild', ''), player_id, player.get('guild', '')))
+        cursor.execute("INSERT INTO rankings (ranking_date_id, player_id, rank, score) VALUES (?, ?, ?, ?)",
+                       (ranking_date_id, player_id, player['rank'], player.get('score', '0')))
+    db.conn.commit()
+
+
+def synthetic_rankings(num_players=10000, num_days=5, seed=0):
+    """
+    Classements quotidiens synthétiques.
+
+    Returns:
+        list: Tuples (date, date_j1, joueurs) ; environ 5 % de nouveaux joueurs
+              et 2 % de changements de guilde par jour
+    """
+    rng = random.Random(seed)
+    guilds = [f"Guilde{i}" for i in range(300)]
+    roster = {f"Joueur{i}": rng.choice(guilds) for i in range(num_players)}
+    next_id = num_players
+    start = date(2024, 1, 1)
+
+    days = []
+    for day in range(num_days):
+        names = list(roster)
+        for name in rng.sample(names, num_players // 20):
+            del roster[name]
+            roster[f"Joueur{next_id}"] = rng.choice(guilds)
+            next_id += 1
+        for name in rng.sample(list(roster), num_players // 50):
+            roster[name] = rng.choice(guilds)
+
+        order = list(roster)
+        rng.shuffle(order)
+        players = [{'rank': rank, 'name': name, 'guild': roster[name],
+                    'score': str(rng.randint(10**6, 10**9))}
+                   for rank, name in enumerate(order, 1)]
+        current = start + timedelta(days=day)
+        days.append((current.isoformat(), (current - timedelta(days=1)).isoformat(), players))
+    return days
+
+
+def dump(db):
+    """Contenu comparable d'une base."""
+    cursor = db.conn.cursor()
+    cursor.execute("SELECT name, guild FROM players ORDER BY name")
+    players = cursor.fetchall()
+    cursor.execute("""
+        SELECT rd.date, rd.date_j1, p.name, r.rank, r.score
+        FROM rankings r
+        JOIN ranking_dates rd ON r.ranking_date_id = rd.id
+        JOIN players p ON r.player_id = p.id
+        ORDER BY rd.date, r.rank
+    """)
+    return players, cursor.fetchall()
@@ -0,0 +1,124 @@
+"""
+Tests de l'alignement des captures successives.
+"""
+
+import os
+import sys
+import cv2
+import numpy as np
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from rank.alignment import FrameAligner
+from rank.zones import ZoneLayout
+
+HEIGHT = 400
+LIST_TOP = 100
+PITCH = 50
+
+
+def _zones():
+    """Cinq emplacements de 40 px espacés de 50 px à partir de y=100."""
+    zones = {}
+    for field in ('rank', 'name', 'guild', 'score'):
+        zones[field] = [{
+            'x_percent': 0.1,
+            'y_percent': (LIST_TOP + row * PITCH) / HEIGHT,
+            'width_percent': 0.2,
+            'height_percent': 40 / HEIGHT
+        } for row in range(5)]
+    return ZoneLayout(zones)
+
+
+def _frame(content, header, scroll):
+    """Capture du classement défilé de `scroll` pixels."""
+    frame = header.copy()
+    frame[LIST_TOP:LIST_TOP + 250] = content[scroll:scroll + 250]
+    return frame
+
+
+def test_aligner_skips_rows_already_read():
+    """Seules les lignes apparues depuis la capture précédente sont lues."""
+    rng = np.random.default_rng(3)
+    content = rng.integers(0, 256, size=(1000, 120, 3), dtype=np.uint8)
+    header = rng.integers(0, 256, size=(HEIGHT, 120, 3), dtype=np.uint8)
+    aligner = FrameAligner(_zones())
+
+    assert aligner.new_rows(_frame(content, header, 0)) == [0, 1, 2, 3, 4]
+    # Défilement de deux lignes : les trois premières ont déjà été lues
+    assert aligner.new_rows(_frame(content, header, 2 * PITCH)) == [3, 4]
+    # Fin de liste : plus de défilement, rien de nouveau
+    assert aligner.new_rows(_frame(content, header, 2 * PITCH)) == []
+    assert aligner.skipped == 8
+
+
+def test_aligner_reads_everything_when_rows_are_misaligned():
+    """Un défilement qui ne tombe pas sur les emplacements ne fait rien ignorer."""
+    rng = np.random.default_rng(4)
+    content = rng.integers(0, 256, size=(1000, 120, 3), dtype=np.uint8)
+    header = rng.integers(0, 256, size=(HEIGHT, 120, 3), dtype=np.uint8)
+    aligner = FrameAligner(_zones())
+
+    aligner.new_rows(_frame(content, header, 0))
+    assert aligner.new_rows(_frame(content, header, 37)) == [0, 1, 2, 3, 4]
+
+    # Capture sans rapport avec la précédente
+    other = rng.integers(0, 256, size=(1000, 120, 3), dtype=np.uint8)
+    assert aligner.new_rows(_frame(other, header, 0)) == [0, 1, 2, 3, 4]
+
+
+def _rendered_list(num_rows, width=360):
+    """
+    Classement rendu : une carte de 40 px par joueur, tous les 50 px.
+
+    Les joueurs 3n et 3n+1 ont le même nom, la même guilde et le même score :
+    leurs lignes ne diffèrent que par le rang.
+    """
+    content = np.full((num_rows * PITCH, width, 3), 25, dtype=np.uint8)
+    for rank in range(num_rows):
+        top = rank * PITCH
+        cv2.rectangle(content, (4, top), (width - 5, top + 39), (70, 60, 50), -1)
+        cv2.rectangle(content, (4, top), (width - 5, top + 39), (140, 120, 90), 1)
+        twin = rank - rank % 3
+        cv2.putText(content, str(rank + 1), (12, top + 27), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        cv2.putText(content, f"Joueur{twin}", (70, top + 27), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (230, 230, 230), 1)
+        cv2.putText(content, f"{(twin + 7) * 1234}", (250, top + 27), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 220, 255), 1)
+    return content
+
+
+def _slot_rank(scroll, slot):
+    """Rang lu par l'OCR dans un emplacement : celui de la carte centrée dans sa bande."""
+    top = scroll + slot * PITCH
+    rank = (top + 20) // PITCH
+    center = rank * PITCH + 20
+    return rank + 1 if top <= center <= top + 40 else None
+
+
+def test_aligner_on_rendered_rows_with_partial_scrolls():
+    """Défilements partiels et lignes presque identiques : aucun rang perdu ni relu à tort."""
+    content = _rendered_list(30)
+    header = np.full((HEIGHT, content.shape[1], 3), 15, dtype=np.uint8)
+    cv2.putText(header, "Classement", (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+    aligner = FrameAligner(_zones())
+
+    # Défilements d'une ou deux lignes entières et de 1,4 ligne, puis fin de liste
+    scrolls = [0, 100, 170, 270, 340, 390, 390]
+    visible, read = set(), []
+    for idx, scroll in enumerate(scrolls):
+        ranks = {slot: _slot_rank(scroll, slot) for slot in range(5)}
+        visible.update(rank for rank in ranks.values() if rank)
+        frame_read = {ranks[slot] for slot in aligner.new_rows(_frame(content, header, scroll)) if ranks[slot]}
+        read.append(frame_read)
+
+        step = scroll - scrolls[idx - 1] if idx else None
+        if step is not None and step % PITCH == 0:
+            # Défilement de lignes entières : rien de ce qui vient d'être lu n'est relu
+            assert not frame_read & read[idx - 1]
+
+    # Aucun rang affiché n'est perdu, aucun rang absent n'est inventé
+    assert set().union(*read) == visible
+    assert read[-1] == set()
+    # Lignes ignorées : 3 + 3 après les défilements de deux lignes, 4 après
+    # celui d'une ligne, 5 en fin de liste
+    assert aligner.skipped == 15
@@ -0,0 +1,115 @@
+"""
+Tests de l'accès asynchrone à la base et des commandes du bot.
+"""
+
+import asyncio
+import os
+import sys
+import time
+import pytest
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from storage.aio import AsyncRankDatabase, QueryTimeout
+from storage.database import RankDatabase
+from tests.bench_bot import FakeInteraction, ranking_commands
+from tests.helpers import synthetic_rankings
+
+
+class SlowDatabase(RankDatabase):
+    def endless_query(self):
+        """Requête qui ne se termine que si SQLite l'interrompt."""
+        with self.connections.reader() as conn:
+            return conn.execute("""
+                WITH RECURSIVE counter(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM counter)
+                SELECT x FROM counter WHERE x = 0
+            """).fetchone()
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = SlowDatabase(str(tmp_path / 'rankings.db'))
+    for current, date_j1, players in synthetic_rankings(num_players=120, num_days=2):
+        database.save_ranking('dreamland', players, current, date_j1)
+    yield database
+    database.close()
+
+
+def test_queries_run_off_the_event_loop(db):
+    facade = AsyncRankDatabase(db, workers=1, timeout=0.3)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        start = time.monotonic()
+        with pytest.raises(QueryTimeout):
+            await facade.run(db.endless_query)
+        elapsed = time.monotonic() - start
+        latest = await facade.get_latest_ranking(limit=10)
+        task.cancel()
+        return ticks, elapsed, latest
+
+    ticks, elapsed, latest = asyncio.run(scenario())
+    # La boucle a continué de tourner pendant la requête ; interrompue à son
+    # échéance, elle a libéré le seul thread du pool pour la requête suivante
+    assert ticks >= 10
+    assert elapsed < 0.3 + 0.4
+    assert latest == db.get_latest_ranking(limit=10)
+    facade.close()
+
+
+def test_ranking_command_sends_one_paginated_message(db):
+    commands = ranking_commands(db)
+    command = commands.bot.tree.commands['royaumeonirique']
+
+    async def browse():
+        interaction = FakeInteraction()
+        await command(interaction)
+        # 120 joueurs : un seul message, 5 pages de 25
+        [embed], [view] = interaction.followup.sent, interaction.followup.views
+        assert embed.title.endswith("(1-25)") and view.page_count == 5
+        assert view.previous_button.disabled and not view.next_button.disabled
+
+        click = FakeInteraction()
+        await view.last_button.callback(click)
+        await view.previous_button.callback(click)
+        await view.next_button.callback(click)
+        titles = [e.title[e.title.rindex('('):] for e in click.response.edited]
+        assert titles == ["(101-120)", "(76-100)", "(101-120)"]
+        assert view.next_button.disabled and view.position_button.label == "5/5"
+        assert click.response.edited[2] is click.response.edited[0]
+        assert click.response.edited[2].description.count("\n") == 20 + 3
+
+    asyncio.run(browse())
+
+    interaction = FakeInteraction()
+    asyncio.run(command(interaction, joueur='Joueur1'))
+    assert len(interaction.followup.sent) == 1
+
+    # Vue d'une guilde dérivée de l'instantané du jour
+    interaction = FakeInteraction()
+    asyncio.run(command(interaction, guilde='guilde12'))
+    expected = db.get_latest_ranking(guild_name='guilde12')
+    [embed] = interaction.followup.sent
+    assert embed.title.endswith(f"Guilde: guilde12 (1-{len(expected)})")
+    assert embed.description.count("\n") == len(expected) + 3
+
+
+def test_ranking_command_reports_timeouts(db, monkeypatch):
+    commands = ranking_commands(db)
+    command = commands.bot.tree.commands['royaumeonirique']
+    monkeypatch.setattr(db, 'get_leaderboard_page', lambda *args, **kwargs: db.endless_query())
+    commands.db.timeout = 0.2
+
+    interaction = FakeInteraction()
+    asyncio.run(command(interaction))
+    [embed] = interaction.followup.sent
+    assert "trop de temps" in embed.description
@@ -0,0 +1,91 @@
+"""
+Tests du cache des requêtes.
+"""
+
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+import pytest
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from storage.cache import QueryCache
+from storage.database import RankDatabase
+
+
+def _ranking(*names):
+    return [{'rank': i + 1, 'name': n, 'guild': 'G', 'score': '1'} for i, n in enumerate(names)]
+
+
+def test_repeated_reads_are_served_from_cache(tmp_path):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    db.save_ranking('dreamland', _ranking('Alice', 'Bob'), '2024-01-02', '2024-01-01')
+
+    first = db.get_latest_ranking()
+    # Arguments explicites égaux aux valeurs par défaut : même entrée
+    assert db.get_latest_ranking(limit=100) is first
+    assert db.get_latest_ranking(100, None, None, 'dreamland') is first
+    db.get_player_history('Alice')
+    db.get_player_history('Alice', 7)
+
+    stats = db.cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (3, 2, 2)
+    assert stats['hit_rate'] == 0.6
+
+
+def test_target_dates_are_compared_by_day(tmp_path):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    db.save_ranking('dreamland', _ranking('Alice'), '2024-01-02', '2024-01-01')
+    morning = db.get_latest_ranking(target_date=datetime(2024, 1, 1, 8, 30))
+    assert db.get_latest_ranking(target_date=datetime(2024, 1, 1, 21, 5)) is morning
+
+
+def test_writes_invalidate_cached_results(tmp_path):
+    path = str(tmp_path / 'rankings.db')
+    bot = RankDatabase(path)
+    capture = RankDatabase(path)
+    capture.save_ranking('dreamland', _ranking('Alice', 'Bob'), '2024-01-02', '2024-01-01')
+    assert [p['name'] for p in bot.get_latest_ranking()] == ['Alice', 'Bob']
+
+    # Écriture par une autre connexion (processus de capture)
+    capture.save_ranking('dreamland', _ranking('Bob', 'Alice'), '2024-01-03', '2024-01-02')
+    assert [p['name'] for p in bot.get_latest_ranking()] == ['Bob', 'Alice']
+
+    bot.clear_database()
+    assert bot.get_latest_ranking() == []
+    assert bot.cache.stats()['hits'] == 0
+
+
+def test_cache_is_bounded_and_expires():
+    cache = QueryCache(max_entries=2, ttl=0.05)
+    for key in 'abc':
+        cache.put(key, 1, key.upper(), 0.01)
+    assert cache.get('a', 1) == (False, None)
+    assert cache.get('c', 1) == (True, 'C')
+    assert cache.get('c', 2) == (False, None)
+    assert cache.stats()['evictions'] == 1
+
+    cache.put('d', 1, 'D', 0.01)
+    time.sleep(0.06)
+    assert cache.get('d', 1) == (False, None)
+    assert cache.stats()['saved_seconds'] == 0.01
+
+
+def test_failed_queries_are_not_cached(tmp_path):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    db.save_ranking('dreamland', _ranking('Alice'), '2024-01-02', '2024-01-01')
+
+    # Table indisponible : l'erreur remonte au lieu d'un historique vide
+    with db.connections.writer() as conn:
+        conn.execute("ALTER TABLE player_rank_stats RENAME TO player_rank_stats_old")
+    with pytest.raises(sqlite3.OperationalError):
+        db.get_player_history('Alice')
+    assert db.cache.stats()['entries'] == 0
+
+    with db.connections.writer() as conn:
+        conn.execute("ALTER TABLE player_rank_stats_old RENAME TO player_rank_stats")
+    assert [day['rank'] for day in db.get_player_history('Alice')] == [1]
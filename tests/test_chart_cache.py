@@ -0,0 +1,91 @@
+"""
+Tests du cache des graphiques rendus.
+"""
+
+import asyncio
+import os
+import sys
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from bot.chart_cache import ChartCache
+from storage.database import RankDatabase
+from tests.bench_bot import FakeInteraction, ranking_commands
+
+PAYLOAD = {'title': 'Progression'}
+
+
+def test_entries_follow_data_version():
+    cache = ChartCache()
+    cache.put(('Alice', 10), 1, b'png', PAYLOAD)
+    assert cache.get(('Alice', 10), 1) == (b'png', PAYLOAD)
+    assert cache.get(('Alice', 5), 1) is None
+
+    # Nouveau jour : tout est invalidé, un rendu en retard n'est pas conservé
+    assert cache.get(('Alice', 10), 2) is None
+    cache.put(('Alice', 10), 1, b'old', PAYLOAD)
+    assert len(cache) == 0
+
+
+def test_byte_bound_and_ttl(tmp_path):
+    cache = ChartCache(max_bytes=250, spill_dir=str(tmp_path))
+    for name in ('A', 'B', 'C'):
+        cache.put((name, 10), 1, name.encode() * 100, PAYLOAD)
+    assert len(cache) == 2 and cache.stats()['evictions'] == 1
+
+    # L'entrée évincée est relue sur disque, puis retirée du disque
+    assert cache.get(('A', 10), 1) == (b'A' * 100, PAYLOAD)
+    assert cache.stats()['disk_hits'] == 1
+    assert not os.path.exists(cache._spill_path(('A', 10), 1) + '.json')
+    assert os.path.exists(cache._spill_path(('B', 10), 1) + '.json')
+
+    # Un nouveau jour vide aussi le disque
+    cache.get(('A', 10), 2)
+    assert os.listdir(tmp_path) == []
+
+    expired = ChartCache(ttl=0)
+    expired.put(('A', 10), 1, b'png', PAYLOAD)
+    assert expired.get(('A', 10), 1) is None
+
+
+class CountingRenderer:
+    def __init__(self):
+        self.renders = 0
+
+    async def progression(self, player_name, history):
+        self.renders += 1
+        return b'\x89PNG' + player_name.encode()
+
+    def close(self):
+        pass
+
+
+def _save_day(db, day, rank):
+    db.save_ranking('dreamland', [{'rank': rank, 'name': 'Alice', 'guild': 'Licornes', 'score': '1'}],
+                    f'2024-01-{day:02d}', f'2024-01-{day - 1:02d}')
+
+
+def test_progression_reuses_chart_until_new_day(tmp_path):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    _save_day(db, 2, 1)
+    _save_day(db, 3, 2)
+    commands = ranking_commands(db)
+    commands.charts = CountingRenderer()
+    command = commands.bot.tree.commands['progression']
+
+    def run():
+        interaction = FakeInteraction()
+        asyncio.run(command(interaction, joueur='Alice'))
+        [embed] = interaction.followup.sent
+        return embed
+
+    first, second = run(), run()
+    assert commands.charts.renders == 1
+    assert second.to_dict() == first.to_dict()
+    assert second.image.url == "attachment://progression.png"
+
+    _save_day(db, 4, 3)
+    assert "Perte de 2 places" in run().fields[0].value
+    assert commands.charts.renders == 2
+    commands.db.close()
@@ -0,0 +1,59 @@
+"""
+Tests du rendu des graphiques hors de la boucle d'événements.
+"""
+
+import asyncio
+import os
+import struct
+import sys
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from bot.charts import ChartRenderer, render_progression
+from storage.database import RankDatabase
+from tests.bench_bot import FakeInteraction, ranking_commands
+
+HISTORY = [{'date': f'2024-01-{day:02d}', 'rank': rank} for day, rank in ((3, 4), (2, 9), (1, 15))]
+
+
+def _png_size(data):
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    return struct.unpack('>II', data[16:24])
+
+
+def test_render_progression_png():
+    assert _png_size(render_progression("Alice", HISTORY)) == (1000, 600)
+    assert _png_size(render_progression("Alice", HISTORY[:1], dpi=50)) == (500, 300)
+
+
+def test_renderer_pool():
+    renderer = ChartRenderer(workers=1)
+    try:
+        renderer.warm_up()
+
+        async def render_all():
+            return await asyncio.gather(*(renderer.progression(f"Joueur{i}", HISTORY) for i in range(3)))
+
+        charts = asyncio.run(render_all())
+        assert [_png_size(chart) for chart in charts] == [(1000, 600)] * 3
+    finally:
+        renderer.close()
+
+
+def test_progression_command(tmp_path):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    for day, rank in ((2, 1), (3, 2)):
+        db.save_ranking('dreamland', [{'rank': rank, 'name': 'Alice', 'guild': 'Licornes', 'score': '1'}],
+                        f'2024-01-{day:02d}', f'2024-01-{day - 1:02d}')
+    commands = ranking_commands(db)
+    commands.charts = ChartRenderer(workers=1)
+    try:
+        interaction = FakeInteraction()
+        asyncio.run(commands.bot.tree.commands['progression'](interaction, joueur='Alice'))
+        [embed] = interaction.followup.sent
+        assert embed.image.url == "attachment://progression.png"
+        assert "Perte de 1 places" in embed.fields[0].value
+    finally:
+        commands.charts.close()
+        commands.db.close()
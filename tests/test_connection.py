@@ -0,0 +1,80 @@
+"""
+Tests des connexions à la base : WAL, pool de lecture, écriture unique.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import pytest
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from storage.connection import ConnectionManager
+from storage.database import RankDatabase
+
+
+def _ranking(*names):
+    return [{'rank': i + 1, 'name': n, 'guild': 'G', 'score': '1'} for i, n in enumerate(names)]
+
+
+def test_readers_are_not_blocked_by_a_write(tmp_path):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    db.save_ranking('dreamland', _ranking('Alice', 'Bob'), '2024-01-02', '2024-01-01')
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+    # Écriture en cours, non validée
+    with db.connections.writer() as conn:
+        conn.execute("DELETE FROM rankings")
+        assert conn.in_transaction
+
+        results = []
+        reader = threading.Thread(target=lambda: results.append(db.get_latest_ranking()))
+        reader.start()
+        reader.join(timeout=5)
+        assert not reader.is_alive()
+        # La lecture voit le dernier état validé
+        assert [p['name'] for p in results[0]] == ['Alice', 'Bob']
+        conn.rollback()
+
+
+def test_reader_connections_are_read_only(tmp_path):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    with db.connections.reader() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM players")
+
+
+def test_reader_pool_is_bounded(tmp_path):
+    manager = ConnectionManager(str(tmp_path / 'test.db'), readers=2, timeout=0.2)
+    with manager.reader() as first, manager.reader() as second:
+        assert first is not second
+        with pytest.raises(sqlite3.OperationalError):
+            with manager.reader():
+                pass
+    # Les connexions rendues sont réutilisées
+    with manager.reader() as again:
+        assert again in (first, second)
+    manager.close()
+
+
+def test_writes_are_serialized(tmp_path):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    errors = []
+
+    def save(day):
+        try:
+            db.save_ranking('dreamland', _ranking(f'Joueur{day}', 'Alice'), f'2024-01-{day + 1:02d}', f'2024-01-{day:02d}')
+        except sqlite3.Error as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(day,)) for day in range(1, 9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert db.conn.execute("SELECT COUNT(*) FROM rankings").fetchone()[0] == 16
+    assert db.get_player_stats('Alice')['days'] == 8
@@ -3,13 +3,19 @@ Test de l'initialisation de la base de données.
 """
 
 import os
+import sqlite3
 import sys
+from datetime import datetime
+import pytest
 from loguru import logger
 
 # Ajouter le répertoire src au PYTHONPATH
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
 from rank.database import RankDatabase
+from storage.scores import parse_score
+from storage.snapshots import KEEP_DAYS, format_pages, format_table
+from tests.helpers import dump, save_ranking_per_player, synthetic_rankings
 
 def test_database_init():
     """Test l'initialisation de la base de données."""
@@ -30,6 +36,246 @@ def test_database_init():
         logger.error(f"Erreur lors de l'initialisation de la base de données : {e}")
         return False
 
+def test_bulk_save_matches_per_player_loop(tmp_path):
+    """L'enregistrement en bloc produit la même base que la boucle historique."""
+    days = synthetic_rankings(num_players=300, num_days=3)
+    bulk = RankDatabase(str(tmp_path / 'bulk.db'))
+    loop = RankDatabase(str(tmp_path / 'loop.db'))
+
+    for current, date_j1, players in days:
+        bulk.save_ranking('dreamland', players, current, date_j1)
+        save_ranking_per_player(loop, 'dreamland', players, current, date_j1)
+    # Réenregistrer un jour remplace son classement
+    current, date_j1, players = days[-1]
+    bulk.save_ranking('dreamland', players[:100], current, date_j1)
+    save_ranking_per_player(loop, 'dreamland', players[:100], current, date_j1)
+
+    assert dump(bulk) == dump(loop)
+
+
+def test_failed_save_keeps_previous_ranking(tmp_path):
+    """Une erreur annule tout l'enregistrement."""
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    players = [{'rank': 1, 'name': 'Alice', 'guild': 'A', 'score': '10'},
+               {'rank': 2, 'name': 'Bob', 'guild': 'B', 'score': '5'}]
+    db.save_ranking('dreamland', players, '2024-01-02', '2024-01-01')
+
+    duplicate = [{'rank': 1, 'name': 'Carol', 'guild': 'C', 'score': '20'},
+                 {'rank': 1, 'name': 'Alice', 'guild': 'Z', 'score': '10'}]
+    with pytest.raises(sqlite3.IntegrityError):
+        db.save_ranking('dreamland', duplicate, '2024-01-02', '2024-01-01')
+
+    assert dump(db) == (
+        [('Alice', 'A'), ('Bob', 'B')],
+        [('2024-01-02', '2024-01-01', 'Alice', 1, 10), ('2024-01-02', '2024-01-01', 'Bob', 2, 5)]
+    )
+
+
+def test_parse_score():
+    assert parse_score("1234567") == 1234567
+    assert parse_score("12M") == 12_000_000
+    assert parse_score(" 1 234 ") == 1234
+    assert parse_score("M") == 0
+    assert parse_score(None) == 0
+    assert parse_score(42) == 42
+
+
+def test_legacy_text_scores_are_migrated(tmp_path):
+    """Une base existante aux scores texte est convertie à l'ouverture."""
+    path = str(tmp_path / 'rankings.db')
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE ranking_dates (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, type TEXT NOT NULL,
+            date_j1 TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, UNIQUE(date, type));
+        CREATE TABLE players (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, guild TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, UNIQUE(name));
+        CREATE TABLE rankings (id INTEGER PRIMARY KEY AUTOINCREMENT, ranking_date_id INTEGER, player_id INTEGER,
+            rank INTEGER NOT NULL, score TEXT NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(ranking_date_id, rank));
+        INSERT INTO ranking_dates (date, type, date_j1) VALUES ('2024-01-02', 'dreamland', '2024-01-01');
+        INSERT INTO players (name, guild) VALUES ('Alice', 'A'), ('Bob', 'B');
+        INSERT INTO rankings (ranking_date_id, player_id, rank, score) VALUES (1, 1, 1, '12M'), (1, 2, 2, '987654');
+    """)
+    conn.close()
+
+    db = RankDatabase(path)
+    rows = db.conn.execute("SELECT id, rank, score, typeof(score) FROM rankings ORDER BY id").fetchall()
+    assert rows == [(1, 1, 12_000_000, 'integer'), (2, 2, 987654, 'integer')]
+
+
+def test_score_analytics(tmp_path):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    db.save_ranking('dreamland', [{'rank': 1, 'name': 'Alice', 'guild': 'A', 'score': '100'},
+                                  {'rank': 2, 'name': 'Bob', 'guild': 'B', 'score': '80'}],
+                    '2024-01-02', '2024-01-01')
+    db.save_ranking('dreamland', [{'rank': 1, 'name': 'Bob', 'guild': 'B', 'score': '2M'},
+                                  {'rank': 2, 'name': 'Alice', 'guild': 'A', 'score': '150'},
+                                  {'rank': 3, 'name': 'Carol', 'guild': 'C', 'score': '90'}],
+                    '2024-01-03', '2024-01-02')
+
+    deltas = db.get_score_deltas()
+    assert [(d['name'], d['delta']) for d in deltas] == [('Bob', 1_999_920), ('Alice', 50), ('Carol', None)]
+
+    distribution = db.get_score_distribution(days=7)
+    assert [(d['date'], d['players'], d['min_score'], d['max_score']) for d in distribution] == [
+        ('2024-01-01', 2, 80, 100), ('2024-01-02', 3, 90, 2_000_000)]
+
+    curve = db.get_score_curve(days=2, max_rank=2)
+    assert [(c['rank'], c['min_score'], c['max_score']) for c in curve] == [(1, 100, 2_000_000), (2, 80, 150)]
+
+
+def _naive_rank_stats(db):
+    """Statistiques glissantes recalculées directement depuis les classements."""
+    return db.conn.execute("""
+        SELECT r.ranking_date_id, r.player_id, SUM(w.rank), COUNT(*), MIN(w.rank), MAX(w.rank)
+        FROM (SELECT DISTINCT ranking_date_id, player_id FROM rankings) r
+        JOIN ranking_dates rd ON rd.id = r.ranking_date_id
+        JOIN ranking_dates wd ON wd.type = rd.type
+            AND wd.date_j1 > date(rd.date_j1, '-30 days') AND wd.date_j1 <= rd.date_j1
+        JOIN rankings w ON w.ranking_date_id = wd.id AND w.player_id = r.player_id
+        GROUP BY r.ranking_date_id, r.player_id
+        ORDER BY 1, 2
+    """).fetchall()
+
+
+def _rank_stats(db):
+    return db.conn.execute("SELECT * FROM player_rank_stats ORDER BY 1, 2").fetchall()
+
+
+def test_rank_stats_follow_rankings(tmp_path):
+    """Les statistiques glissantes restent exactes : trous, reprises, sortie de période."""
+    import random
+    from datetime import date, timedelta
+    rng = random.Random(3)
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    start = date(2024, 1, 1)
+    names = [f"Joueur{i}" for i in range(12)]
+    days = [d for d in range(60) if d % 7 != 3]
+    # Les jours manquants sont repris à la fin, dans le désordre
+    for day in days + [3, 45, 17]:
+        current = start + timedelta(days=day)
+        ranked = rng.sample(names, rng.randint(4, len(names)))
+        players = [{'rank': i + 1, 'name': n, 'guild': 'G', 'score': '1'} for i, n in enumerate(ranked)]
+        db.save_ranking('dreamland', players, current.isoformat(), (current - timedelta(days=1)).isoformat())
+
+    expected = _naive_rank_stats(db)
+    assert _rank_stats(db) == expected
+
+    assert db.rebuild_stats() == len(days) + 3
+    assert _rank_stats(db) == expected
+
+    stats = db.get_player_stats('Joueur0')
+    latest = db.conn.execute("""
+        SELECT rd.id, p.id FROM rankings r JOIN players p ON p.id = r.player_id
+        JOIN ranking_dates rd ON rd.id = r.ranking_date_id
+        WHERE p.name = 'Joueur0' ORDER BY rd.date_j1 DESC LIMIT 1
+    """).fetchone()
+    row = next(s for s in expected if s[:2] == latest)
+    assert (stats['best_rank'], stats['worst_rank'], stats['days']) == (row[4], row[5], row[3])
+    assert db.get_player_stats('Inconnu') is None
+
+
+def test_rank_stats_with_duplicated_name_on_consecutive_days(tmp_path):
+    """Un nom lu deux fois le même jour (doublon d'OCR) ne fait pas échouer l'enregistrement."""
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    db.save_ranking('dreamland', _ranking('A', 'B'), '2024-01-02', '2024-01-01')
+    # A lu aux rangs 1 et 2, deux jours de suite : mise à jour incrémentale puis recalcul
+    db.save_ranking('dreamland', _ranking('A', 'A', 'B'), '2024-01-03', '2024-01-02')
+    db.save_ranking('dreamland', _ranking('B', 'A', 'A'), '2024-01-04', '2024-01-03')
+
+    expected = _naive_rank_stats(db)
+    assert _rank_stats(db) == expected
+    stats = db.get_player_stats('A')
+    assert (stats['avg_rank'], stats['best_rank'], stats['worst_rank'], stats['days']) == (1.8, 1, 3, 5)
+
+    assert db.rebuild_stats() == 3
+    assert _rank_stats(db) == expected
+
+
+def _ranking(*names):
+    return [{'rank': i + 1, 'name': n, 'guild': 'G', 'score': '1'} for i, n in enumerate(names)]
+
+
+def test_latest_ranking_compares_with_previous_day_of_same_type(tmp_path):
+    """L'évolution du rang se lit dans le classement précédent du même type."""
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    db.save_ranking('dreamland', _ranking('Alice', 'Bob', 'Carol'), '2024-01-02', '2024-01-01')
+    # Un autre type entre deux classements ne doit pas servir de référence
+    db.save_ranking('arena', _ranking('Carol', 'Bob', 'Alice'), '2024-01-03', '2024-01-02')
+    db.save_ranking('dreamland', _ranking('Bob', 'Carol', 'Alice'), '2024-01-05', '2024-01-04')
+
+    latest = db.get_latest_ranking()
+    assert [(p['name'], p['rank_change']) for p in latest] == [('Bob', 1), ('Carol', 1), ('Alice', -2)]
+    arena = db.get_latest_ranking(ranking_type='arena')
+    assert [(p['name'], p['rank_change']) for p in arena] == [('Carol', 0), ('Bob', 0), ('Alice', 0)]
+
+    # Reprise d'un jour manquant : il s'insère dans le chaînage
+    db.save_ranking('dreamland', _ranking('Carol', 'Alice', 'Bob'), '2024-01-04', '2024-01-03')
+    latest = db.get_latest_ranking()
+    assert [(p['name'], p['rank_change']) for p in latest] == [('Bob', 2), ('Carol', -1), ('Alice', -1)]
+    chain = db.conn.execute("""
+        SELECT d.date_j1, p.date_j1 FROM ranking_dates d
+        LEFT JOIN ranking_dates p ON p.id = d.prev_id
+        WHERE d.type = 'dreamland' ORDER BY d.date_j1
+    """).fetchall()
+    assert chain == [('2024-01-01', None), ('2024-01-03', '2024-01-01'), ('2024-01-04', '2024-01-03')]
+
+
+def test_ranking_day_chain_is_backfilled(tmp_path):
+    """Une base antérieure au chaînage le reçoit à la migration."""
+    path = str(tmp_path / 'rankings.db')
+    db = RankDatabase(path)
+    for day in (1, 3, 2):
+        db.save_ranking('dreamland', _ranking('Alice'), f'2024-01-0{day + 1}', f'2024-01-0{day}')
+    db.conn.execute("UPDATE ranking_dates SET prev_id = NULL")
+    db.conn.execute("DELETE FROM schema_migrations WHERE version = 4")
+    db.conn.execute("ALTER TABLE ranking_dates DROP COLUMN prev_id")
+    db.conn.commit()
+    db.conn.close()
+
+    db = RankDatabase(path)
+    chain = db.conn.execute("""
+        SELECT d.date_j1, p.date_j1 FROM ranking_dates d
+        LEFT JOIN ranking_dates p ON p.id = d.prev_id ORDER BY d.date_j1
+    """).fetchall()
+    assert chain == [('2024-01-01', None), ('2024-01-02', '2024-01-01'), ('2024-01-03', '2024-01-02')]
+
+
+def test_leaderboard_snapshot_follows_ingest(tmp_path):
+    """L'instantané publié à l'enregistrement correspond au classement calculé."""
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    days = synthetic_rankings(num_players=120, num_days=10)
+    for current, date_j1, players in days:
+        db.save_ranking('dreamland', players, current, date_j1)
+
+    stored = db.conn.execute("SELECT COUNT(*) FROM leaderboard_snapshots").fetchone()[0]
+    assert stored == KEEP_DAYS
+    latest = db.get_latest_ranking(limit=1000)
+    leaderboard = db.get_leaderboard()
+    assert (leaderboard['date'], leaderboard['count']) == (days[-1][1], 120)
+    assert leaderboard['pages'] == format_pages(latest)
+    assert len(leaderboard['pages']) == 4
+    # Pages au-delà des 100 premiers joueurs : mises en forme à la demande
+    page = db.get_leaderboard_page(4)
+    assert (page['page_count'], page['table']) == (5, format_table(latest[100:]))
+    assert db.get_leaderboard_page(5)['table'] is None
+
+    # Vue d'une guilde dérivée de l'instantané
+    guild = db.get_leaderboard(guild_name='guilde1')
+    members = db.get_latest_ranking(limit=1000, guild_name='guilde1')
+    assert (guild['count'], guild['pages']) == (len(members), format_pages(members))
+
+    # Jour plus ancien que les instantanés conservés : calculé à la demande
+    oldest = datetime.strptime(days[0][1], "%Y-%m-%d")
+    assert db.get_leaderboard(target_date=oldest)['pages'] == format_pages(
+        db.get_latest_ranking(limit=1000, target_date=oldest))
+    assert db.get_leaderboard(target_date=datetime(2000, 1, 1)) is None
+
+    # Reprise d'un jour : les jours suivants sont recalculés
+    db.save_ranking('dreamland', _ranking(*[p['name'] for p in days[-2][2]][::-1]), days[-2][0], days[-2][1])
+    assert db.get_leaderboard()['pages'] == format_pages(db.get_latest_ranking(limit=1000))
+
+
 if __name__ == "__main__":
     logger.info("Test d'initialisation de la base de données...")
     if test_database_init():
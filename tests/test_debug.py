@@ -0,0 +1,60 @@
+"""
+Tests de l'écriture asynchrone des images de debug.
+"""
+
+import os
+import sys
+import numpy as np
+import cv2
+import pytest
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from rank.debug import DebugSink
+
+
+def _region(value, size=(10, 30)):
+    """Région source BGR et sa version binarisée."""
+    original = np.full(size + (3,), value, dtype=np.uint8)
+    binary = np.full((size[0] * 2, size[1] * 2), 255 - value, dtype=np.uint8)
+    return original, binary
+
+
+def test_debug_sink_writes_named_files(tmp_path):
+    """Chaque région est écrite sous un nom capture/ligne/champ."""
+    sink = DebugSink(str(tmp_path), mode='files')
+    sink.submit(0, 0, 'rank', *_region(10))
+    sink.submit(2, 4, 'score', *_region(20))
+    sink.close()
+
+    assert sorted(os.listdir(tmp_path)) == [
+        'capture001_row1_rank_binary.png',
+        'capture001_row1_rank_original.png',
+        'capture003_row5_score_binary.png',
+        'capture003_row5_score_original.png',
+    ]
+    assert sink.written == 4
+    binary = cv2.imread(str(tmp_path / 'capture003_row5_score_binary.png'), cv2.IMREAD_GRAYSCALE)
+    assert binary.shape == (20, 60)
+
+
+def test_debug_sink_contact_sheet(tmp_path):
+    """En mode planche, une seule image par capture regroupe ses régions."""
+    sink = DebugSink(str(tmp_path), mode='contact_sheet')
+    for row in range(3):
+        for field in ('rank', 'name', 'guild', 'score'):
+            sink.submit(0, row, field, *_region(40 * row))
+    sink.submit(1, 0, 'rank', *_region(100))
+    sink.close()
+
+    assert sorted(os.listdir(tmp_path)) == ['capture001_sheet.png', 'capture002_sheet.png']
+    sheet = cv2.imread(str(tmp_path / 'capture001_sheet.png'))
+    # 3 lignes de (source + binaire) et 4 colonnes, marges comprises
+    assert sheet.shape[0] == 3 * 40 + 4 * 4
+    assert sheet.shape[1] == 4 * 60 + 5 * 4
+
+
+def test_debug_sink_rejects_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        DebugSink(str(tmp_path), mode='video')
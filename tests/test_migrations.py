@@ -0,0 +1,105 @@
+"""
+Tests des migrations du schéma.
+"""
+
+import os
+import sqlite3
+import sys
+import pytest
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from storage import migrations
+from storage.database import RankDatabase
+from storage.migrations import Migration, migrate, rebuild_table, status
+
+
+def test_migrations_are_recorded_once(tmp_path):
+    path = str(tmp_path / 'rankings.db')
+    db = RankDatabase(path)
+    entries = status(db.conn)
+    assert [e['version'] for e in entries] == [m.version for m in migrations.MIGRATIONS]
+    assert all(e['applied_at'] and e['duration'] is not None for e in entries)
+    db.conn.close()
+
+    reopened = RankDatabase(path)
+    assert migrate(reopened.conn) == []
+
+
+def test_failed_migration_is_rolled_back(tmp_path, monkeypatch):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (id INTEGER)")
+        conn.execute("INSERT INTO half_done VALUES (1)")
+        conn.execute("SELECT * FROM missing_table")
+
+    monkeypatch.setattr(migrations, 'MIGRATIONS', migrations.MIGRATIONS + [Migration(999, "Cassée", broken)])
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(db.conn)
+
+    tables = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert 'half_done' not in tables
+    assert 999 not in {e['version'] for e in status(db.conn) if e['applied_at']}
+
+
+def _scores_table(conn, rows):
+    conn.execute("CREATE TABLE scores (id INTEGER PRIMARY KEY AUTOINCREMENT, score TEXT NOT NULL)")
+    conn.executemany("INSERT INTO scores (score) VALUES (?)", [(str(i),) for i in range(rows)])
+    conn.commit()
+
+
+REBUILD = dict(
+    table='scores',
+    create_sql="CREATE TABLE {name} (id INTEGER PRIMARY KEY AUTOINCREMENT, score INTEGER NOT NULL)",
+    columns=['id', 'score'],
+    expressions=['id', 'CAST(score AS INTEGER) * 2'],
+    indexes=["CREATE INDEX idx_scores_score ON scores (score)"],
+)
+
+
+def test_rebuild_table_in_batches(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'test.db'))
+    _scores_table(conn, 2500)
+    commits = []
+    conn.set_trace_callback(lambda sql: commits.append(sql) if sql == 'COMMIT' else None)
+
+    assert rebuild_table(conn, batch_size=1000, **REBUILD) == 2500
+    conn.commit()
+
+    # Trois lots validés séparément avant le remplacement
+    assert len(commits) >= 4
+    assert conn.execute("SELECT id, score, typeof(score) FROM scores WHERE id = 1234").fetchone() == (1234, 2466, 'integer')
+    assert conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 2500
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT id FROM scores WHERE score = 10").fetchall()
+    assert 'idx_scores_score' in plan[0][3]
+
+
+def test_interrupted_rebuild_resumes(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'test.db'))
+    _scores_table(conn, 100)
+    # Reconstruction interrompue après les 40 premières lignes
+    conn.execute(REBUILD['create_sql'].format(name='scores_rebuild'))
+    conn.execute("INSERT INTO scores_rebuild SELECT id, -1 FROM scores WHERE id <= 40")
+    conn.commit()
+
+    assert rebuild_table(conn, batch_size=25, **REBUILD) == 100
+    conn.commit()
+    assert conn.execute("SELECT COUNT(*), SUM(score = -1) FROM scores").fetchone() == (100, 40)
+
+
+def test_status_does_not_write(tmp_path):
+    path = str(tmp_path / 'rankings.db')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE players (id INTEGER PRIMARY KEY)")
+    conn.commit()
+    conn.close()
+
+    readonly = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    entries = status(readonly)
+    assert [e['version'] for e in entries] == [m.version for m in migrations.MIGRATIONS]
+    assert all(e['applied_at'] is None and e['duration'] is None for e in entries)
+    tables = {row[0] for row in readonly.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert tables == {'players'}
+    readonly.close()
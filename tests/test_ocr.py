@@ -0,0 +1,259 @@
+"""
+Tests du moteur OCR par lots et de l'extraction par zones.
+"""
+
+import os
+import sys
+import multiprocessing
+import numpy as np
+import pytest
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from rank.ocr import BatchOCR, OCRRegistry, DIGITS_ALLOWLIST, ocr_registry
+from rank.extraction import ZoneExtractor
+from rank.parallel import ParallelExtractor
+from rank.ocr_cache import RecognitionCache
+from rank.zones import ZoneLayout
+
+
+class FakeReader:
+    """Lecteur factice : le texte d'une région est déterminé par sa valeur de pixel."""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.calls = []
+
+    def recognize(self, image, horizontal_list=None, free_list=None, allowlist=None,
+                  batch_size=1, detail=1, paragraph=False):
+        self.calls.append((allowlist, len(horizontal_list)))
+        results = []
+        for x_min, x_max, y_min, y_max in horizontal_list:
+            code = int(image[y_min, x_min])
+            box = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+            results.append((box, self.texts.get(code, ''), 0.9))
+        # EasyOCR ne garantit pas l'ordre des boîtes
+        return list(reversed(results))
+
+
+def _zones(num_entries):
+    """Construit une configuration de zones minimale."""
+    zone = {'x_percent': 0.0, 'y_percent': 0.0, 'width_percent': 0.1, 'height_percent': 0.1}
+    return {field: [zone] * num_entries for field in ('rank', 'name', 'guild', 'score')}
+
+
+class CodedExtractor(ZoneExtractor):
+    """Extracteur dont chaque région est une image uniforme codant sa clé."""
+
+    def __init__(self, ocr, zones, codes):
+        super().__init__(ocr, ZoneLayout(zones))
+        self.codes = codes
+        self.prepared = []
+
+    def _region(self, captures, capture_idx, row, field):
+        key = (capture_idx, row, field)
+        self.prepared.append(key)
+        image = np.full((6, 12), self.codes.get(key, 0), dtype=np.uint8)
+        allowlist = DIGITS_ALLOWLIST if field in ('rank', 'score') else None
+        return (key, image, allowlist)
+
+
+def test_batch_ocr_maps_results_to_keys():
+    """Les résultats sont rattachés à leur région malgré le tri d'EasyOCR."""
+    reader = FakeReader({1: '12', 2: 'Alice', 3: 'Bob'})
+    ocr = BatchOCR(reader, regions_per_sheet=2)
+
+    regions = [
+        ('a', np.full((5, 10), 1, dtype=np.uint8), DIGITS_ALLOWLIST),
+        ('b', np.full((7, 4), 2, dtype=np.uint8), None),
+        ('c', np.full((3, 8), 3, dtype=np.uint8), None),
+        ('d', np.full((3, 8), 9, dtype=np.uint8), None),
+        ('e', np.zeros((0, 0), dtype=np.uint8), None),
+    ]
+    texts = ocr.recognize(regions)
+
+    assert texts == {'a': '12', 'b': 'Alice', 'c': 'Bob', 'd': '', 'e': ''}
+    # Un appel pour les chiffres, deux planches pour le texte
+    assert reader.calls == [(DIGITS_ALLOWLIST, 1), (None, 2), (None, 1)]
+
+
+def test_zone_extractor_reads_each_rank_once():
+    """Seule la première occurrence lisible d'un rang est reconnue entièrement."""
+    texts = {10: '1', 11: '2', 12: '3', 20: 'Alice', 21: 'Bob', 22: 'Carol',
+             30: 'G1', 40: '1234', 41: '12M'}
+    codes = {
+        # Capture 0 : rangs 1 et 2, nom du rang 2 illisible
+        (0, 0, 'rank'): 10, (0, 0, 'name'): 20, (0, 0, 'guild'): 30, (0, 0, 'score'): 40,
+        (0, 1, 'rank'): 11,
+        # Capture 1 : rangs 2 et 3
+        (1, 0, 'rank'): 11, (1, 0, 'name'): 21,
+        (1, 1, 'rank'): 12, (1, 1, 'name'): 22, (1, 1, 'score'): 41,
+    }
+    reader = FakeReader(texts)
+    extractor = CodedExtractor(BatchOCR(reader), _zones(2), codes)
+
+    players = extractor.extract([None, None])
+
+    assert sorted(players) == [1, 2, 3]
+    assert players[1] == {'rank': 1, 'name': 'Alice', 'guild': 'G1', 'score': 1234}
+    assert players[2]['name'] == 'Bob'
+    assert players[2]['score'] == 0
+    assert players[3]['score'] == 12_000_000
+
+    # Le rang 1 n'apparaît qu'une fois : ses champs ne sont préparés qu'une fois
+    assert extractor.prepared.count((0, 0, 'name')) == 1
+    # Le rang 2 est relu sur la capture 1 car le nom était vide sur la capture 0
+    assert (1, 0, 'name') in extractor.prepared
+
+
+def test_single_pass_preprocessing_matches_per_roi():
+    """La binarisation en une passe donne les mêmes régions que le traitement par région."""
+    from tests.bench_preprocess import preprocess_region_per_roi, synthetic_session
+
+    zones = {field: [{'x_percent': 0.05 + 0.22 * i, 'y_percent': 0.45 + 0.09 * row,
+                      'width_percent': 0.2, 'height_percent': 0.05} for row in range(5)]
+             for i, field in enumerate(('rank', 'name', 'guild', 'score'))}
+    captures = synthetic_session(count=2)
+    extractor = ZoneExtractor(None, ZoneLayout(zones))
+
+    for row in range(5):
+        for field in zones:
+            key, binary, _ = extractor._region(captures, 1, row, field)
+            zone = zones[field][row]
+            height, width = captures[1].shape[:2]
+            box = (int(zone['x_percent'] * width), int(zone['y_percent'] * height),
+                   int(zone['width_percent'] * width), int(zone['height_percent'] * height))
+            expected = preprocess_region_per_roi(captures[1], box)
+            assert binary.shape == expected.shape
+            assert set(np.unique(binary)) <= {0, 255}
+            assert np.mean(binary == expected) > 0.97
+
+    # Boîtes calculées une fois par résolution, capture binarisée une fois
+    assert list(extractor.layout._boxes) == [(1500, 1334)]
+    assert list(extractor._frames) == [1]
+
+
+def test_registry_loads_each_model_once():
+    """Le registre ne charge un modèle qu'une fois et mesure sa durée de chargement."""
+    loaded = []
+
+    def factory(languages, **options):
+        loaded.append(tuple(languages))
+        return FakeReader({})
+
+    registry = OCRRegistry(factory=factory)
+    assert not registry.is_loaded()
+
+    elapsed = registry.warmup()
+    assert elapsed >= 0.0
+    assert registry.warmup() == 0.0
+
+    engine = registry.get_engine(regions_per_sheet=4)
+    assert engine.reader is registry.get_reader()
+    assert engine.regions_per_sheet == 4
+    registry.get_reader(('en', 'fr'))
+
+    assert loaded == [('en',), ('en', 'fr')]
+    assert len(registry.load_times) == 2
+
+
+class ChecksumReader:
+    """Lecteur factice déterministe : le texte dépend du contenu de la région."""
+
+    def recognize(self, image, horizontal_list=None, free_list=None, allowlist=None,
+                  batch_size=1, detail=1, paragraph=False):
+        results = []
+        for x_min, x_max, y_min, y_max in horizontal_list:
+            checksum = int(image[y_min:y_max, x_min:x_max].sum() // 255) % 7
+            box = [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+            results.append((box, str(checksum) if allowlist else f"joueur{checksum}", 0.9))
+        return results
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="le lecteur factice est transmis aux workers par fork")
+def test_parallel_extractor_matches_serial(monkeypatch, tmp_path):
+    """L'extraction multi-processus donne le même résultat que l'extraction séquentielle."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ocr_registry, '_factory', lambda languages, **options: ChecksumReader())
+    ocr_registry.clear()
+
+    rng = np.random.default_rng(42)
+    captures = [rng.integers(0, 256, size=(200, 120, 3), dtype=np.uint8) for _ in range(4)]
+    zones = _zones(3)
+    for row in range(3):
+        for field in zones:
+            zones[field][row] = dict(zones[field][row], y_percent=0.2 * row)
+
+    serial = ZoneExtractor(BatchOCR(ChecksumReader()), ZoneLayout(zones))
+    expected = serial.extract(captures)
+
+    with ParallelExtractor(ZoneLayout(zones), workers=2) as parallel:
+        players = parallel.extract(captures)
+
+    assert expected
+    assert players == expected
+    assert parallel.last_report.workers == 2
+    assert parallel.last_report.frames == 4
+    assert parallel.last_report.rois == serial.last_report.rois
+    ocr_registry.clear()
+
+
+def _text_image(seed, shape=(40, 160)):
+    """Région binarisée pseudo-aléatoire imitant un texte."""
+    rng = np.random.default_rng(seed)
+    small = (rng.random((shape[0] // 4, shape[1] // 4)) > 0.7).astype(np.uint8) * 255
+    return np.kron(small, np.ones((4, 4), dtype=np.uint8))
+
+
+def test_recognition_cache_tolerates_noise(tmp_path):
+    """Une région quasi identique reprend le texte mémorisé ; une autre non."""
+    cache = RecognitionCache(str(tmp_path / 'cache.json'))
+    image = _text_image(1)
+    cache.put(image, None, 'Alice')
+
+    noisy = image.copy()
+    noisy[0:2, 0:2] = 255 - noisy[0:2, 0:2]
+    assert cache.get(image, None) == 'Alice'
+    assert cache.get(noisy, None) == 'Alice'
+    assert cache.get(_text_image(2), None) is None
+    # Le jeu de caractères fait partie de la clé
+    assert cache.get(image, DIGITS_ALLOWLIST) is None
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    cache.save()
+    reloaded = RecognitionCache(str(tmp_path / 'cache.json')).load()
+    assert len(reloaded) == 1
+    assert reloaded.get(noisy, None) == 'Alice'
+
+
+def test_recognition_cache_evicts_least_recently_used():
+    """Au-delà de la capacité, l'entrée la moins récemment utilisée est évincée."""
+    cache = RecognitionCache(max_entries=2)
+    images = [_text_image(seed) for seed in range(3)]
+    cache.put(images[0], None, 'a')
+    cache.put(images[1], None, 'b')
+    assert cache.get(images[0], None) == 'a'
+    cache.put(images[2], None, 'c')
+
+    assert len(cache) == 2
+    assert cache.get(images[1], None) is None
+    assert cache.get(images[0], None) == 'a'
+    assert cache.get(images[2], None) == 'c'
+
+
+def test_batch_ocr_only_recognizes_cache_misses():
+    """Les régions déjà en cache ne sont pas renvoyées au lecteur."""
+    # Le lecteur factice lit le premier pixel de chaque région
+    reader = FakeReader({255: 'Alice', 0: 'Bob'})
+    ocr = BatchOCR(reader, cache=RecognitionCache())
+    alice, bob = _text_image(5), _text_image(6)
+    alice[0, 0], bob[0, 0] = 255, 0
+
+    assert ocr.recognize([('a', alice, None)]) == {'a': 'Alice'}
+    texts = ocr.recognize([('a2', alice.copy(), None), ('b', bob, None)])
+
+    assert texts == {'a2': 'Alice', 'b': 'Bob'}
+    assert reader.calls == [(None, 1), (None, 1)]
+    assert ocr.cache.hits == 1
@@ -0,0 +1,116 @@
+"""
+Tests du pipeline de capture en flux, rejoué hors ligne depuis des PNG.
+"""
+
+import os
+import sys
+import time
+import cv2
+import numpy as np
+import pytest
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from rank.extraction import ZoneExtractor
+from rank.ocr import BatchOCR
+from rank.pipeline import FileFrameSource, StreamingExtractor
+from rank.zones import ZoneLayout
+from tests.test_ocr import ChecksumReader, _zones
+
+
+class SlowReader(ChecksumReader):
+    """Lecteur factice qui simule la durée d'une reconnaissance."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.first_call = None
+
+    def recognize(self, *args, **kwargs):
+        if self.first_call is None:
+            self.first_call = time.perf_counter()
+        time.sleep(self.delay)
+        return super().recognize(*args, **kwargs)
+
+
+def _write_frames(directory, count):
+    """Enregistre des captures synthétiques au format PNG."""
+    rng = np.random.default_rng(7)
+    for idx in range(count):
+        frame = rng.integers(0, 256, size=(200, 120, 3), dtype=np.uint8)
+        cv2.imwrite(os.path.join(directory, f'frame_{idx:02d}.png'), frame)
+
+
+def _row_zones():
+    """Trois lignes de zones réparties verticalement."""
+    zones = _zones(3)
+    for row in range(3):
+        for field in zones:
+            zones[field][row] = dict(zones[field][row], y_percent=0.2 * row)
+    return ZoneLayout(zones)
+
+
+def test_streaming_matches_batch_extraction(monkeypatch, tmp_path):
+    """Le flux donne les mêmes joueurs que l'extraction après coup."""
+    monkeypatch.chdir(tmp_path)
+    _write_frames(str(tmp_path), 5)
+
+    source = FileFrameSource.from_directory(str(tmp_path))
+    assert len(source) == 5
+
+    captures = []
+    reader = SlowReader(delay=0.01)
+    stream = StreamingExtractor(ZoneExtractor(BatchOCR(reader), _row_zones())).start()
+    while True:
+        frame = source.capture()
+        if frame is None:
+            break
+        captures.append(frame)
+        stream.submit(frame)
+        last_submit = time.perf_counter()
+        # Simule le glissement et l'attente après chaque défilement
+        time.sleep(0.02)
+    players = stream.finish()
+
+    expected = ZoneExtractor(BatchOCR(ChecksumReader()), _row_zones()).extract(captures)
+
+    assert players
+    assert players == expected
+    assert stream.last_report.frames == 5
+    # L'OCR a commencé avant la fin des captures
+    assert reader.first_call < last_submit
+
+
+def test_streaming_reports_ocr_errors(monkeypatch, tmp_path):
+    """Une erreur d'OCR dans le thread est remontée à la fin du flux."""
+    monkeypatch.chdir(tmp_path)
+
+    class BrokenOCR:
+        def recognize(self, regions):
+            raise RuntimeError("modèle indisponible")
+
+    stream = StreamingExtractor(ZoneExtractor(BrokenOCR(), _row_zones())).start()
+    stream.submit(np.zeros((200, 120, 3), dtype=np.uint8))
+    stream.submit(np.zeros((200, 120, 3), dtype=np.uint8))
+
+    with pytest.raises(RuntimeError, match="modèle indisponible"):
+        stream.finish()
+
+
+def test_streaming_abort_skips_pending_frames(monkeypatch, tmp_path):
+    """Un flux interrompu ne traite pas les captures en attente."""
+    monkeypatch.chdir(tmp_path)
+    _write_frames(str(tmp_path), 6)
+    source = FileFrameSource.from_directory(str(tmp_path))
+
+    reader = SlowReader(delay=0.05)
+    stream = StreamingExtractor(ZoneExtractor(BatchOCR(reader), _row_zones())).start()
+    for _ in range(6):
+        stream.submit(source.capture())
+    start = time.perf_counter()
+    stream.abort()
+
+    # Au plus la capture en cours est terminée
+    assert time.perf_counter() - start < 6 * 0.05
+    assert stream._thread is None
+    stream.abort()
@@ -0,0 +1,225 @@
+"""
+Tests de non-régression des plans d'exécution des requêtes publiques.
+
+Une base contenant un an de classements quotidiens est générée une fois.
+Chaque requête émise par les méthodes publiques de `RankDatabase`, sur les
+connexions de lecture comme d'écriture, passe par `EXPLAIN QUERY PLAN` juste
+avant son exécution ; le test échoue si l'une d'elles parcourt entièrement une
+table persistante au lieu d'utiliser un index. Les parcours voulus (lecture
+de tous les noms pour l'index de recherche, recalcul complet des
+statistiques) sont autorisés explicitement, table par table, par le test
+concerné.
+"""
+
+import os
+import re
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
+import pytest
+from loguru import logger
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from storage.database import RankDatabase
+from storage.migrations import MIGRATIONS
+from tests.helpers import synthetic_rankings
+
+DAYS = 365
+PLAYERS = 300
+
+# FROM/JOIN <table> [AS] <alias>
+TABLE_ALIAS = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+SQL_KEYWORDS = {'WHERE', 'ON', 'JOIN', 'LEFT', 'INNER', 'GROUP', 'ORDER', 'LIMIT', 'SET', 'AND', 'USING', 'VALUES'}
+
+
+class ExplainingCursor:
+    """Curseur qui relève le plan de chaque requête avant de l'exécuter."""
+
+    def __init__(self, cursor, plans):
+        self._cursor = cursor
+        self._plans = plans
+
+    def execute(self, sql, params=()):
+        if sql.lstrip().upper().startswith(('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')):
+            plan = self._cursor.connection.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            self._plans.append((sql, [row[3] for row in plan]))
+        return self._cursor.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class ExplainingConnection:
+    """Connexion dont les curseurs relèvent les plans d'exécution."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.plans = []
+
+    def cursor(self):
+        return ExplainingCursor(self._conn.cursor(), self.plans)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+@pytest.fixture(scope='module')
+def db(tmp_path_factory):
+    """Base d'un an de classements se terminant aujourd'hui."""
+    logger.disable('storage')
+    # Sans cache : chaque appel doit exécuter ses requêtes
+    database = RankDatabase(str(tmp_path_factory.mktemp('plans') / 'rankings.db'), cache_size=0)
+    start = date.today() - timedelta(days=DAYS - 1)
+    for day, (_, _, players) in enumerate(synthetic_rankings(PLAYERS, DAYS)):
+        current = start + timedelta(days=day)
+        database.save_ranking('dreamland', players, current.isoformat(),
+                              (current - timedelta(days=1)).isoformat())
+    logger.enable('storage')
+    yield database
+    database.close()
+
+
+def _table_scans(sql, plan, tables):
+    """Parcours complets de tables persistantes dans un plan, sous la forme (table, détail)."""
+    aliases = {}
+    for table, alias in TABLE_ALIAS.findall(sql):
+        aliases[table] = table
+        if alias and alias.upper() not in SQL_KEYWORDS:
+            aliases[alias] = table
+
+    scans = []
+    for detail in plan:
+        match = re.match(r'SCAN (\w+)', detail)
+        table = aliases.get(match.group(1), match.group(1)) if match else None
+        if table in tables:
+            scans.append((table, detail))
+    return scans
+
+
+def _assert_indexed(db, call, allowed=()):
+    """
+    Exécute un appel public et vérifie qu'aucune requête ne parcourt de table.
+
+    Args:
+        allowed (iterable): Tables dont le parcours complet est voulu pour cet appel
+    """
+    tables = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    plans = []
+    manager = db.connections
+
+    def explaining(acquire):
+        @contextmanager
+        def wrapped():
+            with acquire() as conn:
+                explaining_conn = ExplainingConnection(conn)
+                yield explaining_conn
+                plans.extend(explaining_conn.plans)
+        return wrapped
+
+    manager.reader, manager.writer = explaining(manager.reader), explaining(manager.writer)
+    try:
+        call(db)
+    finally:
+        del manager.reader, manager.writer
+
+    assert plans, "Aucune requête relevée"
+    for sql, plan in plans:
+        scans = [detail for table, detail in _table_scans(sql, plan, tables) if table not in allowed]
+        assert not scans, f"Parcours complet {scans} pour :\n{' '.join(sql.split())}\n" + "\n".join(plan)
+
+
+def test_latest_ranking_uses_indexes(db):
+    _assert_indexed(db, lambda db: db.get_latest_ranking())
+    _assert_indexed(db, lambda db: db.get_latest_ranking(limit=10, guild_name='Guilde1'))
+    _assert_indexed(db, lambda db: db.get_latest_ranking(target_date=date.today() - timedelta(days=30)))
+    _assert_indexed(db, lambda db: db.get_latest_ranking(ranking_type='arena'))
+
+
+def test_leaderboard_uses_indexes(db):
+    _assert_indexed(db, lambda db: db.get_leaderboard())
+    # Jour trop ancien pour avoir un instantané conservé : calculé à la demande
+    _assert_indexed(db, lambda db: db.get_leaderboard(target_date=date.today() - timedelta(days=30)))
+
+
+def test_leaderboard_page_uses_indexes(db):
+    assert db.get_leaderboard_page(1)['table']
+    _assert_indexed(db, lambda db: db.get_leaderboard_page(1))
+    _assert_indexed(db, lambda db: db.get_leaderboard_page(0, guild_name='Guilde1'))
+    _assert_indexed(db, lambda db: db.get_leaderboard_page(0, target_date=date.today() - timedelta(days=30)))
+
+
+def test_player_history_uses_indexes(db):
+    assert db.get_player_history('Joueur5', limit=30)
+    _assert_indexed(db, lambda db: db.get_player_history('Joueur5', limit=30))
+
+
+def test_player_stats_uses_indexes(db):
+    assert db.get_player_stats('Joueur5')
+    _assert_indexed(db, lambda db: db.get_player_stats('Joueur5'))
+
+
+def test_search_uses_indexes(db):
+    # Construction de l'index de trigrammes : lecture voulue de tous les noms
+    _assert_indexed(db, lambda db: db.search_players('Joueur5'), allowed={'players'})
+    _assert_indexed(db, lambda db: db.search_guilds('Guilde3'), allowed={'players'})
+    # Index déjà construit pour cette version des données : recherche indexée
+    assert db.search_players('Joueur5')[0]['name'] == 'Joueur5'
+    _assert_indexed(db, lambda db: db.search_players('Joueur5'))
+    assert db.search_guilds('Guilde3')[0]['name'] == 'Guilde3'
+    _assert_indexed(db, lambda db: db.search_guilds('Guilde3'))
+
+
+def test_capture_jobs_use_indexes(db):
+    from storage import jobs
+    with db.connections.writer() as conn:
+        job_id = jobs.start_job(conn, 'dreamland', '2024-01-01 05:30:00')
+        jobs.record_stage(conn, job_id, 1, 0, 'navigate', '2024-01-01 05:30:00', 1.0, jobs.SUCCEEDED)
+        jobs.finish_job(conn, job_id, '2024-01-01 05:31:00', 60.0, jobs.SUCCEEDED, 1, PLAYERS)
+        conn.commit()
+    assert db.get_capture_jobs(limit=5)[0]['stages']
+    # Parcours du rowid à rebours arrêté par LIMIT : seules les dernières captures sont lues
+    _assert_indexed(db, lambda db: db.get_capture_jobs(limit=5), allowed={'capture_jobs'})
+
+
+def test_guild_members_uses_indexes(db):
+    assert db.get_guild_members('Guilde3')
+    _assert_indexed(db, lambda db: db.get_guild_members('Guilde3'))
+    _assert_indexed(db, lambda db: db.get_guild_members('Guilde3', 'dreamland'))
+
+
+def test_score_analytics_use_indexes(db):
+    assert len(db.get_score_deltas(limit=10)) == 10
+    _assert_indexed(db, lambda db: db.get_score_deltas())
+    _assert_indexed(db, lambda db: db.get_score_deltas(target_date=date.today() - timedelta(days=31)))
+    assert len(db.get_score_distribution(days=30)) == 30
+    _assert_indexed(db, lambda db: db.get_score_distribution(days=30))
+    assert len(db.get_score_curve(days=7, max_rank=50)) == 50
+    _assert_indexed(db, lambda db: db.get_score_curve(days=7, max_rank=50))
+
+
+def test_save_ranking_uses_indexes(db):
+    _, _, players = synthetic_rankings(PLAYERS, 1, seed=1)[0]
+    tomorrow = date.today() + timedelta(days=1)
+    _assert_indexed(db, lambda db: db.save_ranking('dreamland', players, tomorrow.isoformat(),
+                                                   date.today().isoformat()))
+
+
+def test_index_set_is_managed_by_migrations(db):
+    indexes = {row[0] for row in db.conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")}
+    assert {'idx_ranking_dates_type_date_j1', 'idx_rankings_player', 'idx_players_guild',
+            'idx_rankings_date_score'} <= indexes
+    assert 'idx_ranking_dates_date_j1' not in indexes
+    versions = [row[0] for row in db.conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+    assert versions == [m.version for m in MIGRATIONS]
+
+
+def test_rebuild_stats_scans_only_what_it_recomputes(db):
+    # Recalcul complet : la liste de tous les jours est relue (index couvrant),
+    # chaque jour est ensuite recalculé par index
+    _assert_indexed(db, lambda db: db.rebuild_stats(), allowed={'ranking_dates'})
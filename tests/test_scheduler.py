@@ -0,0 +1,266 @@
+"""
+Tests du planificateur de captures, de bout en bout avec un jeu factice.
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from loguru import logger
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from rank.scheduler import CaptureBackend, CaptureScheduler, CronSchedule, IntervalSchedule
+from storage.database import RankDatabase
+from tests.helpers import synthetic_rankings
+
+
+class FakeGame:
+    """
+    Jeu factice : incidents programmés par étape et joueurs du classement.
+
+    `incidents` associe à une étape la liste des incidents des tentatives
+    successives : 'fail' (l'étape échoue), 'hang' (l'étape ne se termine
+    qu'une fois annulée), 'late' (l'étape ignore l'annulation et réussit peu
+    après son délai), 'stuck' (l'étape ignore l'annulation plus longtemps que
+    le planificateur ne l'attend) ou None (l'étape réussit).
+    """
+
+    def __init__(self, incidents=None, num_players=120):
+        self.incidents = {stage: list(events) for stage, events in (incidents or {}).items()}
+        self.players = synthetic_rankings(num_players=num_players, num_days=1)[0][2]
+        self.calls = []
+        self.resets = 0
+        self.backends = 0
+        self.cancels = 0
+        # Étapes pilotant le jeu en même temps : jamais plus d'une
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def backend(self):
+        self.backends += 1
+        return FakeGameBackend(self)
+
+    def enter(self):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def leave(self):
+        with self._lock:
+            self.active -= 1
+
+
+class FakeGameBackend(CaptureBackend):
+    ranking_type = 'dreamland'
+
+    def __init__(self, game):
+        self.game = game
+        self.cancelled = threading.Event()
+
+    def _stage(self, name):
+        self.game.calls.append(name)
+        events = self.game.incidents.get(name)
+        incident = events.pop(0) if events else None
+        self.game.enter()
+        try:
+            if self.cancelled.is_set():
+                return False
+            if incident == 'hang':
+                self.cancelled.wait(5)
+                return False
+            if incident in ('late', 'stuck'):
+                time.sleep(0.5 if incident == 'late' else 1.0)
+                return True
+            return incident != 'fail'
+        finally:
+            self.game.leave()
+
+    def navigate(self):
+        return self._stage('navigate')
+
+    def capture(self):
+        return self._stage('capture')
+
+    def extract(self):
+        return self.game.players if self._stage('extract') else None
+
+    def reset(self):
+        self.game.enter()
+        self.game.resets += 1
+        self.game.leave()
+
+    def cancel(self):
+        self.game.cancels += 1
+        self.cancelled.set()
+
+    def resume(self):
+        self.cancelled.clear()
+
+
+def _scheduler(tmp_path, game, **kwargs):
+    delays = []
+    scheduler = CaptureScheduler(
+        game.backend, db=RankDatabase(str(tmp_path / 'rankings.db')), schedule=IntervalSchedule(0),
+        max_retries=kwargs.pop('max_retries', 3), retry_delay=1, jitter=0, sleep=delays.append,
+        stage_timeouts={'navigate': 1, 'capture': 0.2, 'extract': 1, 'save': 5}, **kwargs)
+    return scheduler, delays
+
+
+def test_capture_job_end_to_end(tmp_path):
+    game = FakeGame()
+    scheduler, delays = _scheduler(tmp_path, game)
+    job = scheduler.run_job()
+
+    assert (job['status'], job['attempts'], job['players']) == ('succeeded', 1, 120)
+    assert [s['stage'] for s in job['stages']] == ['navigate', 'capture', 'extract', 'save']
+    assert all(s['status'] == 'succeeded' and s['duration'] >= 0 for s in job['stages'])
+    assert delays == []
+    # Le classement capturé est en base et prêt pour le bot
+    assert scheduler.db.get_leaderboard()['count'] == 120
+    scheduler.close()
+
+
+def test_retries_with_backoff_and_stage_timeout(tmp_path):
+    game = FakeGame({'navigate': ['fail'], 'capture': ['hang']})
+    scheduler, delays = _scheduler(tmp_path, game)
+    start = time.monotonic()
+    job = scheduler.run_job()
+
+    assert (job['status'], job['attempts']) == ('succeeded', 3)
+    # Délai doublé à chaque reprise ; le jeu est ramené à l'écran principal
+    assert delays == [1, 2]
+    assert game.resets == 2
+    # Étape bloquée : interrompue à son délai puis annulée
+    assert time.monotonic() - start < 2
+    statuses = [(s['attempt'], s['stage'], s['status']) for s in job['stages'] if s['status'] != 'succeeded']
+    assert statuses == [(1, 'navigate', 'failed'), (2, 'capture', 'timeout')]
+    assert game.calls == ['navigate', 'navigate', 'capture', 'navigate', 'capture', 'extract']
+    scheduler.close()
+
+
+def test_late_stage_does_not_overlap_next_attempt(tmp_path):
+    game = FakeGame({'capture': ['late']})
+    scheduler, delays = _scheduler(tmp_path, game)
+    job = scheduler.run_job()
+
+    assert (job['status'], job['attempts']) == ('succeeded', 2)
+    timed_out = [(s['attempt'], s['stage']) for s in job['stages'] if s['status'] == 'timeout']
+    assert timed_out == [(1, 'capture')]
+    # Un seul backend pour la capture, annulé une fois ; l'étape terminée en
+    # retard a été attendue avant le retour à l'écran principal
+    assert (game.backends, game.cancels, game.resets) == (1, 1, 1)
+    assert game.max_active == 1
+    scheduler.close()
+
+
+def test_stuck_stage_ends_job_without_retry(tmp_path):
+    game = FakeGame({'capture': ['stuck']})
+    scheduler, delays = _scheduler(tmp_path, game, cancel_grace=0.1)
+    job = scheduler.run_job()
+
+    # Étape toujours en cours : ni retour à l'écran principal ni reprise
+    assert (job['status'], job['attempts']) == ('timeout', 1)
+    assert 'non arrêtée' in job['error']
+    assert (game.resets, delays) == (0, [])
+
+    # Capture suivante refusée tant que l'étape abandonnée pilote le jeu
+    blocked = scheduler.run_job()
+    assert (blocked['status'], blocked['attempts']) == ('failed', 0)
+    assert game.backends == 1
+
+    time.sleep(1.0)
+    assert scheduler.run_job()['status'] == 'succeeded'
+    assert game.max_active == 1
+    scheduler.close()
+
+
+def test_abandoned_stage_end_is_logged(tmp_path):
+    messages = []
+    sink = logger.add(messages.append, level='WARNING', format="{message}")
+    try:
+        game = FakeGame({'capture': ['stuck']})
+        scheduler, _ = _scheduler(tmp_path, game, cancel_grace=0.1)
+        scheduler.run_job()
+        assert not any('de nouveau libre' in m for m in messages)
+        time.sleep(1.0)
+        scheduler.close()
+    finally:
+        logger.remove(sink)
+
+    assert any(m.startswith('Étape abandonnée capture terminée') and 'de nouveau libre' in m for m in messages)
+
+
+def test_backend_must_implement_every_stage():
+    class Partial(CaptureBackend):
+        def navigate(self):
+            return True
+
+        def capture(self):
+            return True
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_job_gives_up_after_max_retries(tmp_path):
+    game = FakeGame({'extract': ['fail'] * 3})
+    scheduler, delays = _scheduler(tmp_path, game, max_retries=2)
+    job = scheduler.run_job()
+
+    assert (job['status'], job['attempts'], job['players']) == ('failed', 3, None)
+    assert job['error'] == "aucun joueur reconnu"
+    assert delays == [1, 2]
+    assert scheduler.db.get_leaderboard() is None
+    scheduler.close()
+
+
+def test_run_follows_schedule_and_history(tmp_path):
+    game = FakeGame({'navigate': [None, 'fail']})
+    scheduler, _ = _scheduler(tmp_path, game, max_retries=0)
+    scheduler.run(max_jobs=2)
+
+    history = scheduler.db.get_capture_jobs()
+    assert [job['status'] for job in history] == ['failed', 'succeeded']
+    assert all(job['scheduled_at'] and job['duration'] >= 0 for job in history)
+    assert scheduler.last_run() == datetime.fromisoformat(history[0]['scheduled_at'])
+    scheduler.close()
+
+
+def test_next_slot_follows_the_slot_that_ran(tmp_path):
+    scheduler, _ = _scheduler(tmp_path, FakeGame())
+    scheduler.schedule = CronSchedule("30 5 * * *")
+    slot = datetime(2024, 1, 1, 5, 30)
+    scheduler.run_job(scheduled_at=slot)
+
+    # Réveil en avance : l'échéance déjà exécutée n'est pas reprise
+    assert scheduler.last_run() == slot
+    early = slot - timedelta(seconds=1)
+    assert scheduler.schedule.next_run(scheduler.last_run(), early) == slot + timedelta(days=1)
+    scheduler.close()
+
+
+def test_cron_schedule():
+    daily = CronSchedule("30 5 * * *")
+    assert daily.next_after(datetime(2024, 1, 1, 5, 29, 59)) == datetime(2024, 1, 1, 5, 30)
+    assert daily.next_after(datetime(2024, 1, 1, 5, 30)) == datetime(2024, 1, 2, 5, 30)
+    # Échéance manquée pendant un arrêt : rattrapée tout de suite
+    now = datetime(2024, 1, 3, 12, 0)
+    assert daily.next_run(datetime(2024, 1, 1, 5, 30), now) == now
+    assert daily.next_run(datetime(2024, 1, 3, 5, 30), now) == datetime(2024, 1, 4, 5, 30)
+
+    # Jours ouvrés (le 6 janvier 2024 est un samedi), toutes les 15 minutes de 8 h à 9 h
+    workdays = CronSchedule("*/15 8 * * 1-5")
+    assert workdays.next_after(datetime(2024, 1, 5, 8, 50)) == datetime(2024, 1, 8, 8, 0)
+    # Jour du mois ou jour de la semaine, comme cron
+    either = CronSchedule("0 0 1 * 0")
+    assert either.next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 7)
+
+    interval = IntervalSchedule(3600)
+    assert interval.next_run(None, now) == now
+    assert interval.next_run(datetime(2024, 1, 3, 11, 30), now) == datetime(2024, 1, 3, 12, 30)
@@ -0,0 +1,68 @@
+"""
+Tests de la recherche approchée des joueurs et des guildes.
+"""
+
+import asyncio
+import os
+import sys
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from storage.database import RankDatabase
+from storage.search import NameIndex, search_key
+from tests.bench_bot import FakeInteraction, ranking_commands
+
+NAMES = ['Alice', 'Aliénor', 'Bob', 'Bobby', 'DarkKnight', 'Darkness', 'Élodie', 'xX_Sl4yer_Xx']
+
+
+def test_search_key_absorbs_ocr_confusions():
+    assert search_key("Élodie") == "elodle"
+    assert search_key("EL0DIE") == search_key("Elodie")
+    assert search_key("  Dark   Knight ") == "dark knlght"
+
+
+def test_ocr_noisy_queries_find_the_player():
+    index = NameIndex(NAMES)
+    assert index.search("Alice")[0] == ("Alice", 1.0)
+    assert index.search("A1ice")[0][0] == "Alice"
+    assert index.search("elodie")[0][0] == "Élodie"
+    assert index.search("DarkKnlght")[0][0] == "DarkKnight"
+    assert index.search("Sl4yer")[0][0] == "xX_Sl4yer_Xx"
+    # Une ou deux lettres : les noms qui commencent ainsi
+    assert {name for name, _ in index.search("Bo")} == {"Bob", "Bobby"}
+    assert index.search("zzz") == []
+
+
+def _ranking(*players):
+    return [{'rank': i + 1, 'name': n, 'guild': g, 'score': '1'} for i, (n, g) in enumerate(players)]
+
+
+def test_search_follows_ingest(tmp_path):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    db.save_ranking('dreamland', _ranking(('Alice', 'Licornes'), ('Bob', 'Licornes'), ('Carol', 'Dragons')),
+                    '2024-01-02', '2024-01-01')
+    assert db.search_players('A1ice')[0] == {'name': 'Alice', 'guild': 'Licornes', 'similarity': 1.0}
+    assert db.search_guilds('licorne')[0]['name'] == 'Licornes'
+    assert db.search_guilds('licorne')[0]['members'] == 2
+
+    db.save_ranking('dreamland', _ranking(('Alicia', 'Dragons')), '2024-01-03', '2024-01-02')
+    assert 'Alicia' in [m['name'] for m in db.search_players('Alic')]
+
+
+def test_commands_autocomplete_and_suggest(tmp_path):
+    db = RankDatabase(str(tmp_path / 'rankings.db'))
+    db.save_ranking('dreamland', _ranking(('DarkKnight', 'Dragons'), ('Bob', 'Licornes')),
+                    '2024-01-02', '2024-01-01')
+    commands = ranking_commands(db)
+    command = commands.bot.tree.commands['royaumeonirique']
+
+    choices = asyncio.run(command.autocompletes['joueur'](FakeInteraction(), 'darkkn1ght'))
+    assert [(c.name, c.value) for c in choices][0] == ('DarkKnight (Dragons)', 'DarkKnight')
+    choices = asyncio.run(command.autocompletes['guilde'](FakeInteraction(), 'drag0n'))
+    assert choices[0].value == 'Dragons'
+
+    interaction = FakeInteraction()
+    asyncio.run(command(interaction, joueur='DarkNight'))
+    [embed] = interaction.followup.sent
+    assert "Vouliez-vous dire : DarkKnight" in embed.description
@@ -0,0 +1,92 @@
+"""
+Tests de la disposition des zones OCR.
+"""
+
+import json
+import os
+import sys
+import numpy as np
+import pytest
+
+# Ajouter le répertoire src au PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from rank.zones import ZoneLayout, ZoneLayoutError, FIELDS, get_zone_layout
+
+
+def _pixel_zones(rows):
+    """Zones en pixels telles que produites par l'outil de sélection."""
+    zones = {'date_j1': [{'x': 700, 'y': 50, 'width': 100, 'height': 20}]}
+    for i, field in enumerate(FIELDS):
+        zones[field] = [{'x': 10 + 200 * i, 'y': 100 + 60 * row, 'width': 180, 'height': 40}
+                        for row in range(rows)]
+    return zones
+
+
+def test_layout_supports_any_number_of_rows():
+    """Les boîtes couvrent toutes les lignes sélectionnées, pas seulement cinq."""
+    layout = ZoneLayout.from_pixels(_pixel_zones(8), 1000, 800)
+
+    assert layout.num_entries == 8
+    boxes = layout.boxes(1000, 800)
+    assert boxes.shape == (8, 4, 4)
+    assert layout.box(7, 'score', 1000, 800) == (610, 520, 180, 40)
+    # Même arrondi que le calcul historique int(pourcentage * taille)
+    zone = layout.to_dict()['guild'][3]
+    assert layout.box(3, 'guild', 1500, 1200) == (
+        int(zone['x_percent'] * 1500), int(zone['y_percent'] * 1200),
+        int(zone['width_percent'] * 1500), int(zone['height_percent'] * 1200))
+
+
+def test_layout_memoizes_boxes_per_resolution():
+    layout = ZoneLayout.from_pixels(_pixel_zones(5), 1000, 800)
+
+    assert layout.boxes(1000, 800) is layout.boxes(1000, 800)
+    assert layout.boxes(2000, 1600) is not layout.boxes(1000, 800)
+    assert np.array_equal(layout.boxes(2000, 1600), layout.boxes(1000, 800) * 2)
+    assert layout.area(1000, 800) == (10, 100, 790, 380)
+    with pytest.raises(ValueError):
+        layout.boxes(1000, 800)[0, 0, 0] = 1
+
+
+def test_layout_rejects_invalid_zones():
+    zones = _pixel_zones(5)
+    zones['guild'].pop()
+    with pytest.raises(ZoneLayoutError, match="même nombre de lignes"):
+        ZoneLayout.from_pixels(zones, 1000, 800)
+
+    zones = _pixel_zones(5)
+    del zones['score']
+    with pytest.raises(ZoneLayoutError, match="score"):
+        ZoneLayout.from_pixels(zones, 1000, 800)
+
+    zones = _pixel_zones(5)
+    zones['name'][2]['width'] = 0
+    with pytest.raises(ZoneLayoutError):
+        ZoneLayout.from_pixels(zones, 1000, 800)
+
+    with pytest.raises(ZoneLayoutError, match="bords"):
+        ZoneLayout.from_pixels(_pixel_zones(5), 700, 800)
+
+
+def test_saved_layout_is_used_without_reloading(tmp_path):
+    """La sélection enregistrée est reprise telle quelle, avec les zones de date."""
+    path = str(tmp_path / 'ocr_zones.json')
+    layout = ZoneLayout.from_pixels(_pixel_zones(6), 1000, 800)
+    layout.save(path)
+
+    assert get_zone_layout(path) is layout
+    reloaded = ZoneLayout.from_file(path)
+    assert np.array_equal(reloaded.fractions, layout.fractions)
+    assert reloaded.extra['date_j1'][0]['x_percent'] == 0.7
+
+    # Une modification du fichier par un autre processus est prise en compte
+    other = ZoneLayout.from_pixels(_pixel_zones(3), 1000, 800)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(other.to_dict(), f)
+    os.utime(path, (1, 1))
+    assert get_zone_layout(path).num_entries == 3
+
+
+def test_repository_zones_are_valid():
+    assert ZoneLayout.from_file().num_entries >= 1